@@ -0,0 +1,108 @@
+import argparse
+import time
+from collections.abc import Callable
+from typing import Any
+
+from src.database.property_repository import LOCATION_FIELD, to_document
+from src.models.property import Property
+from src.models.property_config import HardConfig, SoftConfig
+
+DEFAULT_DOCUMENTS = 10_000
+DEFAULT_REPEATS = 5
+
+
+def sample_documents(count: int) -> list[dict[str, Any]]:
+    furniture = ["sofa", "bed", "dining_table", "wardrobe", "tv_unit", "study_table"]
+    appliances = ["fridge", "ac", "washing_machine", "tv", "microwave", "geyser"]
+    amenities = ["parking", "gym", "security", "lift", "pool", "power_backup"]
+    return [
+        to_document(
+            Property(
+                id=f"prop{i}",
+                hard_config=HardConfig(
+                    area_sqft=600.0 + (i % 40) * 25,
+                    bhk_type=f"{1 + i % 4}BHK",
+                    bedrooms=1 + i % 4,
+                    bathrooms=1 + i % 3,
+                    property_type="apartment",
+                ),
+                soft_config=SoftConfig(
+                    furniture_items=furniture[: i % 7],
+                    appliances=appliances[: i % 5],
+                    amenities=amenities[: i % 6],
+                ),
+                city="Bangalore",
+                locality=f"locality{i % 50}",
+                latitude=12.9 + (i % 100) * 0.001,
+                longitude=77.6 + (i % 100) * 0.001,
+                current_rent=None if i % 10 == 0 else 15000.0 + (i % 30) * 1000,
+            )
+        )
+        for i in range(count)
+    ]
+
+
+def validated_keywords(doc: dict[str, Any]) -> Property:
+    return Property(**doc)
+
+
+def validated_model(doc: dict[str, Any]) -> Property:
+    return Property.model_validate(doc)
+
+
+def trusted_construct(doc: dict[str, Any]) -> Property:
+    return Property.model_construct(
+        id=doc["id"],
+        hard_config=HardConfig.model_construct(**doc["hard_config"]),
+        soft_config=SoftConfig.model_construct(**doc["soft_config"]),
+        city=doc["city"],
+        locality=doc["locality"],
+        latitude=doc["latitude"],
+        longitude=doc["longitude"],
+        current_rent=doc["current_rent"],
+    )
+
+
+DECODERS: dict[str, Callable[[dict[str, Any]], Property]] = {
+    "Property(**doc)": validated_keywords,
+    "Property.model_validate": validated_model,
+    "Property.model_construct": trusted_construct,
+}
+
+
+def best_seconds(
+    decode: Callable[[dict[str, Any]], Property], docs: list[dict[str, Any]], repeats: int
+) -> float:
+    timings = []
+    for _ in range(repeats):
+        batch = [dict(doc) for doc in docs]
+        start = time.perf_counter()
+        for doc in batch:
+            decode(doc)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare validated and trusted property decoding")
+    parser.add_argument("--documents", type=int, default=DEFAULT_DOCUMENTS)
+    parser.add_argument("--repeats", type=int, default=DEFAULT_REPEATS)
+    args = parser.parse_args()
+
+    docs = sample_documents(args.documents)
+    for doc in docs:
+        doc.pop(LOCATION_FIELD)
+
+    baseline = None
+    print(f"documents: {args.documents}")
+    for name, decode in DECODERS.items():
+        seconds = best_seconds(decode, docs, args.repeats)
+        baseline = baseline or seconds
+        print(
+            f"{name:<26} {seconds * 1000:8.1f} ms {seconds / args.documents * 1e6:7.2f} us/doc"
+            f" {baseline / seconds:5.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
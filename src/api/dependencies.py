@@ -1,11 +1,41 @@
 import os
+import tempfile
+from operator import attrgetter
+from pathlib import Path
 
 from motor.motor_asyncio import AsyncIOMotorClient
 
+from src.core_engine.agents.agent_pool import (
+    DEFAULT_MAX_IN_FLIGHT,
+    DEFAULT_MAX_QUEUED,
+    BandingAgentPool,
+)
+from src.core_engine.agents.banding_cache import (
+    DEFAULT_MAX_ENTRIES,
+    InMemoryBandingCache,
+    TieredBandingCache,
+)
+from src.core_engine.utils.columnar_snapshot import ColumnarCitySnapshot
+from src.core_engine.utils.locality_stats import LocalityStatsTable
+from src.core_engine.utils.rent_sketches import RentSketchIndex
+from src.database.banding_cache_repository import DEFAULT_TTL_SECONDS, MongoBandingCache
+from src.database.city_snapshot_cache import (
+    DEFAULT_MAX_BYTES,
+    CitySnapshotCache,
+    estimate_properties_bytes,
+)
 from src.database.property_repository import PropertyRepository
+from src.models.property import Property
 
 mongo_client = None
 database = None
+mongo_banding_cache = None
+rent_sketch_index = None
+locality_stats_table = None
+city_snapshot_cache = None
+city_columns_cache = None
+banding_agent_pool = None
+banding_cache = None
 
 
 def get_mongo_client():
@@ -28,7 +58,73 @@ def get_database():
 def get_property_repository() -> PropertyRepository:
     db = get_database()
     collection = db["properties"]
-    return PropertyRepository(collection)
+    return PropertyRepository(
+        collection,
+        listeners=[get_rent_sketch_index(), get_locality_stats_table()],
+        city_snapshots=get_city_snapshot_cache(),
+        city_columns=get_city_columns_cache(),
+    )
+
+
+def get_city_snapshot_max_bytes() -> int:
+    return int(os.getenv("CITY_SNAPSHOT_MAX_BYTES", DEFAULT_MAX_BYTES))
+
+
+def get_city_snapshot_cache() -> CitySnapshotCache[list[Property]]:
+    global city_snapshot_cache
+    if city_snapshot_cache is None:
+        city_snapshot_cache = CitySnapshotCache(
+            "properties", estimate_properties_bytes, get_city_snapshot_max_bytes()
+        )
+    return city_snapshot_cache
+
+
+def get_city_columns_cache() -> CitySnapshotCache[ColumnarCitySnapshot]:
+    global city_columns_cache
+    if city_columns_cache is None:
+        city_columns_cache = CitySnapshotCache(
+            "columns", attrgetter("nbytes"), get_city_snapshot_max_bytes()
+        )
+    return city_columns_cache
+
+
+def get_prewarm_cities() -> list[str] | None:
+    cities = os.getenv("CITY_SNAPSHOT_PREWARM_CITIES")
+    if cities is None:
+        return None
+    return [city.strip() for city in cities.split(",") if city.strip()]
+
+
+def get_rent_sketch_index() -> RentSketchIndex:
+    global rent_sketch_index
+    if rent_sketch_index is None:
+        rent_sketch_index = RentSketchIndex()
+    return rent_sketch_index
+
+
+def get_locality_stats_table() -> LocalityStatsTable:
+    global locality_stats_table
+    if locality_stats_table is None:
+        locality_stats_table = LocalityStatsTable()
+    return locality_stats_table
+
+
+def get_mongo_banding_cache() -> MongoBandingCache:
+    global mongo_banding_cache
+    if mongo_banding_cache is None:
+        ttl_seconds = int(os.getenv("BANDING_CACHE_TTL_SECONDS", DEFAULT_TTL_SECONDS))
+        mongo_banding_cache = MongoBandingCache(get_database()["banding_cache"], ttl_seconds)
+    return mongo_banding_cache
+
+
+def get_banding_cache() -> TieredBandingCache:
+    global banding_cache
+    if banding_cache is None:
+        max_entries = int(os.getenv("BANDING_CACHE_MAX_ENTRIES", DEFAULT_MAX_ENTRIES))
+        banding_cache = TieredBandingCache(
+            InMemoryBandingCache(max_entries), get_mongo_banding_cache()
+        )
+    return banding_cache
 
 
 def get_anthropic_api_key() -> str:
@@ -36,3 +132,20 @@ def get_anthropic_api_key() -> str:
     if not api_key:
         raise ValueError("ANTHROPIC_API_KEY environment variable is not set")
     return api_key
+
+
+def get_banding_agent_pool() -> BandingAgentPool:
+    global banding_agent_pool
+    if banding_agent_pool is None:
+        banding_agent_pool = BandingAgentPool(
+            anthropic_api_key=get_anthropic_api_key,
+            max_in_flight=int(os.getenv("BANDING_MAX_IN_FLIGHT", DEFAULT_MAX_IN_FLIGHT)),
+            max_queued=int(os.getenv("BANDING_MAX_QUEUED", DEFAULT_MAX_QUEUED)),
+            max_slots_per_call=int(os.getenv("BANDING_MAX_SLOTS_PER_CALL", 0)) or None,
+        )
+    return banding_agent_pool
+
+
+def get_profile_trace_dir() -> Path:
+    default_dir = Path(tempfile.gettempdir()) / "core-engine-profiles"
+    return Path(os.getenv("PROFILE_TRACE_DIR", default_dir))
@@ -1,15 +1,88 @@
+import asyncio
+from collections import Counter
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
 from dotenv import load_dotenv
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
 
+from src.api.dependencies import (
+    get_city_columns_cache,
+    get_city_snapshot_cache,
+    get_locality_stats_table,
+    get_mongo_banding_cache,
+    get_prewarm_cities,
+    get_property_repository,
+    get_rent_sketch_index,
+)
 from src.api.routes import router
+from src.core_engine.graphs.registry import workflow_registry
+from src.core_engine.utils.columnar_snapshot import ColumnarCitySnapshot
+from src.core_engine.utils.locality_stats import LocalityStatsTable
+from src.core_engine.utils.metrics import PROMETHEUS_CONTENT_TYPE, metrics
+from src.core_engine.utils.rent_sketches import RentSketchIndex
+from src.database.city_snapshot_cache import CitySnapshotCache, follow_changes
+from src.database.property_repository import PropertyRepository, to_property
+from src.models.property import Property
 
 load_dotenv()
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    repository = get_property_repository()
+    await repository.ensure_indexes()
+    city_counts = await load_rent_statistics(
+        repository, get_rent_sketch_index(), get_locality_stats_table()
+    )
+    city_snapshots = get_city_snapshot_cache()
+    city_columns = get_city_columns_cache()
+    await prewarm_city_snapshots(
+        repository, city_snapshots, city_columns, city_counts, get_prewarm_cities()
+    )
+    change_follower = asyncio.create_task(
+        follow_changes(repository.collection, [city_snapshots, city_columns])
+    )
+    await get_mongo_banding_cache().ensure_indexes()
+    await workflow_registry.warm_up()
+    yield
+    change_follower.cancel()
+
+
+async def load_rent_statistics(
+    repository: PropertyRepository,
+    rent_sketch_index: RentSketchIndex,
+    locality_stats_table: LocalityStatsTable,
+) -> Counter[str]:
+    city_counts: Counter[str] = Counter()
+    async for doc in repository.stream_documents():
+        prop = to_property(doc)
+        rent_sketch_index.add(prop)
+        locality_stats_table.add(prop)
+        city_counts[prop.city] += 1
+    return city_counts
+
+
+async def prewarm_city_snapshots(
+    repository: PropertyRepository,
+    city_snapshots: CitySnapshotCache[list[Property]],
+    city_columns: CitySnapshotCache[ColumnarCitySnapshot],
+    city_counts: Counter[str],
+    cities: list[str] | None,
+) -> None:
+    hot_cities = sorted(city_counts, key=lambda city: city_counts[city])
+    for city in hot_cities if cities is None else cities:
+        columns = await repository.query_columns_by_city(city)
+        city_columns.store(city, columns)
+        city_snapshots.store(city, columns.materialize(range(len(columns))))
+
+
 app = FastAPI(
     title="RentEase Core Engine API",
     description="Property analysis and recommendation engine",
     version="0.1.0",
+    lifespan=lifespan,
 )
 
 app.add_middleware(
@@ -26,3 +99,8 @@ app.include_router(router)
 @app.get("/health")
 async def health_check():
     return {"status": "healthy"}
+
+
+@app.get("/metrics")
+async def metrics_endpoint():
+    return Response(content=metrics.render(), media_type=PROMETHEUS_CONTENT_TYPE)
@@ -1,21 +1,62 @@
+import asyncio
+import json
 import uuid
+from collections.abc import AsyncIterator
+from pathlib import Path
+from typing import Any
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
 
-from src.api.dependencies import get_property_repository
+from src.api.dependencies import (
+    get_banding_agent_pool,
+    get_banding_cache,
+    get_locality_stats_table,
+    get_profile_trace_dir,
+    get_property_repository,
+    get_rent_sketch_index,
+)
 from src.api.schemas import (
+    CityStatsResponse,
     HardConfigRequest,
+    LocalityStatsResponse,
     PropertyAnalysisRequest,
     PropertyAnalysisResponse,
+    PropertyBulkAnalysisRequest,
+    PropertyBulkAnalysisResponse,
     PropertyCreateRequest,
+    PropertyPageResponse,
     PropertyResponse,
+    PropertySummaryResponse,
+    RentRangeResponse,
     SoftConfigRequest,
 )
-from src.core_engine.graphs.property_banding_workflow import analyze_property_with_banding
+from src.core_engine.agents.agent_pool import BandingAgentPool, BandingQueueFullError
+from src.core_engine.agents.banding_cache import BandingCache
+from src.core_engine.graphs.property_banding_workflow import (
+    analyze_properties_with_banding,
+    analyze_property_with_banding,
+)
+from src.core_engine.utils.columnar_snapshot import ColumnarCitySnapshot
+from src.core_engine.utils.locality_stats import LocalityStatsTable
+from src.core_engine.utils.profiler import profile_request, profile_stage
+from src.core_engine.utils.rent_sketches import (
+    RentSketchIndex,
+    SketchKey,
+    city_key,
+    config_group_key,
+    locality_key,
+)
 from src.database.property_repository import PropertyRepository
-from src.models.property import Property
+from src.models.property import PROPERTY_FIELDS, Property
 from src.models.property_config import HardConfig, SoftConfig
 
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+BulkSubjects = tuple[ColumnarCitySnapshot | None, list[Property], list[Property]]
+
 router = APIRouter(prefix="/api/v1", tags=["properties"])
 
 
@@ -49,6 +90,30 @@ async def create_property(
     )
 
 
+@router.get("/properties/page", response_model=PropertyPageResponse)
+async def list_properties_page(
+    city: str | None = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
+    repository: PropertyRepository = Depends(get_property_repository),
+):
+    properties, next_cursor = await repository.get_page(limit, city, cursor)
+    return PropertyPageResponse(
+        items=[property_response(prop) for prop in properties], next_cursor=next_cursor
+    )
+
+
+@router.get("/properties/stream")
+async def stream_properties(
+    city: str | None = None,
+    fields: str | None = None,
+    repository: PropertyRepository = Depends(get_property_repository),
+):
+    selected_fields = PROPERTY_FIELDS if fields is None else parse_fields(fields)
+    documents = repository.stream_documents(city, selected_fields)
+    return StreamingResponse(ndjson_lines(documents), media_type=NDJSON_MEDIA_TYPE)
+
+
 @router.get("/properties/{property_id}", response_model=PropertyResponse)
 async def get_property(
     property_id: str, repository: PropertyRepository = Depends(get_property_repository)
@@ -58,64 +123,251 @@ async def get_property(
     if not property_obj:
         raise HTTPException(status_code=404, detail="Property not found")
 
-    return PropertyResponse(
-        id=property_obj.id,
-        hard_config=HardConfigRequest(**property_obj.hard_config.model_dump()),
-        soft_config=SoftConfigRequest(**property_obj.soft_config.model_dump()),
-        city=property_obj.city,
-        locality=property_obj.locality,
-        latitude=property_obj.latitude,
-        longitude=property_obj.longitude,
-        current_rent=property_obj.current_rent,
-    )
+    return property_response(property_obj)
 
 
-@router.get("/properties", response_model=list[PropertyResponse])
+@router.get(
+    "/properties",
+    response_model=list[PropertyResponse | PropertySummaryResponse],
+    response_model_exclude_unset=True,
+)
 async def list_properties(
-    city: str | None = None, repository: PropertyRepository = Depends(get_property_repository)
+    city: str | None = None,
+    fields: str | None = None,
+    repository: PropertyRepository = Depends(get_property_repository),
 ):
+    if fields is not None:
+        selected_fields = parse_fields(fields)
+        summaries = await repository.get_projected(selected_fields, city)
+        return [
+            PropertySummaryResponse.model_validate(summary.model_dump(exclude_unset=True))
+            for summary in summaries
+        ]
+
     if city:
         properties = await repository.get_by_city(city)
     else:
         properties = await repository.get_all()
 
-    return [
-        PropertyResponse(
-            id=prop.id,
-            hard_config=HardConfigRequest(**prop.hard_config.model_dump()),
-            soft_config=SoftConfigRequest(**prop.soft_config.model_dump()),
-            city=prop.city,
-            locality=prop.locality,
-            latitude=prop.latitude,
-            longitude=prop.longitude,
-            current_rent=prop.current_rent,
+    return [property_response(prop) for prop in properties]
+
+
+@router.get("/stats/{city}", response_model=CityStatsResponse)
+async def get_city_stats(
+    city: str, locality_stats: LocalityStatsTable = Depends(get_locality_stats_table)
+):
+    return CityStatsResponse(
+        city=city,
+        localities=[LocalityStatsResponse(**stats) for stats in locality_stats.city_stats(city)],
+    )
+
+
+@router.get("/stats/{city}/rent-range", response_model=RentRangeResponse)
+async def get_rent_range(
+    city: str,
+    locality: str | None = None,
+    bhk_type: str | None = None,
+    bedrooms: int | None = None,
+    bathrooms: int | None = None,
+    property_type: str | None = None,
+    rent_sketches: RentSketchIndex = Depends(get_rent_sketch_index),
+):
+    config = (bhk_type, bedrooms, bathrooms, property_type)
+    key: SketchKey
+    if all(value is None for value in config):
+        key = city_key(city) if locality is None else locality_key(city, locality)
+    elif any(value is None for value in config):
+        raise HTTPException(
+            status_code=422,
+            detail="Provide all of bhk_type, bedrooms, bathrooms and property_type, or none",
         )
-        for prop in properties
-    ]
+    else:
+        key = config_group_key(city, tuple(str(value) for value in config), locality)
+
+    rent_range = rent_sketches.rent_range(key)
+    if rent_range is None:
+        raise HTTPException(status_code=404, detail="No rents recorded for this grouping")
+
+    return RentRangeResponse.model_validate(
+        {
+            "city": city,
+            "locality": locality,
+            "bhk_type": bhk_type,
+            "bedrooms": bedrooms,
+            "bathrooms": bathrooms,
+            "property_type": property_type,
+            **rent_range,
+        }
+    )
 
 
 @router.post("/properties/analyze", response_model=PropertyAnalysisResponse)
 async def analyze_property(
     request: PropertyAnalysisRequest,
     repository: PropertyRepository = Depends(get_property_repository),
+    banding_cache: BandingCache = Depends(get_banding_cache),
+    banding_agent_pool: BandingAgentPool = Depends(get_banding_agent_pool),
+    profile_trace_dir: Path = Depends(get_profile_trace_dir),
 ):
-    property_obj = await repository.get_by_id(request.property_id)
+    with profile_request("analyze", request.profile) as profile:
+        with profile_stage("repository_fetch"):
+            property_obj = await repository.get_by_id(request.property_id)
 
-    if not property_obj:
-        raise HTTPException(status_code=404, detail="Property not found")
+            if not property_obj:
+                raise HTTPException(status_code=404, detail="Property not found")
+
+            city_snapshot, comparables = await load_comparables(request, repository, [property_obj])
+
+        try:
+            result = await analyze_property_with_banding(
+                new_property=property_obj,
+                all_properties=comparables,
+                radius_km=request.radius_km,
+                area_tolerance_percent=request.area_tolerance_percent,
+                k=request.k,
+                adaptive=request.adaptive,
+                min_comparables=request.min_comparables,
+                max_comparables=request.max_comparables,
+                max_radius_km=request.max_radius_km,
+                banding_cache=banding_cache,
+                banding_agent_pool=banding_agent_pool,
+                city_snapshot=city_snapshot,
+            )
+        except BandingQueueFullError as error:
+            raise HTTPException(status_code=503, detail=str(error)) from error
+
+    response = analysis_response(request.property_id, result)
+    if profile is not None:
+        trace_path = profile.write_folded(profile_trace_dir, f"analyze-{request.property_id}")
+        response.profile = {**profile.summary(), "trace_file": str(trace_path)}
+    return response
+
+
+@router.post("/properties/analyze/bulk", response_model=PropertyBulkAnalysisResponse)
+async def analyze_properties_in_bulk(
+    request: PropertyBulkAnalysisRequest,
+    repository: PropertyRepository = Depends(get_property_repository),
+    banding_cache: BandingCache = Depends(get_banding_cache),
+    banding_agent_pool: BandingAgentPool = Depends(get_banding_agent_pool),
+):
+    responses: list[PropertyAnalysisResponse] = []
+    for city_snapshot, subjects, comparables in await load_bulk_subjects(request, repository):
+        try:
+            results = await analyze_properties_with_banding(
+                new_properties=subjects,
+                all_properties=comparables,
+                radius_km=request.radius_km,
+                area_tolerance_percent=request.area_tolerance_percent,
+                k=request.k,
+                adaptive=request.adaptive,
+                min_comparables=request.min_comparables,
+                max_comparables=request.max_comparables,
+                max_radius_km=request.max_radius_km,
+                banding_cache=banding_cache,
+                banding_agent_pool=banding_agent_pool,
+                city_snapshot=city_snapshot,
+            )
+        except BandingQueueFullError as error:
+            raise HTTPException(status_code=503, detail=str(error)) from error
+
+        responses.extend(
+            analysis_response(subject.id, result)
+            for subject, result in zip(subjects, results, strict=True)
+        )
+
+    return PropertyBulkAnalysisResponse(results=responses)
+
+
+async def load_bulk_subjects(
+    request: PropertyBulkAnalysisRequest, repository: PropertyRepository
+) -> list[BulkSubjects]:
+    if request.city:
+        city_columns = await repository.get_columns_by_city(request.city)
+        return [(city_columns, city_columns.materialize(range(len(city_columns))), [])]
+
+    property_ids = request.property_ids or []
+    subjects = await repository.get_by_ids(property_ids)
+    missing_ids = set(property_ids) - {subject.id for subject in subjects}
+    if missing_ids:
+        raise HTTPException(
+            status_code=404, detail=f"Properties not found: {', '.join(sorted(missing_ids))}"
+        )
 
-    all_properties = await repository.get_by_city(property_obj.city)
+    subjects_by_city: dict[str, list[Property]] = {}
+    for subject in subjects:
+        subjects_by_city.setdefault(subject.city, []).append(subject)
+    loaded: list[BulkSubjects] = []
+    for city_subjects in subjects_by_city.values():
+        city_snapshot, comparables = await load_comparables(request, repository, city_subjects)
+        loaded.append((city_snapshot, city_subjects, comparables))
+    return loaded
 
-    result = analyze_property_with_banding(
-        new_property=property_obj,
-        all_properties=all_properties,
-        radius_km=request.radius_km,
-        area_tolerance_percent=request.area_tolerance_percent,
+
+async def load_comparables(
+    request: PropertyAnalysisRequest | PropertyBulkAnalysisRequest,
+    repository: PropertyRepository,
+    subjects: list[Property],
+) -> tuple[ColumnarCitySnapshot | None, list[Property]]:
+    city_snapshot = repository.get_cached_columns_by_city(subjects[0].city)
+    if city_snapshot is not None:
+        return city_snapshot, []
+
+    radius_km = candidate_radius_km(request)
+    candidate_lists = await asyncio.gather(
+        *(
+            repository.find_comparables(subject, radius_km, request.area_tolerance_percent)
+            for subject in subjects
+        )
     )
+    candidates = {prop.id: prop for candidate_list in candidate_lists for prop in candidate_list}
+    return None, list(candidates.values())
+
 
+def candidate_radius_km(
+    request: PropertyAnalysisRequest | PropertyBulkAnalysisRequest,
+) -> float | None:
+    if request.k:
+        return None
+    if request.adaptive:
+        return request.max_radius_km
+    return request.radius_km
+
+
+def analysis_response(property_id: str, result: dict[str, Any]) -> PropertyAnalysisResponse:
     return PropertyAnalysisResponse(
-        property_id=request.property_id,
+        property_id=property_id,
         filtered_properties_count=len(result["filtered_properties"]),
+        search_radius_km=result["search_radius_km"],
+        neighbourhood_stats=result["neighbourhood_stats"],
         banding_result=result["banding_result"],
         iqr_analysis=result["iqr_analysis"],
     )
+
+
+def parse_fields(fields: str) -> list[str]:
+    selected = [field.strip() for field in fields.split(",") if field.strip()]
+    unknown = sorted(set(selected) - set(PROPERTY_FIELDS))
+    if not selected or unknown:
+        raise HTTPException(
+            status_code=422,
+            detail=f"fields must be a comma-separated subset of {', '.join(PROPERTY_FIELDS)}",
+        )
+    return selected
+
+
+def property_response(prop: Property) -> PropertyResponse:
+    return PropertyResponse(
+        id=prop.id,
+        hard_config=HardConfigRequest(**prop.hard_config.model_dump()),
+        soft_config=SoftConfigRequest(**prop.soft_config.model_dump()),
+        city=prop.city,
+        locality=prop.locality,
+        latitude=prop.latitude,
+        longitude=prop.longitude,
+        current_rent=prop.current_rent,
+    )
+
+
+async def ndjson_lines(documents: AsyncIterator[dict[str, Any]]) -> AsyncIterator[str]:
+    async for document in documents:
+        yield json.dumps(document) + "\n"
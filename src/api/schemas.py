@@ -1,6 +1,6 @@
 from typing import Any
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, model_validator
 
 
 class HardConfigRequest(BaseModel):
@@ -38,14 +38,98 @@ class PropertyResponse(BaseModel):
     current_rent: float | None
 
 
+class PropertySummaryResponse(BaseModel):
+    id: str | None = None
+    hard_config: HardConfigRequest | None = None
+    soft_config: SoftConfigRequest | None = None
+    city: str | None = None
+    locality: str | None = None
+    latitude: float | None = None
+    longitude: float | None = None
+    current_rent: float | None = None
+
+
+class PropertyPageResponse(BaseModel):
+    items: list[PropertyResponse]
+    next_cursor: str | None
+
+
 class PropertyAnalysisRequest(BaseModel):
     property_id: str
     radius_km: float = 2.0
     area_tolerance_percent: float = 15.0
+    k: int | None = Field(None, gt=0)
+    adaptive: bool = False
+    min_comparables: int = 10
+    max_comparables: int = 50
+    max_radius_km: float = 10.0
+    profile: bool = False
 
 
 class PropertyAnalysisResponse(BaseModel):
     property_id: str
     filtered_properties_count: int
+    search_radius_km: float | None = None
+    neighbourhood_stats: dict[str, float] | None = None
     banding_result: dict[str, Any] | None
     iqr_analysis: dict[str, float] | None
+    profile: dict[str, Any] | None = None
+
+
+class PropertyBulkAnalysisRequest(BaseModel):
+    city: str | None = None
+    property_ids: list[str] | None = None
+    radius_km: float = 2.0
+    area_tolerance_percent: float = 15.0
+    k: int | None = Field(None, gt=0)
+    adaptive: bool = False
+    min_comparables: int = 10
+    max_comparables: int = 50
+    max_radius_km: float = 10.0
+
+    @model_validator(mode="after")
+    def check_subjects(self) -> "PropertyBulkAnalysisRequest":
+        if (self.city is None) == (self.property_ids is None):
+            raise ValueError("Provide exactly one of city or property_ids")
+        return self
+
+
+class PropertyBulkAnalysisResponse(BaseModel):
+    results: list[PropertyAnalysisResponse]
+
+
+class LocalityStatsResponse(BaseModel):
+    locality: str
+    bhk_type: str
+    count: int
+    rent_sum: float
+    average_rent: float
+    min_rent: float
+    max_rent: float
+    q1_rent: float | None
+    median_rent: float | None
+    q3_rent: float | None
+    average_rent_per_sqft: float | None
+    median_rent_per_sqft: float | None
+
+
+class CityStatsResponse(BaseModel):
+    city: str
+    localities: list[LocalityStatsResponse]
+
+
+class RentRangeResponse(BaseModel):
+    city: str
+    locality: str | None = None
+    bhk_type: str | None = None
+    bedrooms: int | None = None
+    bathrooms: int | None = None
+    property_type: str | None = None
+    q1: float
+    median: float
+    q3: float
+    iqr: float
+    recommended_min: float
+    recommended_max: float
+    count: int
+    relative_error: float
@@ -0,0 +1,98 @@
+import asyncio
+from collections.abc import AsyncIterator, Callable
+from contextlib import asynccontextmanager
+
+from src.core_engine.agents.banding_agent import (
+    DEFAULT_TEMPERATURE,
+    BandingResult,
+    PropertyBandingAgent,
+    subject_chunks,
+)
+from src.models.property import Property
+
+DEFAULT_MAX_IN_FLIGHT = 8
+DEFAULT_MAX_QUEUED = 32
+
+
+class BandingQueueFullError(Exception):
+    pass
+
+
+class BandingAgentPool:
+    def __init__(
+        self,
+        anthropic_api_key: str | Callable[[], str],
+        max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+        max_queued: int = DEFAULT_MAX_QUEUED,
+        max_slots_per_call: int | None = None,
+    ):
+        self.anthropic_api_key = anthropic_api_key
+        self.max_in_flight = max_in_flight
+        self.max_queued = max_queued
+        self.max_slots_per_call = max_slots_per_call or max(1, max_in_flight // 2)
+        self.queued = 0
+        self._agents: dict[float, PropertyBandingAgent] = {}
+        self._slots = asyncio.Semaphore(max_in_flight)
+
+    def agent(self, temperature: float = DEFAULT_TEMPERATURE) -> PropertyBandingAgent:
+        if temperature not in self._agents:
+            self._agents[temperature] = PropertyBandingAgent(
+                anthropic_api_key=self.api_key(), temperature=temperature
+            )
+        return self._agents[temperature]
+
+    def api_key(self) -> str:
+        if callable(self.anthropic_api_key):
+            self.anthropic_api_key = self.anthropic_api_key()
+        return self.anthropic_api_key
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        async with self.slots(1):
+            yield
+
+    @asynccontextmanager
+    async def slots(self, wanted: int) -> AsyncIterator[int]:
+        if self._slots.locked() and self.queued >= self.max_queued:
+            raise BandingQueueFullError(
+                f"{self.queued} banding requests are already waiting for a free slot"
+            )
+
+        self.queued += 1
+        try:
+            await self._slots.acquire()
+        finally:
+            self.queued -= 1
+
+        held = 1
+        try:
+            while held < min(wanted, self.max_slots_per_call) and not self._slots.locked():
+                await self._slots.acquire()
+                held += 1
+            yield held
+        finally:
+            for _ in range(held):
+                self._slots.release()
+
+    async def aband_properties(
+        self,
+        new_property: Property,
+        similar_properties: list[Property],
+        temperature: float = DEFAULT_TEMPERATURE,
+    ) -> BandingResult:
+        agent = self.agent(temperature)
+        async with self.slot():
+            return await agent.aband_properties(new_property, similar_properties)
+
+    async def aband_many_properties(
+        self,
+        new_properties: list[Property],
+        similar_properties: list[Property],
+        temperature: float = DEFAULT_TEMPERATURE,
+        exclusions: dict[str, list[str]] | None = None,
+    ) -> list[BandingResult]:
+        agent = self.agent(temperature)
+        async with self.slots(len(subject_chunks(new_properties))) as held:
+            return await agent.aband_many_properties(
+                new_properties, similar_properties, max_concurrency=held, exclusions=exclusions
+            )
@@ -1,10 +1,21 @@
+import asyncio
+from math import ceil
 from typing import cast
 
 from langchain_anthropic import ChatAnthropic
+from langchain_core.language_models import LanguageModelInput
 from pydantic import BaseModel, Field, SecretStr
 
+from src.core_engine.utils.metrics import LLM_LATENCY, PROMPT_CHARACTERS, PROMPT_TOKENS
+from src.core_engine.utils.profiler import profile_stage
 from src.models.property import Property
 
+DEFAULT_TEMPERATURE = 0.5
+DETERMINISTIC_TEMPERATURE = 0.0
+DEFAULT_PARAMETER_HINTS = ["furnishing_level", "rent_per_sqft", "amenities_count"]
+MAX_SUBJECTS_PER_PROMPT = 10
+CHARS_PER_TOKEN = 4
+
 
 class BandingResult(BaseModel):
     bands: dict[str, list[str]] = Field(description="Property IDs grouped by band (L1-L5)")
@@ -14,13 +25,42 @@ class BandingResult(BaseModel):
     confidence_score: float = Field(description="Confidence score between 0 and 1")
 
 
+class MultiBandingResult(BaseModel):
+    bands: dict[str, list[str]] = Field(description="Property IDs grouped by band (L1-L5)")
+    parameters_used: list[str] = Field(description="List of parameters used for banding")
+    parameters_rationale: str = Field(description="Explanation of why these parameters were chosen")
+    new_property_bands: dict[str, str] = Field(
+        description="Band (L1-L5) assigned to each new property, keyed by property ID"
+    )
+    confidence_score: float = Field(description="Confidence score between 0 and 1")
+
+    def for_subject(
+        self, subject_id: str, excluded: list[str] | None = None
+    ) -> BandingResult | None:
+        if subject_id not in self.new_property_bands:
+            return None
+        excluded_ids = set(excluded or [])
+        return BandingResult(
+            bands={
+                band: [prop_id for prop_id in ids if prop_id not in excluded_ids]
+                for band, ids in self.bands.items()
+            },
+            parameters_used=self.parameters_used,
+            parameters_rationale=self.parameters_rationale,
+            new_property_band=self.new_property_bands[subject_id],
+            confidence_score=self.confidence_score,
+        )
+
+
 class PropertyBandingAgent:
-    def __init__(self, anthropic_api_key: str):
+    def __init__(self, anthropic_api_key: str, temperature: float = DEFAULT_TEMPERATURE):
         self.llm = ChatAnthropic(
             model_name="claude-3-5-sonnet-20241022",
-            temperature=0.5,
+            temperature=temperature,
             api_key=SecretStr(anthropic_api_key),
         )
+        self.structured_llm = self.llm.with_structured_output(BandingResult)
+        self.multi_structured_llm = self.llm.with_structured_output(MultiBandingResult)
 
     def band_properties(
         self,
@@ -28,79 +68,120 @@ class PropertyBandingAgent:
         similar_properties: list[Property],
         parameter_hints: list[str] | None = None,
     ) -> BandingResult:
-        if parameter_hints is None:
-            parameter_hints = ["furnishing_level", "rent_per_sqft", "amenities_count"]
+        with profile_stage("prompt_build"):
+            prompt = self._build_prompt(new_property, similar_properties, parameter_hints)
+        record_prompt(prompt)
 
-        structured_llm = self.llm.with_structured_output(BandingResult)
+        with profile_stage("llm"), LLM_LATENCY.time("band"):
+            result = self.structured_llm.invoke(prompt)
+
+        return cast(BandingResult, result)
 
-        prompt = self._build_prompt(new_property, similar_properties, parameter_hints)
+    async def aband_properties(
+        self,
+        new_property: Property,
+        similar_properties: list[Property],
+        parameter_hints: list[str] | None = None,
+    ) -> BandingResult:
+        with profile_stage("prompt_build"):
+            prompt = self._build_prompt(new_property, similar_properties, parameter_hints)
+        record_prompt(prompt)
 
-        result = structured_llm.invoke(prompt)
+        with profile_stage("llm"), LLM_LATENCY.time("band"):
+            result = await self.structured_llm.ainvoke(prompt)
 
         return cast(BandingResult, result)
 
-    def _build_prompt(
-        self, new_property: Property, similar_properties: list[Property], parameter_hints: list[str]
-    ) -> str:
-        prompt = f"""You are a property analysis expert. Your task is to categorize properties \
-into 5 bands (L1 to L5) based on their features and market positioning.
+    def band_many_properties(
+        self,
+        new_properties: list[Property],
+        similar_properties: list[Property],
+        parameter_hints: list[str] | None = None,
+        exclusions: dict[str, list[str]] | None = None,
+    ) -> list[BandingResult]:
+        exclusions = exclusions or {}
+        chunks = subject_chunks(new_properties)
+        with profile_stage("prompt_build"):
+            prompts: list[LanguageModelInput] = [
+                self._build_multi_prompt(chunk, similar_properties, parameter_hints, exclusions)
+                for chunk in chunks
+            ]
 
-L5 = Best/Premium properties
-L4 = High-quality properties
-L3 = Mid-range properties
-L2 = Basic properties
-L1 = Minimal/Entry-level properties
+        for prompt in prompts:
+            record_prompt(cast(str, prompt))
 
-Parameter Hints (you can use these or discover better ones):
-{", ".join(parameter_hints)}
-
-Similar Properties to Analyze:
-"""
+        with profile_stage("llm"), LLM_LATENCY.time("band_many"):
+            outputs = cast(list[MultiBandingResult], self.multi_structured_llm.batch(prompts))
 
-        for prop in similar_properties:
-            furniture = (
-                ", ".join(prop.soft_config.furniture_items)
-                if prop.soft_config.furniture_items
-                else "None"
+        results = split_multi_results(chunks, outputs, exclusions)
+        return [
+            result
+            or self.band_properties(
+                new_property,
+                without_ids(similar_properties, exclusions.get(new_property.id)),
+                parameter_hints,
             )
-            appliances = (
-                ", ".join(prop.soft_config.appliances) if prop.soft_config.appliances else "None"
-            )
-            amenities = (
-                ", ".join(prop.soft_config.amenities) if prop.soft_config.amenities else "None"
+            for new_property, result in zip(new_properties, results, strict=True)
+        ]
+
+    async def aband_many_properties(
+        self,
+        new_properties: list[Property],
+        similar_properties: list[Property],
+        parameter_hints: list[str] | None = None,
+        max_concurrency: int | None = None,
+        exclusions: dict[str, list[str]] | None = None,
+    ) -> list[BandingResult]:
+        exclusions = exclusions or {}
+        chunks = subject_chunks(new_properties)
+        with profile_stage("prompt_build"):
+            prompts: list[LanguageModelInput] = [
+                self._build_multi_prompt(chunk, similar_properties, parameter_hints, exclusions)
+                for chunk in chunks
+            ]
+
+        for prompt in prompts:
+            record_prompt(cast(str, prompt))
+
+        with profile_stage("llm"), LLM_LATENCY.time("band_many"):
+            outputs = cast(
+                list[MultiBandingResult],
+                await self.multi_structured_llm.abatch(
+                    prompts, config={"max_concurrency": max_concurrency}
+                ),
             )
-            prompt += f"""
-Property ID: {prop.id}
-- Furniture: {furniture}
-- Appliances: {appliances}
-- Amenities: {amenities}
-- Current Rent: {prop.current_rent if prop.current_rent else "Not set"}
-- Area: {prop.hard_config.area_sqft} sqft
-"""
 
-        new_furniture = (
-            ", ".join(new_property.soft_config.furniture_items)
-            if new_property.soft_config.furniture_items
-            else "None"
-        )
-        new_appliances = (
-            ", ".join(new_property.soft_config.appliances)
-            if new_property.soft_config.appliances
-            else "None"
-        )
-        new_amenities = (
-            ", ".join(new_property.soft_config.amenities)
-            if new_property.soft_config.amenities
-            else "None"
-        )
+        results = split_multi_results(chunks, outputs, exclusions)
+        missing = [position for position, result in enumerate(results) if result is None]
+        retry_slots = asyncio.Semaphore(max_concurrency or len(missing) or 1)
 
-        prompt += f"""
+        async def retry(new_property: Property) -> BandingResult:
+            async with retry_slots:
+                return await self.aband_properties(
+                    new_property,
+                    without_ids(similar_properties, exclusions.get(new_property.id)),
+                    parameter_hints,
+                )
+
+        retried = await asyncio.gather(*(retry(new_properties[position]) for position in missing))
+        for position, result in zip(missing, retried, strict=True):
+            results[position] = result
+
+        return cast(list[BandingResult], results)
+
+    def _build_prompt(
+        self,
+        new_property: Property,
+        similar_properties: list[Property],
+        parameter_hints: list[str] | None,
+    ) -> str:
+        footer = f"""
 
 New Property to Classify:
 Property ID: {new_property.id}
-- Furniture: {new_furniture}
-- Appliances: {new_appliances}
-- Amenities: {new_amenities}
+- Furniture: {listed(new_property.soft_config.furniture_items)}
+- Appliances: {listed(new_property.soft_config.appliances)}
+- Amenities: {listed(new_property.soft_config.amenities)}
 - Area: {new_property.hard_config.area_sqft} sqft
 
 Task:
@@ -117,4 +198,127 @@ Return a structured response with:
 - confidence_score: Your confidence (0-1)
 """
 
-        return prompt
+        return "".join(
+            [
+                prompt_header(parameter_hints),
+                *map(format_comparable, similar_properties),
+                footer,
+            ]
+        )
+
+    def _build_multi_prompt(
+        self,
+        new_properties: list[Property],
+        similar_properties: list[Property],
+        parameter_hints: list[str] | None,
+        exclusions: dict[str, list[str]],
+    ) -> str:
+        footer = """
+
+Task:
+1. Analyze the similar properties and categorize them into bands L1-L5
+2. Determine which parameters are most relevant for categorization
+3. Place every new property into the appropriate band, ignoring the similar properties it excludes
+4. Provide confidence score and rationale
+
+Return a structured response with:
+- bands: Dictionary mapping band names to lists of similar property IDs
+- parameters_used: List of parameters you used
+- parameters_rationale: Brief explanation of your categorization logic
+- new_property_bands: Dictionary mapping each new property ID to its band
+- confidence_score: Your confidence (0-1)
+"""
+
+        return "".join(
+            [
+                prompt_header(parameter_hints),
+                *map(format_comparable, similar_properties),
+                "\n\nNew Properties to Classify:\n",
+                *(
+                    format_subject(new_property, exclusions.get(new_property.id))
+                    for new_property in new_properties
+                ),
+                footer,
+            ]
+        )
+
+
+def prompt_header(parameter_hints: list[str] | None) -> str:
+    if parameter_hints is None:
+        parameter_hints = DEFAULT_PARAMETER_HINTS
+
+    return f"""You are a property analysis expert. Your task is to categorize properties \
+into 5 bands (L1 to L5) based on their features and market positioning.
+
+L5 = Best/Premium properties
+L4 = High-quality properties
+L3 = Mid-range properties
+L2 = Basic properties
+L1 = Minimal/Entry-level properties
+
+Parameter Hints (you can use these or discover better ones):
+{", ".join(parameter_hints)}
+
+Similar Properties to Analyze:
+"""
+
+
+def estimate_tokens(text: str) -> int:
+    return ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def record_prompt(prompt: str) -> None:
+    PROMPT_CHARACTERS.inc(len(prompt))
+    PROMPT_TOKENS.inc(estimate_tokens(prompt))
+
+
+def listed(items: list[str]) -> str:
+    return ", ".join(items) if items else "None"
+
+
+def format_comparable(prop: Property) -> str:
+    return f"""
+Property ID: {prop.id}
+- Furniture: {listed(prop.soft_config.furniture_items)}
+- Appliances: {listed(prop.soft_config.appliances)}
+- Amenities: {listed(prop.soft_config.amenities)}
+- Current Rent: {prop.current_rent if prop.current_rent else "Not set"}
+- Area: {prop.hard_config.area_sqft} sqft
+"""
+
+
+def format_subject(prop: Property, excluded: list[str] | None = None) -> str:
+    exclusion = f"- Excludes similar properties: {', '.join(excluded)}\n" if excluded else ""
+    return f"""
+Property ID: {prop.id}
+- Furniture: {listed(prop.soft_config.furniture_items)}
+- Appliances: {listed(prop.soft_config.appliances)}
+- Amenities: {listed(prop.soft_config.amenities)}
+- Area: {prop.hard_config.area_sqft} sqft
+{exclusion}"""
+
+
+def without_ids(properties: list[Property], excluded: list[str] | None) -> list[Property]:
+    if not excluded:
+        return properties
+    excluded_ids = set(excluded)
+    return [prop for prop in properties if prop.id not in excluded_ids]
+
+
+def subject_chunks(new_properties: list[Property]) -> list[list[Property]]:
+    return [
+        new_properties[start : start + MAX_SUBJECTS_PER_PROMPT]
+        for start in range(0, len(new_properties), MAX_SUBJECTS_PER_PROMPT)
+    ]
+
+
+def split_multi_results(
+    chunks: list[list[Property]],
+    outputs: list[MultiBandingResult],
+    exclusions: dict[str, list[str]],
+) -> list[BandingResult | None]:
+    return [
+        output.for_subject(new_property.id, exclusions.get(new_property.id))
+        for chunk, output in zip(chunks, outputs, strict=True)
+        for new_property in chunk
+    ]
@@ -0,0 +1,66 @@
+import hashlib
+from collections import OrderedDict
+from typing import Protocol
+
+from src.core_engine.agents.banding_agent import BandingResult
+from src.models.property import Property
+
+DEFAULT_MAX_ENTRIES = 1024
+
+
+class BandingCache(Protocol):
+    async def get(self, key: str) -> BandingResult | None: ...
+
+    async def set(self, key: str, result: BandingResult) -> None: ...
+
+
+def banding_cache_key(new_property: Property, comparables: list[Property]) -> str:
+    digest = hashlib.sha256()
+    digest.update(new_property.hard_config.model_dump_json().encode())
+    digest.update(new_property.soft_config.model_dump_json().encode())
+
+    for comparable in sorted(comparables, key=lambda prop: prop.id):
+        digest.update(comparable.id.encode())
+        digest.update(comparable_version(comparable).encode())
+
+    return digest.hexdigest()
+
+
+def comparable_version(comparable: Property) -> str:
+    return hashlib.sha256(comparable.model_dump_json().encode()).hexdigest()
+
+
+class InMemoryBandingCache:
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, BandingResult] = OrderedDict()
+
+    async def get(self, key: str) -> BandingResult | None:
+        result = self._entries.get(key)
+        if result is not None:
+            self._entries.move_to_end(key)
+        return result
+
+    async def set(self, key: str, result: BandingResult) -> None:
+        self._entries[key] = result
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+
+class TieredBandingCache:
+    def __init__(self, *tiers: BandingCache):
+        self.tiers = tiers
+
+    async def get(self, key: str) -> BandingResult | None:
+        for depth, tier in enumerate(self.tiers):
+            result = await tier.get(key)
+            if result is not None:
+                for faster_tier in self.tiers[:depth]:
+                    await faster_tier.set(key, result)
+                return result
+        return None
+
+    async def set(self, key: str, result: BandingResult) -> None:
+        for tier in self.tiers:
+            await tier.set(key, result)
@@ -0,0 +1,109 @@
+import numpy as np
+import numpy.typing as npt
+
+from src.core_engine.agents.banding_agent import BandingResult, estimate_tokens, format_comparable
+from src.core_engine.agents.local_banding import amenities_count, percentile_ranks, rent_per_sqft
+from src.core_engine.utils.geo import FloatArray
+from src.models.property import Property
+
+DEFAULT_PROMPT_TOKEN_BUDGET = 4000
+STRATA_PER_FEATURE = 4
+
+Stratum = tuple[int, int]
+
+
+def comparable_features(properties: list[Property]) -> FloatArray:
+    rents = np.array([rent_per_sqft(prop) for prop in properties])
+    areas = np.array([prop.hard_config.area_sqft for prop in properties])
+    amenities = np.array([amenities_count(prop) for prop in properties], float)
+    return np.column_stack(
+        [
+            np.nan_to_num(percentile_ranks(rents, rents), nan=0.5),
+            percentile_ranks(areas, areas),
+            percentile_ranks(amenities, amenities),
+        ]
+    )
+
+
+def stratum_bins(values: FloatArray) -> npt.NDArray[np.int64]:
+    bins = np.full(values.shape, STRATA_PER_FEATURE, dtype=np.int64)
+    known = ~np.isnan(values)
+    if known.any():
+        edges = np.quantile(values[known], np.linspace(0, 1, STRATA_PER_FEATURE + 1)[1:-1])
+        bins[known] = np.searchsorted(edges, values[known], side="right")
+    return bins
+
+
+def extreme_positions(rents: FloatArray, areas: FloatArray) -> list[int]:
+    positions = [int(np.argmin(areas)), int(np.argmax(areas))]
+    if not np.isnan(rents).all():
+        positions = [int(np.nanargmin(rents)), int(np.nanargmax(rents)), *positions]
+    return list(dict.fromkeys(positions))
+
+
+def prioritize_comparables(comparables: list[Property]) -> list[Property]:
+    if not comparables:
+        return []
+
+    rents = np.array([rent_per_sqft(prop) for prop in comparables])
+    areas = np.array([prop.hard_config.area_sqft for prop in comparables])
+    features = comparable_features(comparables)
+
+    strata: dict[Stratum, list[int]] = {}
+    for position, stratum in enumerate(zip(stratum_bins(rents), stratum_bins(areas), strict=True)):
+        strata.setdefault((int(stratum[0]), int(stratum[1])), []).append(position)
+
+    queues = []
+    for stratum in sorted(strata):
+        members = np.array(strata[stratum])
+        spread = np.linalg.norm(features[members] - np.median(features[members], axis=0), axis=1)
+        queues.append(members[np.argsort(spread, kind="stable")].tolist())
+
+    order = extreme_positions(rents, areas)
+    for round_positions in zip_longest_positions(queues):
+        order.extend(round_positions)
+
+    return [comparables[position] for position in dict.fromkeys(order)]
+
+
+def zip_longest_positions(queues: list[list[int]]) -> list[list[int]]:
+    longest = max(len(queue) for queue in queues)
+    return [[queue[depth] for queue in queues if depth < len(queue)] for depth in range(longest)]
+
+
+def select_comparables_within_budget(
+    comparables: list[Property], token_budget: int = DEFAULT_PROMPT_TOKEN_BUDGET
+) -> list[Property]:
+    selected: list[Property] = []
+    tokens = 0
+    for prop in prioritize_comparables(comparables):
+        tokens += estimate_tokens(format_comparable(prop))
+        if selected and tokens > token_budget:
+            break
+        selected.append(prop)
+    return selected
+
+
+def assign_unselected_comparables(
+    result: BandingResult, selected: list[Property], comparables: list[Property]
+) -> BandingResult:
+    band_by_id = {prop_id: band for band, ids in result.bands.items() for prop_id in ids}
+    selected_ids = {prop.id for prop in selected}
+    banded = [prop for prop in selected if prop.id in band_by_id]
+    unselected = [prop for prop in comparables if prop.id not in selected_ids]
+    if not banded or not unselected:
+        return result
+
+    features = comparable_features(comparables)
+    position_by_id = {prop.id: position for position, prop in enumerate(comparables)}
+    banded_features = features[[position_by_id[prop.id] for prop in banded]]
+    unselected_features = features[[position_by_id[prop.id] for prop in unselected]]
+
+    distances = np.linalg.norm(
+        unselected_features[:, np.newaxis, :] - banded_features[np.newaxis, :, :], axis=2
+    )
+    bands = {band: list(ids) for band, ids in result.bands.items()}
+    for prop, nearest in zip(unselected, np.argmin(distances, axis=1), strict=True):
+        bands[band_by_id[banded[nearest].id]].append(prop.id)
+
+    return result.model_copy(update={"bands": bands})
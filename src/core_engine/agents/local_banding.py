@@ -0,0 +1,109 @@
+import numpy as np
+
+from src.core_engine.agents.banding_agent import BandingResult
+from src.core_engine.utils.geo import FloatArray
+from src.models.property import Property
+
+BANDS = ["L1", "L2", "L3", "L4", "L5"]
+MIN_LOCAL_COMPARABLES = 5
+FULL_CONFIDENCE_COMPARABLES = 20
+MIN_RENTED_SHARE = 0.5
+MAX_RENT_PER_SQFT_VARIATION = 1.0
+DEFAULT_CONFIDENCE_THRESHOLD = 0.7
+FEATURE_WEIGHTS = {"rent_per_sqft": 0.5, "amenities_count": 0.3, "area_sqft": 0.2}
+
+
+def amenities_count(prop: Property) -> int:
+    soft_config = prop.soft_config
+    return (
+        len(soft_config.furniture_items) + len(soft_config.appliances) + len(soft_config.amenities)
+    )
+
+
+def rent_per_sqft(prop: Property) -> float:
+    if prop.current_rent is None or prop.hard_config.area_sqft <= 0:
+        return np.nan
+    return prop.current_rent / prop.hard_config.area_sqft
+
+
+def percentile_ranks(values: FloatArray, reference: FloatArray) -> FloatArray:
+    known = np.sort(reference[~np.isnan(reference)])
+    if known.size == 0:
+        return np.full(values.shape, np.nan)
+
+    below = np.searchsorted(known, values, side="left")
+    at_or_below = np.searchsorted(known, values, side="right")
+    ranks = (below + at_or_below) / (2 * known.size)
+    return np.where(np.isnan(values), np.nan, ranks)
+
+
+def is_unusual_comparable_set(similar_properties: list[Property]) -> bool:
+    if len(similar_properties) < MIN_LOCAL_COMPARABLES:
+        return True
+
+    rents = np.array([rent_per_sqft(prop) for prop in similar_properties])
+    known_rents = rents[~np.isnan(rents)]
+    if known_rents.size < MIN_RENTED_SHARE * len(similar_properties):
+        return True
+
+    return bool(np.std(known_rents) > MAX_RENT_PER_SQFT_VARIATION * np.mean(known_rents))
+
+
+class LocalBandingScorer:
+    def band_properties(
+        self, new_property: Property, similar_properties: list[Property]
+    ) -> BandingResult:
+        features = self._features(similar_properties)
+        comparable_scores = self._scores(features, features)
+        new_property_score = self._scores(self._features([new_property]), features)[0]
+
+        thresholds: FloatArray = np.quantile(comparable_scores, [0.2, 0.4, 0.6, 0.8])
+        bands: dict[str, list[str]] = {band: [] for band in BANDS}
+        for prop, score in zip(similar_properties, comparable_scores, strict=True):
+            bands[self._band_for(score, thresholds)].append(prop.id)
+
+        return BandingResult(
+            bands={band: ids for band, ids in bands.items() if ids},
+            parameters_used=list(FEATURE_WEIGHTS),
+            parameters_rationale=(
+                "Local scoring: weighted percentile ranks of rent per sqft, furnishing, "
+                "appliance and amenity count, and area among the comparables, split into quintiles"
+            ),
+            new_property_band=self._band_for(new_property_score, thresholds),
+            confidence_score=self._confidence(features),
+        )
+
+    def _features(self, properties: list[Property]) -> dict[str, FloatArray]:
+        return {
+            "rent_per_sqft": np.array([rent_per_sqft(prop) for prop in properties]),
+            "amenities_count": np.array([amenities_count(prop) for prop in properties], float),
+            "area_sqft": np.array([prop.hard_config.area_sqft for prop in properties]),
+        }
+
+    def _scores(
+        self, features: dict[str, FloatArray], reference: dict[str, FloatArray]
+    ) -> FloatArray:
+        ranks = np.vstack(
+            [percentile_ranks(features[name], reference[name]) for name in FEATURE_WEIGHTS]
+        )
+        weights = np.array(list(FEATURE_WEIGHTS.values()))[:, np.newaxis]
+        available = ~np.isnan(ranks)
+        weighted = np.where(available, ranks, 0.0) * weights
+        scores: FloatArray = weighted.sum(axis=0) / (available * weights).sum(axis=0)
+        return scores
+
+    def _band_for(self, score: float, thresholds: FloatArray) -> str:
+        return BANDS[int(np.searchsorted(thresholds, score, side="right"))]
+
+    def _confidence(self, features: dict[str, FloatArray]) -> float:
+        rents = features["rent_per_sqft"]
+        amenities = features["amenities_count"][~np.isnan(rents)]
+        known_rents = rents[~np.isnan(rents)]
+        if known_rents.size < 2 or np.ptp(amenities) == 0 or np.ptp(known_rents) == 0:
+            return 0.0
+
+        agreement = np.corrcoef(
+            percentile_ranks(amenities, amenities), percentile_ranks(known_rents, known_rents)
+        )[0, 1]
+        coverage = min(1.0, known_rents.size / FULL_CONFIDENCE_COMPARABLES)
+        return round(float(max(0.0, agreement) * coverage), 3)
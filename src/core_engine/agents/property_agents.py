@@ -3,7 +3,7 @@ from typing import Any
 from langchain.tools import BaseTool
 from pydantic import BaseModel, ConfigDict, Field
 
-from src.core_engine.utils.geo import calculate_distance_km
+from src.core_engine.utils.spatial_index import SpatialGridIndex
 from src.models.property import PropertyListing
 
 
@@ -29,20 +29,11 @@ class PropertyFilterTool(BaseTool):
         reference_property: PropertyListing,
         radius_km: float = 2.0,
     ) -> list[PropertyListing]:
-        filtered_properties = []
+        nearby = SpatialGridIndex(properties).within_radius(
+            reference_property.latitude, reference_property.longitude, radius_km
+        )
 
-        for prop in properties:
-            distance = calculate_distance_km(
-                reference_property.latitude,
-                reference_property.longitude,
-                prop.latitude,
-                prop.longitude,
-            )
-
-            if distance <= radius_km and prop.id != reference_property.id:
-                filtered_properties.append(prop)
-
-        return filtered_properties
+        return [prop for prop in nearby if prop.id != reference_property.id]
 
     async def _arun(
         self,
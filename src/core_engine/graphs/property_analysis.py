@@ -1,11 +1,15 @@
+from datetime import datetime
 from typing import Any, TypedDict
 
 from langgraph.graph import StateGraph
 from langgraph.graph.state import CompiledStateGraph
 
 from src.core_engine.agents.property_agents import PriceAnalyzerTool, PropertyFilterTool
+from src.core_engine.graphs.registry import add_timed_node, workflow_registry
 from src.models.property import PropertyListing
 
+PROPERTY_ANALYSIS_WORKFLOW = "property_analysis"
+
 
 class PropertyAnalysisState(TypedDict):
     properties: list[PropertyListing]
@@ -24,7 +28,9 @@ def create_property_analysis_graph() -> CompiledStateGraph:
     workflow = StateGraph(PropertyAnalysisState)
 
     # Define nodes
-    workflow.add_node(
+    add_timed_node(
+        workflow,
+        PROPERTY_ANALYSIS_WORKFLOW,
         "filter_properties",
         lambda state: {
             "filtered_properties": property_filter.run(
@@ -37,7 +43,9 @@ def create_property_analysis_graph() -> CompiledStateGraph:
         },
     )
 
-    workflow.add_node(
+    add_timed_node(
+        workflow,
+        PROPERTY_ANALYSIS_WORKFLOW,
         "analyze_prices",
         lambda state: {
             "price_analysis": price_analyzer.run({"properties": state["filtered_properties"]})
@@ -68,7 +76,7 @@ def analyze_nearby_properties(
     Returns:
         Dictionary containing filtered properties and price analysis
     """
-    workflow = create_property_analysis_graph()
+    workflow = workflow_registry.get(PROPERTY_ANALYSIS_WORKFLOW)
 
     # Initialize state
     initial_state = {
@@ -84,3 +92,41 @@ def analyze_nearby_properties(
         "filtered_properties": final_state["filtered_properties"],
         "price_analysis": final_state["price_analysis"],
     }
+
+
+def property_analysis_warm_up_state() -> dict[str, Any]:
+    warm_up_listing = PropertyListing(
+        id="warm-up",
+        channel="nobroker",
+        channel_id="warm-up",
+        title="warm-up",
+        city="warm-up",
+        locality="warm-up",
+        society=None,
+        propertyType="apartment",
+        bedrooms="2",
+        bathrooms=2,
+        furnishing=None,
+        facing=None,
+        areaSqFt=1000.0,
+        price=0.0,
+        deposit=None,
+        ownerName=None,
+        description=None,
+        latitude=0.0,
+        longitude=0.0,
+        postedDate=datetime.now(),
+        url="https://example.com",
+        images=[],
+        landmarks=[],
+    )
+    return {
+        "properties": [warm_up_listing],
+        "reference_property": warm_up_listing,
+        "radius_km": 2.0,
+    }
+
+
+workflow_registry.register(
+    PROPERTY_ANALYSIS_WORKFLOW, create_property_analysis_graph, property_analysis_warm_up_state
+)
@@ -1,69 +1,329 @@
-from typing import Any, TypedDict
+import asyncio
+from collections.abc import Callable
+from typing import Any, TypedDict, cast
 
+import numpy as np
 from langgraph.graph import END, StateGraph
 from langgraph.graph.state import CompiledStateGraph
 
-from src.api.dependencies import get_anthropic_api_key
-from src.core_engine.agents.banding_agent import PropertyBandingAgent
-from src.core_engine.utils.fuzzy_match import fuzzy_match_hard_config
-from src.core_engine.utils.geo import calculate_distance_km
-from src.core_engine.utils.iqr_analysis import calculate_iqr_rent_range
+from src.api.dependencies import get_banding_agent_pool
+from src.core_engine.agents.agent_pool import BandingAgentPool
+from src.core_engine.agents.banding_agent import (
+    DETERMINISTIC_TEMPERATURE,
+    BandingResult,
+    without_ids,
+)
+from src.core_engine.agents.banding_cache import BandingCache, banding_cache_key
+from src.core_engine.agents.comparable_selection import (
+    DEFAULT_PROMPT_TOKEN_BUDGET,
+    assign_unselected_comparables,
+    select_comparables_within_budget,
+)
+from src.core_engine.agents.local_banding import (
+    DEFAULT_CONFIDENCE_THRESHOLD,
+    LocalBandingScorer,
+    is_unusual_comparable_set,
+)
+from src.core_engine.graphs.registry import add_timed_node, workflow_registry
+from src.core_engine.utils.columnar_snapshot import ColumnarCitySnapshot, IntArray
+from src.core_engine.utils.geo import FloatArray
+from src.core_engine.utils.hard_config_index import HardConfigIndex
+from src.core_engine.utils.iqr_analysis import calculate_iqr_rent_range, summarize_rents
+from src.core_engine.utils.kd_tree import KDTree
+from src.core_engine.utils.metrics import BANDING_CACHE_LOOKUPS, COMPARABLE_CANDIDATES
+from src.core_engine.utils.profiler import profile_stage
+from src.core_engine.utils.spatial_index import SpatialGridIndex
 from src.models.property import Property
+from src.models.property_config import HardConfig, SoftConfig
+
+ADAPTIVE_RING_WIDTH_KM = 0.5
+DEFAULT_BULK_MAX_CONCURRENCY = 4
+BANDING_WORKFLOW = "property_banding"
+BULK_BANDING_WORKFLOW = "bulk_property_banding"
 
 
 class PropertyBandingState(TypedDict):
     new_property: Property
     all_properties: list[Property]
+    city_snapshot: ColumnarCitySnapshot | None
+    spatial_index: SpatialGridIndex[Property] | None
+    hard_config_index: HardConfigIndex | None
+    kd_tree: KDTree[Property] | None
     radius_km: float
+    k: int | None
+    adaptive: bool
+    min_comparables: int
+    max_comparables: int
+    max_radius_km: float
     area_tolerance_percent: float
     filtered_properties: list[Property] | None
+    filtered_positions: IntArray | None
+    search_radius_km: float | None
+    banding_cache: BandingCache | None
+    banding_agent_pool: BandingAgentPool | None
+    local_confidence_threshold: float
+    prompt_token_budget: int
+    rent_by_id: dict[str, float] | None
+    neighbourhood_stats: dict[str, float] | None
     banding_result: dict[str, Any] | None
     iqr_analysis: dict[str, float] | None
 
 
-def filter_similar_properties(state: PropertyBandingState) -> dict[str, list[Property]]:
+SubjectGroupKey = tuple[tuple[str, ...], tuple[str, ...]]
+
+
+class BulkPropertyBandingState(TypedDict):
+    subjects: list[PropertyBandingState]
+    max_concurrency: int
+
+
+def get_spatial_index(state: PropertyBandingState) -> SpatialGridIndex[Property]:
+    spatial_index = state.get("spatial_index")
+    if spatial_index is None:
+        return SpatialGridIndex(state["all_properties"])
+    return spatial_index
+
+
+def get_hard_config_index(state: PropertyBandingState) -> HardConfigIndex:
+    hard_config_index = state.get("hard_config_index")
+    if hard_config_index is None:
+        return HardConfigIndex(state["all_properties"])
+    return hard_config_index
+
+
+def get_kd_tree(state: PropertyBandingState) -> KDTree[Property]:
+    kd_tree = state.get("kd_tree")
+    if kd_tree is None:
+        return KDTree(state["all_properties"])
+    return kd_tree
+
+
+def filter_similar_properties(state: PropertyBandingState) -> dict[str, Any]:
+    city_snapshot = state.get("city_snapshot")
+    if city_snapshot is not None:
+        result = filter_city_snapshot(state, city_snapshot)
+        COMPARABLE_CANDIDATES.inc(len(city_snapshot), "scanned")
+        COMPARABLE_CANDIDATES.inc(len(result["filtered_properties"]), "kept")
+        return result
+
     new_prop = state["new_property"]
-    all_props = state["all_properties"]
-    radius_km = state["radius_km"]
-    area_tolerance = state["area_tolerance_percent"]
 
-    filtered = []
+    matching_ids = {
+        prop.id
+        for prop in get_hard_config_index(state).matching(
+            new_prop.hard_config, state["area_tolerance_percent"]
+        )
+    }
+    matching_ids.discard(new_prop.id)
+
+    def is_comparable(prop: Property) -> bool:
+        return prop.id in matching_ids
 
-    for prop in all_props:
-        if prop.id == new_prop.id:
-            continue
+    if state.get("k"):
+        result = find_nearest_comparables(state, is_comparable)
+    elif state.get("adaptive"):
+        result = find_comparables_in_expanding_rings(state, is_comparable)
+    else:
+        result = find_comparables_within_radius(state, is_comparable)
 
-        if not fuzzy_match_hard_config(new_prop.hard_config, prop.hard_config, area_tolerance):
-            continue
+    COMPARABLE_CANDIDATES.inc(len(state["all_properties"]), "scanned")
+    COMPARABLE_CANDIDATES.inc(len(result["filtered_properties"]), "kept")
+    return result
 
-        distance = calculate_distance_km(
-            new_prop.latitude, new_prop.longitude, prop.latitude, prop.longitude
+
+def filter_city_snapshot(
+    state: PropertyBandingState, city_snapshot: ColumnarCitySnapshot
+) -> dict[str, Any]:
+    new_prop = state["new_property"]
+    matching = city_snapshot.matching(
+        new_prop.hard_config, state["area_tolerance_percent"], exclude_id=new_prop.id
+    )
+
+    if state.get("k"):
+        max_radius_km = float("inf")
+    elif state.get("adaptive"):
+        max_radius_km = state["max_radius_km"]
+    else:
+        max_radius_km = state["radius_km"]
+    positions, distances = city_snapshot.by_distance(
+        new_prop.latitude, new_prop.longitude, matching, max_radius_km
+    )
+
+    if state.get("k"):
+        search_radius_km = None
+        positions = positions[: state["k"]]
+    elif state.get("adaptive"):
+        search_radius_km = adaptive_search_radius_km(
+            distances, state["min_comparables"], state["max_radius_km"]
         )
+        positions = positions[distances <= search_radius_km][: state["max_comparables"]]
+    else:
+        search_radius_km = state["radius_km"]
+        positions = positions[distances <= search_radius_km]
+
+    with profile_stage("model_construction"):
+        filtered_properties = city_snapshot.materialize(positions)
+
+    return {
+        "filtered_properties": filtered_properties,
+        "filtered_positions": positions,
+        "search_radius_km": search_radius_km,
+    }
 
-        if distance <= radius_km:
-            filtered.append(prop)
 
-    return {"filtered_properties": filtered}
+def adaptive_search_radius_km(
+    sorted_distances: FloatArray, min_comparables: int, max_radius_km: float
+) -> float:
+    search_radius_km = 0.0
+    while search_radius_km < max_radius_km:
+        search_radius_km = min(search_radius_km + ADAPTIVE_RING_WIDTH_KM, max_radius_km)
+        inside = np.searchsorted(sorted_distances, search_radius_km, side="right")
+        if inside >= min_comparables:
+            break
+    return search_radius_km
 
 
-def band_properties(state: PropertyBandingState) -> dict[str, Any]:
+def find_nearest_comparables(
+    state: PropertyBandingState, is_comparable: Callable[[Property], bool]
+) -> dict[str, Any]:
+    new_prop = state["new_property"]
+    nearest = get_kd_tree(state).nearest(
+        new_prop.latitude, new_prop.longitude, state["k"] or 0, accept=is_comparable
+    )
+    return {"filtered_properties": nearest, "search_radius_km": None}
+
+
+def find_comparables_within_radius(
+    state: PropertyBandingState, is_comparable: Callable[[Property], bool]
+) -> dict[str, Any]:
+    new_prop = state["new_property"]
+    nearby = get_spatial_index(state).within_radius(
+        new_prop.latitude, new_prop.longitude, state["radius_km"]
+    )
+    return {
+        "filtered_properties": [prop for prop in nearby if is_comparable(prop)],
+        "search_radius_km": state["radius_km"],
+    }
+
+
+def find_comparables_in_expanding_rings(
+    state: PropertyBandingState, is_comparable: Callable[[Property], bool]
+) -> dict[str, Any]:
+    new_prop = state["new_property"]
+    rings = get_spatial_index(state).expanding_rings(
+        new_prop.latitude, new_prop.longitude, ADAPTIVE_RING_WIDTH_KM, state["max_radius_km"]
+    )
+
+    comparables: list[Property] = []
+    search_radius_km = 0.0
+    for ring_radius_km, ring in rings:
+        search_radius_km = ring_radius_km
+        comparables.extend(prop for prop in ring if is_comparable(prop))
+        if len(comparables) >= state["min_comparables"]:
+            break
+
+    return {
+        "filtered_properties": comparables[: state["max_comparables"]],
+        "search_radius_km": search_radius_km,
+    }
+
+
+def band_properties_locally(state: PropertyBandingState) -> dict[str, Any]:
+    filtered_props = state["filtered_properties"]
+
+    if not filtered_props or is_unusual_comparable_set(filtered_props):
+        return {"banding_result": None}
+
+    result = LocalBandingScorer().band_properties(state["new_property"], filtered_props)
+
+    if result.confidence_score < state["local_confidence_threshold"]:
+        return {"banding_result": None}
+
+    return {"banding_result": result.model_dump()}
+
+
+def route_after_local_banding(state: PropertyBandingState) -> str:
+    if state["banding_result"] is None and state["filtered_properties"]:
+        return "band_properties"
+    return "calculate_iqr"
+
+
+async def band_properties(state: PropertyBandingState) -> dict[str, Any]:
     filtered_props = state["filtered_properties"]
 
     if not filtered_props:
         return {"banding_result": None}
 
-    agent = PropertyBandingAgent(anthropic_api_key=get_anthropic_api_key())
+    prompt_props = select_comparables_within_budget(
+        filtered_props, state.get("prompt_token_budget", DEFAULT_PROMPT_TOKEN_BUDGET)
+    )
+
+    agent_pool = get_agent_pool(state)
+    banding_cache = state.get("banding_cache")
+    if banding_cache is None:
+        result = await agent_pool.aband_properties(state["new_property"], prompt_props)
+    else:
+        result = await band_with_cache(
+            banding_cache, agent_pool, state["new_property"], prompt_props
+        )
 
-    result = agent.band_properties(state["new_property"], filtered_props)
+    result = assign_unselected_comparables(result, prompt_props, filtered_props)
+    return {"banding_result": result.model_dump()}
 
-    return {
-        "banding_result": {
-            "bands": result.bands,
-            "parameters_used": result.parameters_used,
-            "parameters_rationale": result.parameters_rationale,
-            "new_property_band": result.new_property_band,
-            "confidence_score": result.confidence_score,
+
+def get_agent_pool(state: PropertyBandingState) -> BandingAgentPool:
+    agent_pool = state.get("banding_agent_pool")
+    if agent_pool is None:
+        return get_banding_agent_pool()
+    return agent_pool
+
+
+async def band_with_cache(
+    banding_cache: BandingCache,
+    agent_pool: BandingAgentPool,
+    new_property: Property,
+    filtered_props: list[Property],
+) -> BandingResult:
+    key = banding_cache_key(new_property, filtered_props)
+
+    cached_result = await banding_cache.get(key)
+    if cached_result is not None:
+        BANDING_CACHE_LOOKUPS.inc(1, "hit")
+        return cached_result
+
+    BANDING_CACHE_LOOKUPS.inc(1, "miss")
+
+    result = await agent_pool.aband_properties(
+        new_property, filtered_props, temperature=DETERMINISTIC_TEMPERATURE
+    )
+    await banding_cache.set(key, result)
+    return result
+
+
+def calculate_neighbourhood_stats(state: PropertyBandingState) -> dict[str, Any]:
+    city_snapshot = state.get("city_snapshot")
+    positions = state.get("filtered_positions")
+    if city_snapshot is not None and positions is not None:
+        snapshot_rent_by_id = city_snapshot.rents_by_id(positions)
+        return {
+            "rent_by_id": snapshot_rent_by_id,
+            "neighbourhood_stats": summarize_rents(
+                list(snapshot_rent_by_id.values()),
+                city_snapshot.rents_per_sqft(positions).tolist(),
+            ),
         }
+
+    rented = [prop for prop in state["filtered_properties"] or [] if prop.current_rent is not None]
+    rent_by_id = {prop.id: cast(float, prop.current_rent) for prop in rented}
+    rents_per_sqft = [
+        rent_by_id[prop.id] / prop.hard_config.area_sqft
+        for prop in rented
+        if prop.hard_config.area_sqft > 0
+    ]
+
+    return {
+        "rent_by_id": rent_by_id,
+        "neighbourhood_stats": summarize_rents(list(rent_by_id.values()), rents_per_sqft),
     }
 
 
@@ -76,13 +336,8 @@ def calculate_band_iqr(state: PropertyBandingState) -> dict[str, Any]:
     new_property_band = banding_result["new_property_band"]
     band_property_ids = banding_result["bands"].get(new_property_band, [])
 
-    filtered_props = state["filtered_properties"]
-    if filtered_props is None:
-        return {"iqr_analysis": None}
-
-    band_properties = [p for p in filtered_props if p.id in band_property_ids]
-
-    rents = [p.current_rent for p in band_properties if p.current_rent is not None]
+    rent_by_id = state["rent_by_id"] or {}
+    rents = [rent_by_id[prop_id] for prop_id in band_property_ids if prop_id in rent_by_id]
 
     if not rents:
         return {"iqr_analysis": None}
@@ -95,11 +350,207 @@ def calculate_band_iqr(state: PropertyBandingState) -> dict[str, Any]:
 def create_property_banding_graph() -> CompiledStateGraph:
     workflow = StateGraph(PropertyBandingState)
 
-    workflow.add_node("filter_properties", filter_similar_properties)
-    workflow.add_node("band_properties", band_properties)
-    workflow.add_node("calculate_iqr", calculate_band_iqr)
+    add_timed_node(workflow, BANDING_WORKFLOW, "filter_properties", filter_similar_properties)
+    add_timed_node(
+        workflow, BANDING_WORKFLOW, "calculate_neighbourhood_stats", calculate_neighbourhood_stats
+    )
+    add_timed_node(workflow, BANDING_WORKFLOW, "band_properties_locally", band_properties_locally)
+    add_timed_node(workflow, BANDING_WORKFLOW, "band_properties", band_properties)
+    add_timed_node(workflow, BANDING_WORKFLOW, "calculate_iqr", calculate_band_iqr, defer=True)
+
+    workflow.add_edge("filter_properties", "calculate_neighbourhood_stats")
+    workflow.add_edge("filter_properties", "band_properties_locally")
+    workflow.add_conditional_edges(
+        "band_properties_locally",
+        route_after_local_banding,
+        ["band_properties", "calculate_iqr"],
+    )
+    workflow.add_edge("band_properties", "calculate_iqr")
+    workflow.add_edge("calculate_neighbourhood_stats", "calculate_iqr")
+    workflow.add_edge("calculate_iqr", END)
+
+    workflow.set_entry_point("filter_properties")
+
+    return workflow.compile()
+
+
+def filter_all_similar_properties(state: BulkPropertyBandingState) -> dict[str, Any]:
+    return {
+        "subjects": [
+            cast(PropertyBandingState, {**subject, **filter_similar_properties(subject)})
+            for subject in state["subjects"]
+        ]
+    }
+
+
+def calculate_all_neighbourhood_stats(state: BulkPropertyBandingState) -> dict[str, Any]:
+    return {
+        "subjects": [
+            cast(PropertyBandingState, {**subject, **calculate_neighbourhood_stats(subject)})
+            for subject in state["subjects"]
+        ]
+    }
+
+
+def band_all_properties_locally(state: BulkPropertyBandingState) -> dict[str, Any]:
+    return {
+        "subjects": [
+            cast(PropertyBandingState, {**subject, **band_properties_locally(subject)})
+            for subject in state["subjects"]
+        ]
+    }
+
+
+def calculate_all_band_iqr(state: BulkPropertyBandingState) -> dict[str, Any]:
+    return {
+        "subjects": [
+            cast(PropertyBandingState, {**subject, **calculate_band_iqr(subject)})
+            for subject in state["subjects"]
+        ]
+    }
+
+
+async def band_escalated_properties(state: BulkPropertyBandingState) -> dict[str, Any]:
+    subjects = list(state["subjects"])
+    listed_ids = {prop.id for subject in subjects for prop in subject["filtered_properties"] or []}
+
+    groups: dict[SubjectGroupKey, list[int]] = {}
+    for position, subject in enumerate(subjects):
+        if route_after_local_banding(subject) == "band_properties":
+            groups.setdefault(subject_group_key(subject, listed_ids), []).append(position)
+
+    slots = asyncio.Semaphore(state["max_concurrency"])
+
+    async def band_group(group: list[int]) -> list[BandingResult]:
+        async with slots:
+            return await band_subject_group([subjects[position] for position in group])
+
+    group_results = await asyncio.gather(*(band_group(group) for group in groups.values()))
+
+    for group, results in zip(groups.values(), group_results, strict=True):
+        for position, result in zip(group, results, strict=True):
+            subjects[position] = cast(
+                PropertyBandingState, {**subjects[position], "banding_result": result.model_dump()}
+            )
+
+    return {"subjects": subjects}
+
+
+def subject_group_key(subject: PropertyBandingState, listed_ids: set[str]) -> SubjectGroupKey:
+    new_property = subject["new_property"]
+    hard_config = new_property.hard_config
+    neighbourhood = {prop.id for prop in subject["filtered_properties"] or []}
+    if new_property.id in listed_ids:
+        neighbourhood.add(new_property.id)
+    return (
+        (
+            hard_config.bhk_type,
+            str(hard_config.bedrooms),
+            str(hard_config.bathrooms),
+            hard_config.property_type,
+        ),
+        tuple(sorted(neighbourhood)),
+    )
+
+
+def shared_comparables(subjects: list[PropertyBandingState]) -> list[Property]:
+    comparables: dict[str, Property] = {}
+    for subject in subjects:
+        for prop in subject["filtered_properties"] or []:
+            comparables.setdefault(prop.id, prop)
+    return list(comparables.values())
+
+
+async def band_subject_group(subjects: list[PropertyBandingState]) -> list[BandingResult]:
+    first = subjects[0]
+    shared_props = shared_comparables(subjects)
+    new_properties = [subject["new_property"] for subject in subjects]
+    prompt_props = select_comparables_within_budget(
+        shared_props, first.get("prompt_token_budget", DEFAULT_PROMPT_TOKEN_BUDGET)
+    )
+
+    prompt_ids = {prop.id for prop in prompt_props}
+    exclusions = {
+        new_property.id: [new_property.id]
+        for new_property in new_properties
+        if new_property.id in prompt_ids
+    }
 
-    workflow.add_edge("filter_properties", "band_properties")
+    agent_pool = get_agent_pool(first)
+    banding_cache = first.get("banding_cache")
+    if banding_cache is None:
+        results = await agent_pool.aband_many_properties(
+            new_properties, prompt_props, exclusions=exclusions
+        )
+    else:
+        results = await band_many_with_cache(
+            banding_cache, agent_pool, new_properties, prompt_props, exclusions
+        )
+
+    return [
+        assign_unselected_comparables(
+            result,
+            without_ids(prompt_props, exclusions.get(subject["new_property"].id)),
+            subject["filtered_properties"] or [],
+        )
+        for subject, result in zip(subjects, results, strict=True)
+    ]
+
+
+async def band_many_with_cache(
+    banding_cache: BandingCache,
+    agent_pool: BandingAgentPool,
+    new_properties: list[Property],
+    filtered_props: list[Property],
+    exclusions: dict[str, list[str]],
+) -> list[BandingResult]:
+    keys = [
+        banding_cache_key(
+            new_property, without_ids(filtered_props, exclusions.get(new_property.id))
+        )
+        for new_property in new_properties
+    ]
+    cached_results = await asyncio.gather(*(banding_cache.get(key) for key in keys))
+
+    results = dict(enumerate(cached_results))
+    missing = [position for position, result in results.items() if result is None]
+    BANDING_CACHE_LOOKUPS.inc(len(keys) - len(missing), "hit")
+    BANDING_CACHE_LOOKUPS.inc(len(missing), "miss")
+    if missing:
+        fresh_results = await agent_pool.aband_many_properties(
+            [new_properties[position] for position in missing],
+            filtered_props,
+            temperature=DETERMINISTIC_TEMPERATURE,
+            exclusions=exclusions,
+        )
+        for position, result in zip(missing, fresh_results, strict=True):
+            await banding_cache.set(keys[position], result)
+            results[position] = result
+
+    return cast(list[BandingResult], [results[position] for position in range(len(keys))])
+
+
+def create_bulk_property_banding_graph() -> CompiledStateGraph:
+    workflow = StateGraph(BulkPropertyBandingState)
+
+    add_timed_node(
+        workflow, BULK_BANDING_WORKFLOW, "filter_properties", filter_all_similar_properties
+    )
+    add_timed_node(
+        workflow,
+        BULK_BANDING_WORKFLOW,
+        "calculate_neighbourhood_stats",
+        calculate_all_neighbourhood_stats,
+    )
+    add_timed_node(
+        workflow, BULK_BANDING_WORKFLOW, "band_properties_locally", band_all_properties_locally
+    )
+    add_timed_node(workflow, BULK_BANDING_WORKFLOW, "band_properties", band_escalated_properties)
+    add_timed_node(workflow, BULK_BANDING_WORKFLOW, "calculate_iqr", calculate_all_band_iqr)
+
+    workflow.add_edge("filter_properties", "calculate_neighbourhood_stats")
+    workflow.add_edge("calculate_neighbourhood_stats", "band_properties_locally")
+    workflow.add_edge("band_properties_locally", "band_properties")
     workflow.add_edge("band_properties", "calculate_iqr")
     workflow.add_edge("calculate_iqr", END)
 
@@ -108,28 +559,199 @@ def create_property_banding_graph() -> CompiledStateGraph:
     return workflow.compile()
 
 
-def analyze_property_with_banding(
+def initial_banding_state(
+    *,
     new_property: Property,
     all_properties: list[Property],
     radius_km: float = 2.0,
     area_tolerance_percent: float = 15.0,
-) -> dict[str, Any]:
-    workflow = create_property_banding_graph()
-
-    initial_state = {
+    spatial_index: SpatialGridIndex[Property] | None = None,
+    hard_config_index: HardConfigIndex | None = None,
+    k: int | None = None,
+    kd_tree: KDTree[Property] | None = None,
+    adaptive: bool = False,
+    min_comparables: int = 10,
+    max_comparables: int = 50,
+    max_radius_km: float = 10.0,
+    banding_cache: BandingCache | None = None,
+    local_confidence_threshold: float = DEFAULT_CONFIDENCE_THRESHOLD,
+    banding_agent_pool: BandingAgentPool | None = None,
+    prompt_token_budget: int = DEFAULT_PROMPT_TOKEN_BUDGET,
+    city_snapshot: ColumnarCitySnapshot | None = None,
+) -> PropertyBandingState:
+    return {
         "new_property": new_property,
         "all_properties": all_properties,
+        "city_snapshot": city_snapshot,
+        "spatial_index": spatial_index,
+        "hard_config_index": hard_config_index,
+        "kd_tree": kd_tree,
         "radius_km": radius_km,
+        "k": k,
+        "adaptive": adaptive,
+        "min_comparables": min_comparables,
+        "max_comparables": max_comparables,
+        "max_radius_km": max_radius_km,
         "area_tolerance_percent": area_tolerance_percent,
         "filtered_properties": None,
+        "filtered_positions": None,
+        "search_radius_km": None,
+        "banding_cache": banding_cache,
+        "banding_agent_pool": banding_agent_pool,
+        "local_confidence_threshold": local_confidence_threshold,
+        "prompt_token_budget": prompt_token_budget,
+        "rent_by_id": None,
+        "neighbourhood_stats": None,
         "banding_result": None,
         "iqr_analysis": None,
     }
 
-    final_state = workflow.invoke(initial_state)
 
+def analysis_output(state: dict[str, Any]) -> dict[str, Any]:
     return {
-        "filtered_properties": final_state["filtered_properties"],
-        "banding_result": final_state["banding_result"],
-        "iqr_analysis": final_state["iqr_analysis"],
+        "filtered_properties": state["filtered_properties"],
+        "search_radius_km": state["search_radius_km"],
+        "neighbourhood_stats": state["neighbourhood_stats"],
+        "banding_result": state["banding_result"],
+        "iqr_analysis": state["iqr_analysis"],
     }
+
+
+async def analyze_property_with_banding(
+    new_property: Property,
+    all_properties: list[Property],
+    radius_km: float = 2.0,
+    area_tolerance_percent: float = 15.0,
+    spatial_index: SpatialGridIndex[Property] | None = None,
+    hard_config_index: HardConfigIndex | None = None,
+    k: int | None = None,
+    kd_tree: KDTree[Property] | None = None,
+    adaptive: bool = False,
+    min_comparables: int = 10,
+    max_comparables: int = 50,
+    max_radius_km: float = 10.0,
+    banding_cache: BandingCache | None = None,
+    local_confidence_threshold: float = DEFAULT_CONFIDENCE_THRESHOLD,
+    banding_agent_pool: BandingAgentPool | None = None,
+    prompt_token_budget: int = DEFAULT_PROMPT_TOKEN_BUDGET,
+    city_snapshot: ColumnarCitySnapshot | None = None,
+) -> dict[str, Any]:
+    workflow = workflow_registry.get(BANDING_WORKFLOW)
+
+    initial_state = initial_banding_state(
+        new_property=new_property,
+        all_properties=all_properties,
+        radius_km=radius_km,
+        area_tolerance_percent=area_tolerance_percent,
+        spatial_index=spatial_index,
+        hard_config_index=hard_config_index,
+        k=k,
+        kd_tree=kd_tree,
+        adaptive=adaptive,
+        min_comparables=min_comparables,
+        max_comparables=max_comparables,
+        max_radius_km=max_radius_km,
+        banding_cache=banding_cache,
+        local_confidence_threshold=local_confidence_threshold,
+        banding_agent_pool=banding_agent_pool,
+        prompt_token_budget=prompt_token_budget,
+        city_snapshot=city_snapshot,
+    )
+
+    final_state = await workflow.ainvoke(initial_state)
+
+    return analysis_output(final_state)
+
+
+async def analyze_properties_with_banding(
+    new_properties: list[Property],
+    all_properties: list[Property],
+    radius_km: float = 2.0,
+    area_tolerance_percent: float = 15.0,
+    spatial_index: SpatialGridIndex[Property] | None = None,
+    hard_config_index: HardConfigIndex | None = None,
+    k: int | None = None,
+    kd_tree: KDTree[Property] | None = None,
+    adaptive: bool = False,
+    min_comparables: int = 10,
+    max_comparables: int = 50,
+    max_radius_km: float = 10.0,
+    banding_cache: BandingCache | None = None,
+    local_confidence_threshold: float = DEFAULT_CONFIDENCE_THRESHOLD,
+    banding_agent_pool: BandingAgentPool | None = None,
+    prompt_token_budget: int = DEFAULT_PROMPT_TOKEN_BUDGET,
+    max_concurrency: int = DEFAULT_BULK_MAX_CONCURRENCY,
+    city_snapshot: ColumnarCitySnapshot | None = None,
+) -> list[dict[str, Any]]:
+    if not new_properties:
+        return []
+
+    workflow = workflow_registry.get(BULK_BANDING_WORKFLOW)
+
+    if city_snapshot is None and hard_config_index is None:
+        hard_config_index = HardConfigIndex(all_properties)
+    if city_snapshot is None and k and kd_tree is None:
+        kd_tree = KDTree(all_properties)
+    if city_snapshot is None and not k and spatial_index is None:
+        spatial_index = SpatialGridIndex(all_properties)
+    if banding_agent_pool is None:
+        banding_agent_pool = get_banding_agent_pool()
+
+    subjects = [
+        initial_banding_state(
+            new_property=new_property,
+            all_properties=all_properties,
+            radius_km=radius_km,
+            area_tolerance_percent=area_tolerance_percent,
+            spatial_index=spatial_index,
+            hard_config_index=hard_config_index,
+            k=k,
+            kd_tree=kd_tree,
+            adaptive=adaptive,
+            min_comparables=min_comparables,
+            max_comparables=max_comparables,
+            max_radius_km=max_radius_km,
+            banding_cache=banding_cache,
+            local_confidence_threshold=local_confidence_threshold,
+            banding_agent_pool=banding_agent_pool,
+            prompt_token_budget=prompt_token_budget,
+            city_snapshot=city_snapshot,
+        )
+        for new_property in new_properties
+    ]
+
+    final_state = await workflow.ainvoke({"subjects": subjects, "max_concurrency": max_concurrency})
+
+    return [analysis_output(subject) for subject in final_state["subjects"]]
+
+
+def banding_warm_up_state() -> dict[str, Any]:
+    warm_up_property = Property(
+        id="warm-up",
+        hard_config=HardConfig(
+            area_sqft=1000.0, bhk_type="2BHK", bedrooms=2, bathrooms=2, property_type="apartment"
+        ),
+        soft_config=SoftConfig(furniture_items=[], appliances=[], amenities=[]),
+        city="warm-up",
+        locality="warm-up",
+        latitude=0.0,
+        longitude=0.0,
+        current_rent=None,
+    )
+    return dict(
+        initial_banding_state(
+            new_property=warm_up_property,
+            all_properties=[warm_up_property],
+            city_snapshot=ColumnarCitySnapshot.from_properties([warm_up_property]),
+        )
+    )
+
+
+def bulk_banding_warm_up_state() -> dict[str, Any]:
+    return {"subjects": [banding_warm_up_state()], "max_concurrency": 1}
+
+
+workflow_registry.register(BANDING_WORKFLOW, create_property_banding_graph, banding_warm_up_state)
+workflow_registry.register(
+    BULK_BANDING_WORKFLOW, create_bulk_property_banding_graph, bulk_banding_warm_up_state
+)
@@ -0,0 +1,51 @@
+from collections.abc import Callable
+from typing import Any
+
+from langgraph.graph import StateGraph
+from langgraph.graph.state import CompiledStateGraph
+
+from src.core_engine.utils.metrics import WORKFLOW_NODE_LATENCY, timed
+from src.core_engine.utils.profiler import profiled
+
+GraphFactory = Callable[[], CompiledStateGraph]
+WarmUpState = Callable[[], dict[str, Any]]
+
+
+def add_timed_node(
+    workflow: StateGraph, workflow_name: str, node: str, action: Callable[..., Any], **kwargs: Any
+) -> None:
+    instrumented = timed(WORKFLOW_NODE_LATENCY, workflow_name, node)(profiled(node)(action))
+    workflow.add_node(node, instrumented, **kwargs)
+
+
+class UnknownWorkflowError(KeyError):
+    pass
+
+
+class WorkflowRegistry:
+    def __init__(self) -> None:
+        self._graphs: dict[str, CompiledStateGraph] = {}
+        self._warm_up_states: dict[str, WarmUpState] = {}
+
+    def register(
+        self, name: str, factory: GraphFactory, warm_up_state: WarmUpState
+    ) -> CompiledStateGraph:
+        graph = factory()
+        self._graphs[name] = graph
+        self._warm_up_states[name] = warm_up_state
+        return graph
+
+    def get(self, name: str) -> CompiledStateGraph:
+        if name not in self._graphs:
+            raise UnknownWorkflowError(name)
+        return self._graphs[name]
+
+    def names(self) -> list[str]:
+        return list(self._graphs)
+
+    async def warm_up(self) -> None:
+        for name, graph in self._graphs.items():
+            await graph.ainvoke(self._warm_up_states[name]())
+
+
+workflow_registry = WorkflowRegistry()
@@ -0,0 +1,207 @@
+from collections.abc import Iterable, Mapping
+from typing import Any
+
+import numpy as np
+import numpy.typing as npt
+
+from src.core_engine.utils.fuzzy_match import area_window
+from src.core_engine.utils.geo import (
+    EQUIRECTANGULAR_MAX_RADIUS_KM,
+    FloatArray,
+    calculate_distances_km,
+)
+from src.models.property import Property
+from src.models.property_config import HardConfig, SoftConfig
+
+IntArray = npt.NDArray[np.int64]
+SOFT_CONFIG_FIELDS = ("furniture_items", "appliances", "amenities")
+
+
+class CodedColumn:
+    def __init__(self, values: Iterable[str]):
+        self.vocabulary: list[str] = []
+        positions: dict[str, int] = {}
+        codes = []
+        for value in values:
+            if value not in positions:
+                positions[value] = len(self.vocabulary)
+                self.vocabulary.append(value)
+            codes.append(positions[value])
+        self._positions = positions
+        self.codes = np.array(codes, dtype=np.int32)
+
+    def code_of(self, value: str) -> int:
+        return self._positions.get(value, -1)
+
+    def value_at(self, position: int) -> str:
+        return self.vocabulary[int(self.codes[position])]
+
+
+class BitmaskColumn:
+    def __init__(self, rows: list[list[str]]):
+        self.vocabulary: list[str] = []
+        positions: dict[str, int] = {}
+        for row in rows:
+            for value in row:
+                if value not in positions:
+                    positions[value] = len(self.vocabulary)
+                    self.vocabulary.append(value)
+
+        flags = np.zeros((len(rows), len(self.vocabulary)), dtype=bool)
+        for row_position, row in enumerate(rows):
+            flags[row_position, [positions[value] for value in row]] = True
+        self.bits = np.packbits(flags, axis=1)
+
+    @property
+    def nbytes(self) -> int:
+        return int(self.bits.nbytes)
+
+    def values_at(self, position: int) -> list[str]:
+        flags = np.unpackbits(self.bits[position], count=len(self.vocabulary))
+        return [self.vocabulary[index] for index in np.flatnonzero(flags)]
+
+
+class ListColumn:
+    def __init__(self, rows: list[list[str]]):
+        values = CodedColumn(value for row in rows for value in row)
+        self.vocabulary = values.vocabulary
+        self.codes = values.codes
+        self.offsets = np.cumsum([0, *(len(row) for row in rows)], dtype=np.int64)
+
+    @property
+    def nbytes(self) -> int:
+        return int(self.codes.nbytes + self.offsets.nbytes)
+
+    def values_at(self, position: int) -> list[str]:
+        codes = self.codes[self.offsets[position] : self.offsets[position + 1]]
+        return [self.vocabulary[code] for code in codes.tolist()]
+
+
+class ColumnarCitySnapshot:
+    def __init__(self, documents: Iterable[Mapping[str, Any]]):
+        rows = list(documents)
+        hard_configs = [row["hard_config"] for row in rows]
+        soft_configs = [row["soft_config"] for row in rows]
+
+        self.ids = np.array([row["id"] for row in rows], dtype=object)
+        self.latitudes = np.array([row["latitude"] for row in rows], dtype=np.float64)
+        self.longitudes = np.array([row["longitude"] for row in rows], dtype=np.float64)
+        self.rents = np.array(
+            [np.nan if row["current_rent"] is None else row["current_rent"] for row in rows],
+            dtype=np.float64,
+        )
+        self.areas = np.array([config["area_sqft"] for config in hard_configs], dtype=np.float64)
+        self.bedrooms = np.array([config["bedrooms"] for config in hard_configs], dtype=np.int64)
+        self.bathrooms = np.array([config["bathrooms"] for config in hard_configs], dtype=np.int64)
+        self.bhk_types = CodedColumn(config["bhk_type"] for config in hard_configs)
+        self.property_types = CodedColumn(config["property_type"] for config in hard_configs)
+        self.cities = CodedColumn(row["city"] for row in rows)
+        self.localities = CodedColumn(row["locality"] for row in rows)
+        self.soft_configs = {
+            field: BitmaskColumn([config[field] for config in soft_configs])
+            for field in SOFT_CONFIG_FIELDS
+        }
+        self.soft_config_lists = {
+            field: ListColumn([config[field] for config in soft_configs])
+            for field in SOFT_CONFIG_FIELDS
+        }
+
+    @classmethod
+    def from_properties(cls, properties: Iterable[Property]) -> "ColumnarCitySnapshot":
+        return cls(prop.model_dump() for prop in properties)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @property
+    def nbytes(self) -> int:
+        numeric_columns = (
+            self.latitudes,
+            self.longitudes,
+            self.rents,
+            self.areas,
+            self.bedrooms,
+            self.bathrooms,
+            self.bhk_types.codes,
+            self.property_types.codes,
+            self.cities.codes,
+            self.localities.codes,
+        )
+        id_bytes = sum(len(prop_id) for prop_id in self.ids) + self.ids.nbytes
+        return (
+            sum(column.nbytes for column in numeric_columns)
+            + sum(column.nbytes for column in self.soft_configs.values())
+            + sum(column.nbytes for column in self.soft_config_lists.values())
+            + int(id_bytes)
+        )
+
+    def matching(
+        self,
+        reference: HardConfig,
+        area_tolerance_percent: float,
+        exclude_id: str | None = None,
+    ) -> IntArray:
+        min_area, max_area = area_window(reference.area_sqft, area_tolerance_percent)
+        mask = (
+            (self.bhk_types.codes == self.bhk_types.code_of(reference.bhk_type))
+            & (self.property_types.codes == self.property_types.code_of(reference.property_type))
+            & (self.bedrooms == reference.bedrooms)
+            & (self.bathrooms == reference.bathrooms)
+            & (self.areas >= min_area)
+            & (self.areas <= max_area)
+        )
+        if exclude_id is not None:
+            mask &= self.ids != exclude_id
+        return np.flatnonzero(mask)
+
+    def by_distance(
+        self, latitude: float, longitude: float, positions: IntArray, max_radius_km: float
+    ) -> tuple[IntArray, FloatArray]:
+        distances = calculate_distances_km(
+            latitude,
+            longitude,
+            self.latitudes[positions],
+            self.longitudes[positions],
+            approximate=max_radius_km <= EQUIRECTANGULAR_MAX_RADIUS_KM,
+        )
+        order = np.argsort(distances, kind="stable")
+        return positions[order], distances[order]
+
+    def rents_by_id(self, positions: IntArray) -> dict[str, float]:
+        rents = self.rents[positions]
+        rented = ~np.isnan(rents)
+        return dict(zip(self.ids[positions][rented].tolist(), rents[rented].tolist(), strict=True))
+
+    def rents_per_sqft(self, positions: IntArray) -> FloatArray:
+        rents = self.rents[positions]
+        areas = self.areas[positions]
+        usable = ~np.isnan(rents) & (areas > 0)
+        rents_per_sqft: FloatArray = rents[usable] / areas[usable]
+        return rents_per_sqft
+
+    def materialize(self, positions: Iterable[int]) -> list[Property]:
+        return [self.property_at(int(position)) for position in positions]
+
+    def property_at(self, position: int) -> Property:
+        rent = self.rents[position]
+        return Property(
+            id=self.ids[position],
+            hard_config=HardConfig(
+                area_sqft=float(self.areas[position]),
+                bhk_type=self.bhk_types.value_at(position),
+                bedrooms=int(self.bedrooms[position]),
+                bathrooms=int(self.bathrooms[position]),
+                property_type=self.property_types.value_at(position),
+            ),
+            soft_config=SoftConfig(
+                **{
+                    field: column.values_at(position)
+                    for field, column in self.soft_config_lists.items()
+                }
+            ),
+            city=self.cities.value_at(position),
+            locality=self.localities.value_at(position),
+            latitude=float(self.latitudes[position]),
+            longitude=float(self.longitudes[position]),
+            current_rent=None if np.isnan(rent) else float(rent),
+        )
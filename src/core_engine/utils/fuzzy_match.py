@@ -1,5 +1,21 @@
 from src.models.property_config import HardConfig
 
+HardConfigKey = tuple[str, int, int, str]
+
+
+def hard_config_key(hard_config: HardConfig) -> HardConfigKey:
+    return (
+        hard_config.bhk_type,
+        hard_config.bedrooms,
+        hard_config.bathrooms,
+        hard_config.property_type,
+    )
+
+
+def area_window(area_sqft: float, area_tolerance_percent: float) -> tuple[float, float]:
+    tolerance = area_sqft * (area_tolerance_percent / 100)
+    return area_sqft - tolerance, area_sqft + tolerance
+
 
 def fuzzy_match_hard_config(
     reference: HardConfig, candidate: HardConfig, area_tolerance_percent: float
@@ -16,8 +32,6 @@ def fuzzy_match_hard_config(
     if reference.property_type != candidate.property_type:
         return False
 
-    tolerance = reference.area_sqft * (area_tolerance_percent / 100)
-    lower_bound = reference.area_sqft - tolerance
-    upper_bound = reference.area_sqft + tolerance
+    lower_bound, upper_bound = area_window(reference.area_sqft, area_tolerance_percent)
 
     return not (candidate.area_sqft < lower_bound or candidate.area_sqft > upper_bound)
@@ -1,9 +1,16 @@
-from math import atan2, cos, radians, sin, sqrt
+from math import atan2, cos, pi, radians, sin, sqrt
 
+import numpy as np
+import numpy.typing as npt
+
+EARTH_RADIUS_KM = 6371
+KM_PER_DEGREE = EARTH_RADIUS_KM * pi / 180
+EQUIRECTANGULAR_MAX_RADIUS_KM = 10.0
+
+FloatArray = npt.NDArray[np.float64]
 
-def calculate_distance_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
-    R = 6371  # Earth's radius in kilometers
 
+def calculate_distance_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
     lat1, lon1, lat2, lon2 = map(radians, [lat1, lon1, lat2, lon2])
 
     dlat = lat2 - lat1
@@ -12,4 +19,39 @@ def calculate_distance_km(lat1: float, lon1: float, lat2: float, lon2: float) ->
     a = sin(dlat / 2) ** 2 + cos(lat1) * cos(lat2) * sin(dlon / 2) ** 2
     c = 2 * atan2(sqrt(a), sqrt(1 - a))
 
-    return R * c
+    return EARTH_RADIUS_KM * c
+
+
+def calculate_distances_km(
+    latitude: float,
+    longitude: float,
+    latitudes: npt.ArrayLike,
+    longitudes: npt.ArrayLike,
+    approximate: bool = False,
+) -> FloatArray:
+    """
+    Distances in kilometers from one reference point to many points in a single vectorized pass.
+
+    With approximate=True the equirectangular projection is used instead of haversine. For
+    distances up to EQUIRECTANGULAR_MAX_RADIUS_KM at latitudes within +/-70 degrees its error
+    against haversine stays below 1e-5 km (relative error below 1e-6).
+    """
+    lat1 = radians(latitude)
+    lat2 = np.radians(np.asarray(latitudes, dtype=np.float64))
+    dlat = lat2 - lat1
+    dlon = _wrap_longitude_delta(
+        np.radians(np.asarray(longitudes, dtype=np.float64)) - radians(longitude)
+    )
+
+    if approximate:
+        x = dlon * np.cos((lat1 + lat2) / 2)
+        approximate_distances: FloatArray = EARTH_RADIUS_KM * np.hypot(x, dlat)
+        return approximate_distances
+
+    a = np.sin(dlat / 2) ** 2 + cos(lat1) * np.cos(lat2) * np.sin(dlon / 2) ** 2
+    distances: FloatArray = 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+    return distances
+
+
+def _wrap_longitude_delta(dlon: FloatArray) -> FloatArray:
+    return (dlon + pi) % (2 * pi) - pi
@@ -0,0 +1,34 @@
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+from collections.abc import Iterable
+
+from src.core_engine.utils.fuzzy_match import HardConfigKey, area_window, hard_config_key
+from src.models.property import Property
+from src.models.property_config import HardConfig
+
+
+class AreaSortedBucket:
+    def __init__(self, properties: Iterable[Property]):
+        self.properties = sorted(properties, key=lambda prop: prop.hard_config.area_sqft)
+        self.areas = [prop.hard_config.area_sqft for prop in self.properties]
+
+    def within_area(self, lower_bound: float, upper_bound: float) -> list[Property]:
+        start = bisect_left(self.areas, lower_bound)
+        stop = bisect_right(self.areas, upper_bound)
+        return self.properties[start:stop]
+
+
+class HardConfigIndex:
+    def __init__(self, properties: Iterable[Property]):
+        grouped: dict[HardConfigKey, list[Property]] = defaultdict(list)
+        for prop in properties:
+            grouped[hard_config_key(prop.hard_config)].append(prop)
+
+        self._buckets = {key: AreaSortedBucket(props) for key, props in grouped.items()}
+
+    def matching(self, reference: HardConfig, area_tolerance_percent: float) -> list[Property]:
+        bucket = self._buckets.get(hard_config_key(reference))
+        if bucket is None:
+            return []
+
+        return bucket.within_area(*area_window(reference.area_sqft, area_tolerance_percent))
@@ -21,3 +21,24 @@ def calculate_iqr_rent_range(rents: list[float]) -> dict[str, float]:
         "recommended_min": q1,
         "recommended_max": q3,
     }
+
+
+def summarize_rents(rents: list[float], rents_per_sqft: list[float]) -> dict[str, float]:
+    if not rents:
+        return {
+            "count": 0,
+            "average_rent": 0,
+            "min_rent": 0,
+            "max_rent": 0,
+            "median_rent": 0,
+            "median_rent_per_sqft": 0,
+        }
+
+    return {
+        "count": len(rents),
+        "average_rent": statistics.fmean(rents),
+        "min_rent": min(rents),
+        "max_rent": max(rents),
+        "median_rent": statistics.median(rents),
+        "median_rent_per_sqft": statistics.median(rents_per_sqft) if rents_per_sqft else 0,
+    }
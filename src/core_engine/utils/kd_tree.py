@@ -0,0 +1,120 @@
+import heapq
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from itertools import count
+from math import cos, radians
+from typing import Generic, TypeVar
+
+import numpy as np
+import numpy.typing as npt
+
+from src.core_engine.utils.geo import KM_PER_DEGREE, FloatArray
+from src.core_engine.utils.spatial_index import Locatable
+
+LEAF_SIZE = 16
+
+IntArray = npt.NDArray[np.int64]
+T = TypeVar("T", bound=Locatable)
+
+
+@dataclass
+class KDNode:
+    lower: FloatArray
+    upper: FloatArray
+    positions: IntArray | None = None
+    children: tuple["KDNode", "KDNode"] | None = None
+
+    def distance_to(self, point: FloatArray) -> float:
+        gap = np.maximum(np.maximum(self.lower - point, point - self.upper), 0.0)
+        return float(np.hypot(gap[0], gap[1]))
+
+
+class KDTree(Generic[T]):
+    def __init__(self, items: Iterable[T], leaf_size: int = LEAF_SIZE):
+        self._items = list(items)
+        self.leaf_size = leaf_size
+
+        latitudes = np.fromiter((item.latitude for item in self._items), dtype=np.float64)
+        longitudes = np.fromiter((item.longitude for item in self._items), dtype=np.float64)
+        self.reference_latitude = float(latitudes.mean()) if self._items else 0.0
+        self._points = self._project(latitudes, longitudes)
+
+        all_positions = np.arange(len(self._items), dtype=np.int64)
+        self._root = self._build(all_positions) if self._items else None
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def nearest(
+        self,
+        latitude: float,
+        longitude: float,
+        k: int,
+        accept: Callable[[T], bool] | None = None,
+    ) -> list[T]:
+        if self._root is None or k <= 0:
+            return []
+
+        query = self._project(np.array([latitude]), np.array([longitude]))[0]
+        tiebreaker = count()
+        frontier = [(0.0, next(tiebreaker), self._root)]
+        best: list[tuple[float, int]] = []
+
+        while frontier:
+            bound, _, node = heapq.heappop(frontier)
+            if len(best) == k and bound > -best[0][0]:
+                break
+
+            if node.positions is not None:
+                self._collect(node.positions, query, k, accept, best)
+                continue
+
+            for child in node.children or ():
+                heapq.heappush(frontier, (child.distance_to(query), next(tiebreaker), child))
+
+        return [self._items[position] for _, position in sorted(best, reverse=True)]
+
+    def _collect(
+        self,
+        positions: IntArray,
+        query: FloatArray,
+        k: int,
+        accept: Callable[[T], bool] | None,
+        best: list[tuple[float, int]],
+    ) -> None:
+        offsets = self._points[positions] - query
+        distances = np.hypot(offsets[:, 0], offsets[:, 1])
+
+        for distance, position in zip(distances.tolist(), positions.tolist(), strict=True):
+            if len(best) == k and distance >= -best[0][0]:
+                continue
+            if accept is not None and not accept(self._items[position]):
+                continue
+            if len(best) == k:
+                heapq.heapreplace(best, (-distance, position))
+            else:
+                heapq.heappush(best, (-distance, position))
+
+    def _build(self, positions: IntArray) -> KDNode:
+        points = self._points[positions]
+        lower, upper = points.min(axis=0), points.max(axis=0)
+
+        if len(positions) <= self.leaf_size:
+            return KDNode(lower, upper, positions=positions)
+
+        axis = int(np.argmax(upper - lower))
+        middle = len(positions) // 2
+        order = np.argpartition(points[:, axis], middle)
+        return KDNode(
+            lower,
+            upper,
+            children=(
+                self._build(positions[order[:middle]]),
+                self._build(positions[order[middle:]]),
+            ),
+        )
+
+    def _project(self, latitudes: FloatArray, longitudes: FloatArray) -> FloatArray:
+        x = longitudes * KM_PER_DEGREE * cos(radians(self.reference_latitude))
+        y = latitudes * KM_PER_DEGREE
+        return np.column_stack((x, y))
@@ -0,0 +1,108 @@
+from collections.abc import Iterable
+from typing import Any
+
+from src.core_engine.utils.quantile_sketch import DEFAULT_RELATIVE_ACCURACY, QuantileSketch
+from src.models.property import Property
+
+LocalityStatsKey = tuple[str, str, str]
+
+
+def locality_stats_key(prop: Property) -> LocalityStatsKey:
+    return (prop.city, prop.locality, prop.hard_config.bhk_type)
+
+
+def rent_per_sqft_of(prop: Property) -> float | None:
+    if prop.current_rent is None or prop.hard_config.area_sqft <= 0:
+        return None
+    return prop.current_rent / prop.hard_config.area_sqft
+
+
+class LocalityRentStats:
+    def __init__(self, relative_accuracy: float = DEFAULT_RELATIVE_ACCURACY):
+        self.count = 0
+        self.rent_sum = 0.0
+        self.rent_per_sqft_count = 0
+        self.rent_per_sqft_sum = 0.0
+        self.rent_counts: dict[float, int] = {}
+        self.rents = QuantileSketch(relative_accuracy)
+        self.rents_per_sqft = QuantileSketch(relative_accuracy)
+
+    def add(self, rent: float, rent_per_sqft: float | None) -> None:
+        self._adjust(rent, rent_per_sqft, 1)
+
+    def remove(self, rent: float, rent_per_sqft: float | None) -> None:
+        self._adjust(rent, rent_per_sqft, -1)
+
+    def summary(self) -> dict[str, Any]:
+        return {
+            "count": self.count,
+            "rent_sum": self.rent_sum,
+            "average_rent": self.rent_sum / self.count,
+            "min_rent": min(self.rent_counts),
+            "max_rent": max(self.rent_counts),
+            "q1_rent": self.rents.quantile(0.25),
+            "median_rent": self.rents.quantile(0.5),
+            "q3_rent": self.rents.quantile(0.75),
+            "average_rent_per_sqft": (
+                self.rent_per_sqft_sum / self.rent_per_sqft_count
+                if self.rent_per_sqft_count
+                else None
+            ),
+            "median_rent_per_sqft": self.rents_per_sqft.quantile(0.5),
+        }
+
+    def _adjust(self, rent: float, rent_per_sqft: float | None, count: int) -> None:
+        self.count += count
+        self.rent_sum += count * rent
+        remaining = self.rent_counts.get(rent, 0) + count
+        if remaining > 0:
+            self.rent_counts[rent] = remaining
+        else:
+            self.rent_counts.pop(rent, None)
+        self.rents.add(rent, count)
+        if rent_per_sqft is not None:
+            self.rent_per_sqft_count += count
+            self.rent_per_sqft_sum += count * rent_per_sqft
+            self.rents_per_sqft.add(rent_per_sqft, count)
+
+
+class LocalityStatsTable:
+    def __init__(self, relative_accuracy: float = DEFAULT_RELATIVE_ACCURACY):
+        self.relative_accuracy = relative_accuracy
+        self._stats: dict[LocalityStatsKey, LocalityRentStats] = {}
+
+    def load(self, properties: Iterable[Property]) -> None:
+        for prop in properties:
+            self.add(prop)
+
+    def add(self, prop: Property) -> None:
+        if prop.current_rent is None:
+            return
+        key = locality_stats_key(prop)
+        if key not in self._stats:
+            self._stats[key] = LocalityRentStats(self.relative_accuracy)
+        self._stats[key].add(prop.current_rent, rent_per_sqft_of(prop))
+
+    def remove(self, prop: Property) -> None:
+        if prop.current_rent is None:
+            return
+        key = locality_stats_key(prop)
+        stats = self._stats.get(key)
+        if stats is None:
+            return
+        stats.remove(prop.current_rent, rent_per_sqft_of(prop))
+        if stats.count <= 0:
+            del self._stats[key]
+
+    def property_changed(self, previous: Property | None, current: Property | None) -> None:
+        if previous is not None:
+            self.remove(previous)
+        if current is not None:
+            self.add(current)
+
+    def city_stats(self, city: str) -> list[dict[str, Any]]:
+        return [
+            {"locality": locality, "bhk_type": bhk_type, **stats.summary()}
+            for (stats_city, locality, bhk_type), stats in sorted(self._stats.items())
+            if stats_city == city
+        ]
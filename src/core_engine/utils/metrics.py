@@ -0,0 +1,206 @@
+import functools
+import inspect
+import threading
+import time
+from bisect import bisect_left
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from typing import Any, TypeVar, cast
+
+DEFAULT_LATENCY_BUCKETS = (
+    0.001,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+)
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LabelValues = tuple[str, ...]
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+def escape_label_value(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def format_labels(names: tuple[str, ...], values: LabelValues, extra: str = "") -> str:
+    pairs = [
+        f'{name}="{escape_label_value(value)}"' for name, value in zip(names, values, strict=True)
+    ]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value))
+
+
+class Counter:
+    kind = "counter"
+
+    def __init__(self, name: str, description: str, label_names: tuple[str, ...] = ()):
+        self.name = name
+        self.description = description
+        self.label_names = label_names
+        self._values: dict[LabelValues, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0, *label_values: str) -> None:
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0.0) + amount
+
+    def value(self, *label_values: str) -> float:
+        return self._values.get(label_values, 0.0)
+
+    def samples(self) -> Iterator[str]:
+        for label_values, value in sorted(self._values.items()):
+            labels = format_labels(self.label_names, label_values)
+            yield f"{self.name}{labels} {format_value(value)}"
+
+
+class Histogram:
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        description: str,
+        label_names: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_LATENCY_BUCKETS,
+    ):
+        self.name = name
+        self.description = description
+        self.label_names = label_names
+        self.buckets = buckets
+        self._bucket_counts: dict[LabelValues, list[int]] = {}
+        self._sums: dict[LabelValues, float] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *label_values: str) -> None:
+        position = bisect_left(self.buckets, value)
+        with self._lock:
+            counts = self._bucket_counts.get(label_values)
+            if counts is None:
+                counts = self._bucket_counts[label_values] = [0] * (len(self.buckets) + 1)
+            counts[position] += 1
+            self._sums[label_values] = self._sums.get(label_values, 0.0) + value
+
+    def count(self, *label_values: str) -> int:
+        return sum(self._bucket_counts.get(label_values, []))
+
+    @contextmanager
+    def time(self, *label_values: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, *label_values)
+
+    def samples(self) -> Iterator[str]:
+        for label_values, counts in sorted(self._bucket_counts.items()):
+            cumulative = 0
+            for upper_bound, bucket_count in zip(
+                (*self.buckets, float("inf")), counts, strict=True
+            ):
+                cumulative += bucket_count
+                labels = format_labels(
+                    self.label_names, label_values, f'le="{format_value(upper_bound)}"'
+                )
+                yield f"{self.name}_bucket{labels} {cumulative}"
+            labels = format_labels(self.label_names, label_values)
+            yield f"{self.name}_sum{labels} {format_value(self._sums[label_values])}"
+            yield f"{self.name}_count{labels} {cumulative}"
+
+
+class MetricsRegistry:
+    def __init__(self) -> None:
+        self._metrics: dict[str, Counter | Histogram] = {}
+
+    def counter(self, name: str, description: str, label_names: tuple[str, ...] = ()) -> Counter:
+        counter = Counter(name, description, label_names)
+        self._metrics[name] = counter
+        return counter
+
+    def histogram(
+        self,
+        name: str,
+        description: str,
+        label_names: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_LATENCY_BUCKETS,
+    ) -> Histogram:
+        histogram = Histogram(name, description, label_names, buckets)
+        self._metrics[name] = histogram
+        return histogram
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics.values():
+            lines.append(f"# HELP {metric.name} {metric.description}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.samples())
+        return "\n".join(lines) + "\n"
+
+
+def timed(histogram: Histogram, *label_values: str) -> Callable[[F], F]:
+    def decorate(function: F) -> F:
+        if inspect.iscoroutinefunction(function):
+
+            @functools.wraps(function)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                with histogram.time(*label_values):
+                    return await function(*args, **kwargs)
+
+            return cast(F, async_wrapper)
+
+        @functools.wraps(function)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            with histogram.time(*label_values):
+                return function(*args, **kwargs)
+
+        return cast(F, wrapper)
+
+    return decorate
+
+
+metrics = MetricsRegistry()
+
+REPOSITORY_LATENCY = metrics.histogram(
+    "repository_operation_seconds", "Latency of PropertyRepository operations", ("operation",)
+)
+WORKFLOW_NODE_LATENCY = metrics.histogram(
+    "workflow_node_seconds", "Latency of LangGraph workflow nodes", ("workflow", "node")
+)
+LLM_LATENCY = metrics.histogram(
+    "llm_call_seconds", "Latency of Claude banding calls", ("operation",)
+)
+COMPARABLE_CANDIDATES = metrics.counter(
+    "comparable_candidates_total",
+    "Comparable candidates scanned and kept by the filter",
+    ("stage",),
+)
+PROMPT_CHARACTERS = metrics.counter(
+    "banding_prompt_characters_total", "Characters sent in banding prompts"
+)
+PROMPT_TOKENS = metrics.counter(
+    "banding_prompt_tokens_total", "Estimated tokens sent in banding prompts"
+)
+BANDING_CACHE_LOOKUPS = metrics.counter(
+    "banding_cache_lookups_total", "Banding cache lookups by result", ("result",)
+)
+CITY_SNAPSHOT_LOOKUPS = metrics.counter(
+    "city_snapshot_lookups_total",
+    "City snapshot cache lookups by kind and result",
+    ("kind", "result"),
+)
@@ -0,0 +1,152 @@
+import functools
+import inspect
+import re
+import threading
+import time
+import tracemalloc
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, TypeVar, cast
+
+F = TypeVar("F", bound=Callable[..., Any])
+StagePath = tuple[str, ...]
+
+
+@dataclass(frozen=True)
+class StageTiming:
+    path: StagePath
+    seconds: float
+    memory_delta_bytes: int
+
+
+@dataclass
+class RequestProfile:
+    name: str
+    stages: list[StageTiming] = field(default_factory=list)
+
+    def record(self, path: StagePath, seconds: float, memory_delta_bytes: int) -> None:
+        self.stages.append(StageTiming(path, seconds, memory_delta_bytes))
+
+    def total_seconds(self) -> float:
+        return sum(stage.seconds for stage in self.stages if stage.path == (self.name,))
+
+    def summary(self) -> dict[str, Any]:
+        return {
+            "total_seconds": self.total_seconds(),
+            "stages": [
+                {
+                    "stage": ";".join(stage.path),
+                    "seconds": stage.seconds,
+                    "memory_delta_bytes": stage.memory_delta_bytes,
+                }
+                for stage in sorted(self.stages, key=lambda stage: stage.path)
+            ],
+        }
+
+    def folded_stacks(self) -> list[str]:
+        totals: dict[StagePath, float] = {}
+        for stage in self.stages:
+            totals[stage.path] = totals.get(stage.path, 0.0) + stage.seconds
+
+        self_times = dict(totals)
+        for path, seconds in totals.items():
+            if len(path) > 1 and path[:-1] in self_times:
+                self_times[path[:-1]] -= seconds
+
+        return [
+            f"{';'.join(path)} {max(0, round(seconds * 1_000_000))}"
+            for path, seconds in sorted(self_times.items())
+        ]
+
+    def write_folded(self, directory: Path, file_stem: str) -> Path:
+        directory.mkdir(parents=True, exist_ok=True)
+        safe_stem = re.sub(r"[^\w.-]", "_", file_stem)
+        trace_path = directory / f"{safe_stem}-{time.strftime('%Y%m%dT%H%M%S')}.folded"
+        trace_path.write_text("\n".join(self.folded_stacks()) + "\n")
+        return trace_path
+
+
+active_profile: ContextVar[RequestProfile | None] = ContextVar("active_profile", default=None)
+stage_path: ContextVar[StagePath] = ContextVar("stage_path", default=())
+
+tracing_lock = threading.Lock()
+tracing_users = 0
+
+
+def start_tracing() -> None:
+    global tracing_users
+    with tracing_lock:
+        if tracing_users == 0 and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        tracing_users += 1
+
+
+def stop_tracing() -> None:
+    global tracing_users
+    with tracing_lock:
+        tracing_users -= 1
+        if tracing_users == 0:
+            tracemalloc.stop()
+
+
+def traced_memory() -> int:
+    return tracemalloc.get_traced_memory()[0]
+
+
+@contextmanager
+def profile_stage(name: str) -> Iterator[None]:
+    profile = active_profile.get()
+    if profile is None:
+        yield
+        return
+
+    path = (*stage_path.get(), name)
+    token = stage_path.set(path)
+    start_memory = traced_memory()
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        profile.record(path, time.perf_counter() - start, traced_memory() - start_memory)
+        stage_path.reset(token)
+
+
+@contextmanager
+def profile_request(name: str, enabled: bool) -> Iterator[RequestProfile | None]:
+    if not enabled:
+        yield None
+        return
+
+    profile = RequestProfile(name)
+    start_tracing()
+    token = active_profile.set(profile)
+    try:
+        with profile_stage(name):
+            yield profile
+    finally:
+        active_profile.reset(token)
+        stop_tracing()
+
+
+def profiled(name: str) -> Callable[[F], F]:
+    def decorate(function: F) -> F:
+        if inspect.iscoroutinefunction(function):
+
+            @functools.wraps(function)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                with profile_stage(name):
+                    return await function(*args, **kwargs)
+
+            return cast(F, async_wrapper)
+
+        @functools.wraps(function)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            with profile_stage(name):
+                return function(*args, **kwargs)
+
+        return cast(F, wrapper)
+
+    return decorate
@@ -0,0 +1,68 @@
+from math import ceil, log
+
+DEFAULT_RELATIVE_ACCURACY = 0.01
+MIN_POSITIVE_VALUE = 1e-9
+
+
+class QuantileSketch:
+    def __init__(self, relative_accuracy: float = DEFAULT_RELATIVE_ACCURACY):
+        if not 0 < relative_accuracy < 1:
+            raise ValueError("relative_accuracy must be between 0 and 1")
+
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = log(self.gamma)
+        self._buckets: dict[int, int] = {}
+        self._zero_count = 0
+        self.count = 0
+
+    def __len__(self) -> int:
+        return self.count
+
+    def add(self, value: float, count: int = 1) -> None:
+        self._adjust(value, count)
+
+    def remove(self, value: float, count: int = 1) -> None:
+        self._adjust(value, -count)
+
+    def merge(self, other: "QuantileSketch") -> None:
+        if other.gamma != self.gamma:
+            raise ValueError("Cannot merge sketches with different relative accuracy")
+
+        for bucket, count in other._buckets.items():
+            self._buckets[bucket] = self._buckets.get(bucket, 0) + count
+        self._zero_count += other._zero_count
+        self.count += other.count
+
+    def quantile(self, q: float) -> float | None:
+        if self.count == 0:
+            return None
+
+        rank = q * (self.count - 1)
+        seen = self._zero_count
+        if seen > rank:
+            return 0.0
+
+        for bucket in sorted(self._buckets):
+            seen += self._buckets[bucket]
+            if seen > rank:
+                return self._bucket_value(bucket)
+        return self._bucket_value(max(self._buckets))
+
+    def _adjust(self, value: float, count: int) -> None:
+        if value <= MIN_POSITIVE_VALUE:
+            self._zero_count += count
+        else:
+            bucket = self._bucket_of(value)
+            remaining = self._buckets.get(bucket, 0) + count
+            if remaining > 0:
+                self._buckets[bucket] = remaining
+            else:
+                self._buckets.pop(bucket, None)
+        self.count += count
+
+    def _bucket_of(self, value: float) -> int:
+        return ceil(log(value) / self._log_gamma)
+
+    def _bucket_value(self, bucket: int) -> float:
+        return 2 * self.gamma**bucket / (self.gamma + 1)
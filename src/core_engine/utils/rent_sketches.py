@@ -0,0 +1,106 @@
+from collections.abc import Iterable
+
+from src.core_engine.utils.quantile_sketch import DEFAULT_RELATIVE_ACCURACY, QuantileSketch
+from src.models.property import Property
+from src.models.property_config import HardConfig
+
+SketchKey = tuple[str, ...]
+
+
+def hard_config_fields(hard_config: HardConfig) -> tuple[str, ...]:
+    return (
+        hard_config.bhk_type,
+        str(hard_config.bedrooms),
+        str(hard_config.bathrooms),
+        hard_config.property_type,
+    )
+
+
+def city_key(city: str) -> SketchKey:
+    return ("city", city)
+
+
+def locality_key(city: str, locality: str) -> SketchKey:
+    return ("locality", city, locality)
+
+
+def hard_config_group_key(
+    city: str, hard_config: HardConfig, locality: str | None = None
+) -> SketchKey:
+    return config_group_key(city, hard_config_fields(hard_config), locality)
+
+
+def config_group_key(
+    city: str, config_fields: tuple[str, ...], locality: str | None = None
+) -> SketchKey:
+    if locality is None:
+        return ("hard_config", city, *config_fields)
+    return ("locality_hard_config", city, locality, *config_fields)
+
+
+def sketch_keys(prop: Property) -> list[SketchKey]:
+    return [
+        city_key(prop.city),
+        locality_key(prop.city, prop.locality),
+        hard_config_group_key(prop.city, prop.hard_config),
+        hard_config_group_key(prop.city, prop.hard_config, prop.locality),
+    ]
+
+
+def sketch_rent_range(sketch: QuantileSketch) -> dict[str, float]:
+    q1 = sketch.quantile(0.25) or 0.0
+    q3 = sketch.quantile(0.75) or 0.0
+    return {
+        "q1": q1,
+        "median": sketch.quantile(0.5) or 0.0,
+        "q3": q3,
+        "iqr": q3 - q1,
+        "recommended_min": q1,
+        "recommended_max": q3,
+        "count": sketch.count,
+        "relative_error": sketch.relative_accuracy,
+    }
+
+
+class RentSketchIndex:
+    def __init__(self, relative_accuracy: float = DEFAULT_RELATIVE_ACCURACY):
+        self.relative_accuracy = relative_accuracy
+        self._sketches: dict[SketchKey, QuantileSketch] = {}
+
+    def load(self, properties: Iterable[Property]) -> None:
+        for prop in properties:
+            self.add(prop)
+
+    def add(self, prop: Property) -> None:
+        if prop.current_rent is None:
+            return
+        for key in sketch_keys(prop):
+            if key not in self._sketches:
+                self._sketches[key] = QuantileSketch(self.relative_accuracy)
+            self._sketches[key].add(prop.current_rent)
+
+    def remove(self, prop: Property) -> None:
+        if prop.current_rent is None:
+            return
+        for key in sketch_keys(prop):
+            sketch = self._sketches.get(key)
+            if sketch is None:
+                continue
+            sketch.remove(prop.current_rent)
+            if sketch.count <= 0:
+                del self._sketches[key]
+
+    def property_changed(self, previous: Property | None, current: Property | None) -> None:
+        if previous is not None:
+            self.remove(previous)
+        if current is not None:
+            self.add(current)
+
+    def sketch(self, key: SketchKey) -> QuantileSketch | None:
+        return self._sketches.get(key)
+
+    def rent_range(self, key: SketchKey) -> dict[str, float] | None:
+        sketch = self._sketches.get(key)
+        if sketch is None:
+            return None
+        return sketch_rent_range(sketch)
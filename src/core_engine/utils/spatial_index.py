@@ -0,0 +1,145 @@
+from collections.abc import Iterable, Iterator
+from math import cos, floor, radians
+from typing import Generic, Protocol, TypeVar
+
+import numpy as np
+import numpy.typing as npt
+
+from src.core_engine.utils.geo import (
+    EQUIRECTANGULAR_MAX_RADIUS_KM,
+    KM_PER_DEGREE,
+    calculate_distances_km,
+)
+
+DEFAULT_CELL_SIZE_KM = 1.0
+MAX_LATITUDE = 89.9
+
+Cell = tuple[int, int]
+
+
+class Locatable(Protocol):
+    latitude: float
+    longitude: float
+
+
+T = TypeVar("T", bound=Locatable)
+
+
+class SpatialGridIndex(Generic[T]):
+    def __init__(self, items: Iterable[T], cell_size_km: float = DEFAULT_CELL_SIZE_KM):
+        self.cell_size_degrees = cell_size_km / KM_PER_DEGREE
+
+        unordered_items = list(items)
+        latitudes = np.fromiter((item.latitude for item in unordered_items), dtype=np.float64)
+        longitudes = np.fromiter((item.longitude for item in unordered_items), dtype=np.float64)
+        rows = np.floor(latitudes / self.cell_size_degrees).astype(np.int64)
+        columns = np.floor(longitudes / self.cell_size_degrees).astype(np.int64)
+
+        order = np.lexsort((columns, rows))
+        self._items = [unordered_items[position] for position in order]
+        self._latitudes = latitudes[order]
+        self._longitudes = longitudes[order]
+        self._cells = self._group_into_cells(rows[order], columns[order])
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def within_radius(self, latitude: float, longitude: float, radius_km: float) -> list[T]:
+        positions = self._positions_in(self._cells_near(latitude, longitude, radius_km))
+        if positions.size == 0:
+            return []
+
+        distances = calculate_distances_km(
+            latitude,
+            longitude,
+            self._latitudes[positions],
+            self._longitudes[positions],
+            approximate=radius_km <= EQUIRECTANGULAR_MAX_RADIUS_KM,
+        )
+
+        return [self._items[position] for position in positions[distances <= radius_km]]
+
+    def expanding_rings(
+        self, latitude: float, longitude: float, ring_width_km: float, max_radius_km: float
+    ) -> Iterator[tuple[float, list[T]]]:
+        approximate = max_radius_km <= EQUIRECTANGULAR_MAX_RADIUS_KM
+        visited: set[Cell] = set()
+        pending_positions = np.empty(0, dtype=np.int64)
+        pending_distances = np.empty(0, dtype=np.float64)
+        radius_km = 0.0
+
+        while radius_km < max_radius_km:
+            radius_km = min(radius_km + ring_width_km, max_radius_km)
+            new_cells = [
+                cell
+                for cell in self._cells_near(latitude, longitude, radius_km)
+                if cell not in visited
+            ]
+            visited.update(new_cells)
+
+            new_positions = self._positions_in(new_cells)
+            new_distances = calculate_distances_km(
+                latitude,
+                longitude,
+                self._latitudes[new_positions],
+                self._longitudes[new_positions],
+                approximate=approximate,
+            )
+            positions = np.concatenate((pending_positions, new_positions))
+            distances = np.concatenate((pending_distances, new_distances))
+
+            inside = distances <= radius_km
+            ring_order = np.argsort(distances[inside], kind="stable")
+            yield radius_km, [self._items[position] for position in positions[inside][ring_order]]
+
+            pending_positions, pending_distances = positions[~inside], distances[~inside]
+
+    def _group_into_cells(
+        self, rows: npt.NDArray[np.int64], columns: npt.NDArray[np.int64]
+    ) -> dict[Cell, slice]:
+        if rows.size == 0:
+            return {}
+
+        boundaries = np.flatnonzero((np.diff(rows) != 0) | (np.diff(columns) != 0)) + 1
+        starts = np.concatenate(([0], boundaries))
+        stops = np.concatenate((boundaries, [rows.size]))
+
+        return {
+            (int(rows[start]), int(columns[start])): slice(int(start), int(stop))
+            for start, stop in zip(starts, stops, strict=True)
+        }
+
+    def _positions_in(self, cells: Iterable[Cell]) -> npt.NDArray[np.int64]:
+        ranges = [np.arange(self._cells[cell].start, self._cells[cell].stop) for cell in cells]
+        if not ranges:
+            return np.empty(0, dtype=np.int64)
+        return np.concatenate(ranges)
+
+    def _cell_of(self, latitude: float, longitude: float) -> Cell:
+        return (
+            floor(latitude / self.cell_size_degrees),
+            floor(longitude / self.cell_size_degrees),
+        )
+
+    def _cells_near(self, latitude: float, longitude: float, radius_km: float) -> Iterator[Cell]:
+        latitude_span = radius_km / KM_PER_DEGREE
+        poleward_latitude = min(abs(latitude) + latitude_span, MAX_LATITUDE)
+        longitude_span = radius_km / (KM_PER_DEGREE * cos(radians(poleward_latitude)))
+
+        min_row, min_column = self._cell_of(latitude - latitude_span, longitude - longitude_span)
+        max_row, max_column = self._cell_of(latitude + latitude_span, longitude + longitude_span)
+
+        bounding_cell_count = (max_row - min_row + 1) * (max_column - min_column + 1)
+        if bounding_cell_count > len(self._cells):
+            return (
+                cell
+                for cell in self._cells
+                if min_row <= cell[0] <= max_row and min_column <= cell[1] <= max_column
+            )
+
+        return (
+            (row, column)
+            for row in range(min_row, max_row + 1)
+            for column in range(min_column, max_column + 1)
+            if (row, column) in self._cells
+        )
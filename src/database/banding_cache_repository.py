@@ -0,0 +1,33 @@
+from datetime import UTC, datetime
+
+from motor.motor_asyncio import AsyncIOMotorCollection
+from pymongo import ASCENDING
+
+from src.core_engine.agents.banding_agent import BandingResult
+
+DEFAULT_TTL_SECONDS = 24 * 60 * 60
+
+
+class MongoBandingCache:
+    def __init__(self, collection: AsyncIOMotorCollection, ttl_seconds: int = DEFAULT_TTL_SECONDS):
+        self.collection = collection
+        self.ttl_seconds = ttl_seconds
+
+    async def ensure_indexes(self) -> None:
+        await self.collection.create_index([("key", ASCENDING)], unique=True)
+        await self.collection.create_index(
+            [("created_at", ASCENDING)], expireAfterSeconds=self.ttl_seconds
+        )
+
+    async def get(self, key: str) -> BandingResult | None:
+        doc = await self.collection.find_one({"key": key})
+        if doc:
+            return BandingResult(**doc["result"])
+        return None
+
+    async def set(self, key: str, result: BandingResult) -> None:
+        await self.collection.replace_one(
+            {"key": key},
+            {"key": key, "result": result.model_dump(), "created_at": datetime.now(UTC)},
+            upsert=True,
+        )
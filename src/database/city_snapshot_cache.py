@@ -0,0 +1,171 @@
+import asyncio
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Mapping, Sequence
+from dataclasses import dataclass
+from typing import Any, Generic, TypeVar
+
+from motor.motor_asyncio import AsyncIOMotorCollection
+from pymongo.errors import PyMongoError
+
+from src.core_engine.utils.metrics import CITY_SNAPSHOT_LOOKUPS
+from src.models.property import Property
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+PROPERTY_OVERHEAD_BYTES = 2048
+
+T = TypeVar("T")
+
+
+@dataclass(frozen=True)
+class CitySnapshot(Generic[T]):
+    version: int
+    value: T
+    size_bytes: int
+
+
+def estimate_property_bytes(prop: Property) -> int:
+    soft_config = prop.soft_config
+    text_fields = [
+        prop.id,
+        prop.city,
+        prop.locality,
+        *soft_config.furniture_items,
+        *soft_config.appliances,
+        *soft_config.amenities,
+    ]
+    return PROPERTY_OVERHEAD_BYTES + sum(len(text) for text in text_fields)
+
+
+def estimate_properties_bytes(properties: list[Property]) -> int:
+    return sum(estimate_property_bytes(prop) for prop in properties)
+
+
+class CitySnapshotCache(Generic[T]):
+    def __init__(self, kind: str, size_of: Callable[[T], int], max_bytes: int = DEFAULT_MAX_BYTES):
+        self.kind = kind
+        self.size_of = size_of
+        self.max_bytes = max_bytes
+        self.size_bytes = 0
+        self._epoch = 0
+        self._versions: dict[str, int] = {}
+        self._snapshots: OrderedDict[str, CitySnapshot[T]] = OrderedDict()
+        self._refreshes: dict[str, asyncio.Task[None]] = {}
+
+    def version(self, city: str) -> int:
+        return self._epoch + self._versions.get(city, 0)
+
+    def get(self, city: str) -> T | None:
+        snapshot = self._snapshots.get(city)
+        if snapshot is None or snapshot.version != self.version(city):
+            return None
+        self._snapshots.move_to_end(city)
+        return snapshot.value
+
+    def store(self, city: str, value: T, version: int | None = None) -> None:
+        snapshot_version = self.version(city) if version is None else version
+        if snapshot_version != self.version(city):
+            return
+
+        size_bytes = self.size_of(value)
+        if size_bytes > self.max_bytes:
+            return
+
+        self._discard(city)
+        self._snapshots[city] = CitySnapshot(snapshot_version, value, size_bytes)
+        self.size_bytes += size_bytes
+        while self.size_bytes > self.max_bytes:
+            _, evicted = self._snapshots.popitem(last=False)
+            self.size_bytes -= evicted.size_bytes
+
+    async def get_or_load(self, city: str, loader: Callable[[str], Awaitable[T]]) -> T:
+        cached = self.get(city)
+        if cached is not None:
+            CITY_SNAPSHOT_LOOKUPS.inc(1.0, self.kind, "hit")
+            return cached
+
+        CITY_SNAPSHOT_LOOKUPS.inc(1.0, self.kind, "miss")
+        version = self.version(city)
+        value = await loader(city)
+        self.store(city, value, version)
+        return value
+
+    def get_or_refresh(self, city: str, loader: Callable[[str], Awaitable[T]]) -> T | None:
+        cached = self.get(city)
+        if cached is not None:
+            CITY_SNAPSHOT_LOOKUPS.inc(1.0, self.kind, "hit")
+            return cached
+
+        CITY_SNAPSHOT_LOOKUPS.inc(1.0, self.kind, "miss")
+        if city not in self._refreshes:
+            refresh = asyncio.create_task(self._refresh(city, loader))
+            self._refreshes[city] = refresh
+            refresh.add_done_callback(lambda _: self._refreshes.pop(city, None))
+        return None
+
+    async def _refresh(self, city: str, loader: Callable[[str], Awaitable[T]]) -> None:
+        version = self.version(city)
+        try:
+            value = await loader(city)
+        except PyMongoError:
+            return
+        self.store(city, value, version)
+
+    def invalidate(self, city: str) -> None:
+        self._versions[city] = self._versions.get(city, 0) + 1
+        self._discard(city)
+
+    def invalidate_all(self) -> None:
+        self._epoch += 1
+        self._snapshots.clear()
+        self.size_bytes = 0
+
+    def property_changed(self, previous: Property | None, current: Property | None) -> None:
+        cities = {prop.city for prop in (previous, current) if prop is not None}
+        for city in cities:
+            self.invalidate(city)
+
+    def _discard(self, city: str) -> None:
+        snapshot = self._snapshots.pop(city, None)
+        if snapshot is not None:
+            self.size_bytes -= snapshot.size_bytes
+
+
+async def follow_changes(
+    collection: AsyncIOMotorCollection, caches: Sequence[CitySnapshotCache]
+) -> None:
+    try:
+        async with collection.watch(
+            full_document="updateLookup", full_document_before_change="whenAvailable"
+        ) as stream:
+            async for change in stream:
+                cities = changed_cities(change)
+                for cache in caches:
+                    if cities is None:
+                        cache.invalidate_all()
+                        continue
+                    for city in cities:
+                        cache.invalidate(city)
+    except PyMongoError:
+        return
+
+
+def changed_cities(change: Mapping[str, Any]) -> set[str] | None:
+    operation = change["operationType"]
+    before = change.get("fullDocumentBeforeChange")
+    after = change.get("fullDocument")
+    if operation == "insert" and after is not None:
+        return {after["city"]}
+    if operation == "delete" and before is not None:
+        return {before["city"]}
+    if operation in ("update", "replace"):
+        if before is not None and after is not None:
+            return {before["city"], after["city"]}
+        if operation == "update" and after is not None and not moves_city(change):
+            return {after["city"]}
+    return None
+
+
+def moves_city(change: Mapping[str, Any]) -> bool:
+    description = change.get("updateDescription", {})
+    changed_fields = [*description.get("updatedFields", {}), *description.get("removedFields", [])]
+    return "city" in changed_fields
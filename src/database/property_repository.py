@@ -1,47 +1,269 @@
+from collections.abc import AsyncIterator, Iterable, Sequence
+from typing import Any, Protocol
+
 from motor.motor_asyncio import AsyncIOMotorCollection
+from pymongo import ASCENDING, GEOSPHERE, ReturnDocument
+from pymongo.errors import PyMongoError
+
+from src.core_engine.utils.columnar_snapshot import ColumnarCitySnapshot
+from src.core_engine.utils.fuzzy_match import area_window
+from src.core_engine.utils.geo import EARTH_RADIUS_KM
+from src.core_engine.utils.metrics import REPOSITORY_LATENCY, timed
+from src.core_engine.utils.profiler import profile_stage
+from src.database.city_snapshot_cache import CitySnapshotCache
+from src.models.property import PROPERTY_FIELDS, NearbyProperty, Property, PropertySummary
+
+LOCATION_FIELD = "location"
+DISTANCE_FIELD = "distance_km"
+MONGO_EARTH_RADIUS_KM = 6378.1
+DEFAULT_STREAM_BATCH_SIZE = 1000
+KEYSET_INDEX = [("city", ASCENDING), ("id", ASCENDING)]
+COMPARABLES_INDEX = [
+    ("city", ASCENDING),
+    ("hard_config.bhk_type", ASCENDING),
+    ("hard_config.bedrooms", ASCENDING),
+    ("hard_config.bathrooms", ASCENDING),
+    ("hard_config.property_type", ASCENDING),
+    ("hard_config.area_sqft", ASCENDING),
+]
 
-from src.models.property import Property
+
+class PropertyChangeListener(Protocol):
+    def property_changed(self, previous: Property | None, current: Property | None) -> None: ...
 
 
 class PropertyRepository:
-    def __init__(self, collection: AsyncIOMotorCollection):
+    def __init__(
+        self,
+        collection: AsyncIOMotorCollection,
+        listeners: Iterable[PropertyChangeListener] = (),
+        city_snapshots: CitySnapshotCache[list[Property]] | None = None,
+        city_columns: CitySnapshotCache[ColumnarCitySnapshot] | None = None,
+    ):
         self.collection = collection
+        self.listeners = list(listeners)
+        self.city_snapshots = city_snapshots
+        self.city_columns = city_columns
+        self.listeners.extend(
+            cache for cache in (city_snapshots, city_columns) if cache is not None
+        )
+
+    def notify(self, previous: Property | None, current: Property | None) -> None:
+        for listener in self.listeners:
+            listener.property_changed(previous, current)
 
+    async def ensure_indexes(self) -> None:
+        await self.collection.update_many(
+            {LOCATION_FIELD: {"$exists": False}},
+            [{"$set": {LOCATION_FIELD: geo_point("$latitude", "$longitude")}}],
+        )
+        await self.collection.create_index([(LOCATION_FIELD, GEOSPHERE)])
+        await self.collection.create_index(COMPARABLES_INDEX)
+        await self.collection.create_index([("id", ASCENDING)])
+        await self.collection.create_index(KEYSET_INDEX)
+        await self.enable_change_pre_images()
+
+    async def enable_change_pre_images(self) -> None:
+        try:
+            await self.collection.database.command(
+                "collMod", self.collection.name, changeStreamPreAndPostImages={"enabled": True}
+            )
+        except PyMongoError:
+            return
+
+    @timed(REPOSITORY_LATENCY, "create")
     async def create(self, property_obj: Property) -> Property:
-        property_dict = property_obj.model_dump()
-        await self.collection.insert_one(property_dict)
+        await self.collection.insert_one(to_document(property_obj))
+        self.notify(None, property_obj)
         return property_obj
 
+    @timed(REPOSITORY_LATENCY, "get_by_id")
     async def get_by_id(self, property_id: str) -> Property | None:
         doc = await self.collection.find_one({"id": property_id})
         if doc:
-            doc.pop("_id", None)
-            return Property(**doc)
+            return to_property(doc)
         return None
 
+    @timed(REPOSITORY_LATENCY, "get_all")
     async def get_all(self) -> list[Property]:
         cursor = self.collection.find({})
         docs = await cursor.to_list(length=None)
-        properties = []
-        for doc in docs:
-            doc.pop("_id", None)
-            properties.append(Property(**doc))
-        return properties
+        return [to_property(doc) for doc in docs]
 
+    @timed(REPOSITORY_LATENCY, "get_by_city")
     async def get_by_city(self, city: str) -> list[Property]:
+        if self.city_snapshots is None:
+            return await self.query_by_city(city)
+        return await self.city_snapshots.get_or_load(city, self.query_by_city)
+
+    @timed(REPOSITORY_LATENCY, "query_by_city")
+    async def query_by_city(self, city: str) -> list[Property]:
         cursor = self.collection.find({"city": city})
         docs = await cursor.to_list(length=None)
-        properties = []
-        for doc in docs:
-            doc.pop("_id", None)
-            properties.append(Property(**doc))
-        return properties
+        return [to_property(doc) for doc in docs]
+
+    @timed(REPOSITORY_LATENCY, "get_columns_by_city")
+    async def get_columns_by_city(self, city: str) -> ColumnarCitySnapshot:
+        if self.city_columns is None:
+            return await self.query_columns_by_city(city)
+        return await self.city_columns.get_or_load(city, self.query_columns_by_city)
+
+    def get_cached_columns_by_city(self, city: str) -> ColumnarCitySnapshot | None:
+        if self.city_columns is None:
+            return None
+        return self.city_columns.get_or_refresh(city, self.query_columns_by_city)
+
+    @timed(REPOSITORY_LATENCY, "query_columns_by_city")
+    async def query_columns_by_city(self, city: str) -> ColumnarCitySnapshot:
+        cursor = self.collection.find({"city": city}, projection(PROPERTY_FIELDS))
+        docs = await cursor.to_list(length=None)
+        with profile_stage("column_construction"):
+            return ColumnarCitySnapshot(docs)
+
+    @timed(REPOSITORY_LATENCY, "get_projected")
+    async def get_projected(
+        self, fields: Sequence[str], city: str | None = None
+    ) -> list[PropertySummary]:
+        cursor = self.collection.find({"city": city} if city else {}, projection(fields))
+        docs = await cursor.to_list(length=None)
+        return [PropertySummary.model_validate(doc) for doc in docs]
 
+    @timed(REPOSITORY_LATENCY, "get_page")
+    async def get_page(
+        self, limit: int, city: str | None = None, after: str | None = None
+    ) -> tuple[list[Property], str | None]:
+        cursor = (
+            self.collection.find(keyset_filter(city, after)).sort("id", ASCENDING).limit(limit + 1)
+        )
+        docs = await cursor.to_list(length=None)
+        properties = [to_property(doc) for doc in docs[:limit]]
+        next_cursor = properties[-1].id if len(docs) > limit else None
+        return properties, next_cursor
+
+    async def stream_documents(
+        self,
+        city: str | None = None,
+        fields: Sequence[str] = PROPERTY_FIELDS,
+        batch_size: int = DEFAULT_STREAM_BATCH_SIZE,
+    ) -> AsyncIterator[dict[str, Any]]:
+        cursor = self.collection.find(keyset_filter(city, None), projection(fields)).sort(
+            "id", ASCENDING
+        )
+        async for doc in cursor.batch_size(batch_size):
+            yield doc
+
+    @timed(REPOSITORY_LATENCY, "get_by_ids")
+    async def get_by_ids(self, property_ids: list[str]) -> list[Property]:
+        cursor = self.collection.find({"id": {"$in": property_ids}})
+        docs = await cursor.to_list(length=None)
+        return [to_property(doc) for doc in docs]
+
+    @timed(REPOSITORY_LATENCY, "find_within_radius")
+    async def find_within_radius(
+        self, latitude: float, longitude: float, radius_km: float, city: str | None = None
+    ) -> list[NearbyProperty]:
+        mongo_to_local_km = EARTH_RADIUS_KM / MONGO_EARTH_RADIUS_KM
+        pipeline = [
+            {
+                "$geoNear": {
+                    "near": geo_point(latitude, longitude),
+                    "key": LOCATION_FIELD,
+                    "distanceField": DISTANCE_FIELD,
+                    "maxDistance": radius_km / mongo_to_local_km * 1000,
+                    "distanceMultiplier": mongo_to_local_km / 1000,
+                    "spherical": True,
+                    "query": {"city": city} if city else {},
+                }
+            }
+        ]
+        cursor = self.collection.aggregate(pipeline)
+        docs = await cursor.to_list(length=None)
+        return [
+            NearbyProperty(distance_km=doc.pop(DISTANCE_FIELD), property=to_property(doc))
+            for doc in docs
+        ]
+
+    @timed(REPOSITORY_LATENCY, "find_comparables")
+    async def find_comparables(
+        self, reference: Property, radius_km: float | None, area_tolerance_percent: float
+    ) -> list[Property]:
+        cursor = self.collection.find(
+            comparables_filter(reference, radius_km, area_tolerance_percent)
+        )
+        docs = await cursor.to_list(length=None)
+        with profile_stage("model_construction"):
+            return [to_property(doc) for doc in docs]
+
+    @timed(REPOSITORY_LATENCY, "update")
     async def update(self, property_obj: Property) -> Property:
-        property_dict = property_obj.model_dump()
-        await self.collection.replace_one({"id": property_obj.id}, property_dict)
+        previous = await self.collection.find_one_and_replace(
+            {"id": property_obj.id},
+            to_document(property_obj),
+            return_document=ReturnDocument.BEFORE,
+        )
+        if previous:
+            self.notify(to_property(previous), property_obj)
         return property_obj
 
+    @timed(REPOSITORY_LATENCY, "delete")
     async def delete(self, property_id: str) -> bool:
-        result = await self.collection.delete_one({"id": property_id})
-        return result.deleted_count > 0
+        previous = await self.collection.find_one_and_delete({"id": property_id})
+        if not previous:
+            return False
+        self.notify(to_property(previous), None)
+        return True
+
+
+def keyset_filter(city: str | None, after: str | None) -> dict[str, Any]:
+    query: dict[str, Any] = {}
+    if city:
+        query["city"] = city
+    if after is not None:
+        query["id"] = {"$gt": after}
+    return query
+
+
+def projection(fields: Iterable[str]) -> dict[str, int]:
+    return {"_id": 0, **{field: 1 for field in fields}}
+
+
+def geo_point(latitude: Any, longitude: Any) -> dict[str, Any]:
+    return {"type": "Point", "coordinates": [longitude, latitude]}
+
+
+def comparables_filter(
+    reference: Property, radius_km: float | None, area_tolerance_percent: float
+) -> dict[str, Any]:
+    hard_config = reference.hard_config
+    min_area, max_area = area_window(hard_config.area_sqft, area_tolerance_percent)
+    query: dict[str, Any] = {
+        "city": reference.city,
+        "hard_config.bhk_type": hard_config.bhk_type,
+        "hard_config.bedrooms": hard_config.bedrooms,
+        "hard_config.bathrooms": hard_config.bathrooms,
+        "hard_config.property_type": hard_config.property_type,
+        "hard_config.area_sqft": {"$gte": min_area, "$lte": max_area},
+        "id": {"$ne": reference.id},
+    }
+    if radius_km is not None:
+        query[LOCATION_FIELD] = {
+            "$geoWithin": {
+                "$centerSphere": [
+                    [reference.longitude, reference.latitude],
+                    radius_km / EARTH_RADIUS_KM,
+                ]
+            }
+        }
+    return query
+
+
+def to_document(property_obj: Property) -> dict[str, Any]:
+    document = property_obj.model_dump()
+    document[LOCATION_FIELD] = geo_point(property_obj.latitude, property_obj.longitude)
+    return document
+
+
+def to_property(doc: dict[str, Any]) -> Property:
+    doc.pop("_id", None)
+    doc.pop(LOCATION_FIELD, None)
+    return Property.model_validate(doc)
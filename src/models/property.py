@@ -47,3 +47,24 @@ class Property(BaseModel):
     current_rent: float | None
 
     model_config = ConfigDict(from_attributes=True)
+
+
+PROPERTY_FIELDS = tuple(Property.model_fields)
+
+
+class PropertySummary(BaseModel):
+    id: str | None = None
+    hard_config: HardConfig | None = None
+    soft_config: SoftConfig | None = None
+    city: str | None = None
+    locality: str | None = None
+    latitude: float | None = None
+    longitude: float | None = None
+    current_rent: float | None = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class NearbyProperty(BaseModel):
+    property: Property
+    distance_km: float
@@ -0,0 +1,74 @@
+from collections.abc import AsyncIterator
+from typing import Any, cast
+
+import pytest
+
+from src.api.main import load_rent_statistics, prewarm_city_snapshots
+from src.core_engine.utils.columnar_snapshot import ColumnarCitySnapshot
+from src.core_engine.utils.locality_stats import LocalityStatsTable
+from src.core_engine.utils.rent_sketches import RentSketchIndex, city_key
+from src.database.city_snapshot_cache import CitySnapshotCache, estimate_properties_bytes
+from src.database.property_repository import PropertyRepository
+from src.models.property import Property
+from tests.fixtures import create_property
+
+
+class StreamingRepository:
+    def __init__(self, properties: list[Property]):
+        self.properties = properties
+        self.column_loads: list[str] = []
+
+    async def stream_documents(self) -> AsyncIterator[dict[str, Any]]:
+        for prop in self.properties:
+            yield prop.model_dump()
+
+    async def query_columns_by_city(self, city: str) -> ColumnarCitySnapshot:
+        self.column_loads.append(city)
+        return ColumnarCitySnapshot.from_properties(
+            prop for prop in self.properties if prop.city == city
+        )
+
+
+@pytest.fixture
+def repository():
+    return StreamingRepository(
+        [
+            create_property("a", current_rent=20000.0),
+            create_property("b", current_rent=30000.0),
+            create_property("c", city="Mumbai", current_rent=50000.0),
+        ]
+    )
+
+
+@pytest.mark.asyncio
+async def test_load_rent_statistics_streams_every_property_and_counts_cities(repository):
+    sketches = RentSketchIndex()
+
+    city_counts = await load_rent_statistics(
+        cast(PropertyRepository, repository), sketches, LocalityStatsTable()
+    )
+
+    assert city_counts == {"Bangalore": 2, "Mumbai": 1}
+    bangalore = sketches.sketch(city_key("Bangalore"))
+    assert bangalore is not None and bangalore.count == 2
+
+
+@pytest.mark.asyncio
+async def test_prewarm_loads_largest_city_last_and_materializes_properties(repository):
+    city_snapshots: CitySnapshotCache[list[Property]] = CitySnapshotCache(
+        "properties", estimate_properties_bytes
+    )
+    city_columns: CitySnapshotCache[ColumnarCitySnapshot] = CitySnapshotCache(
+        "columns", lambda columns: columns.nbytes
+    )
+    city_counts = await load_rent_statistics(
+        cast(PropertyRepository, repository), RentSketchIndex(), LocalityStatsTable()
+    )
+
+    await prewarm_city_snapshots(
+        cast(PropertyRepository, repository), city_snapshots, city_columns, city_counts, None
+    )
+
+    assert repository.column_loads == ["Mumbai", "Bangalore"]
+    assert city_snapshots.get("Bangalore") == repository.properties[:2]
+    assert len(city_columns.get("Mumbai") or []) == 1
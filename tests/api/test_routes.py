@@ -1,8 +1,23 @@
+import json
+from unittest.mock import AsyncMock, patch
+
 import pytest
 from httpx import ASGITransport, AsyncClient
 
-from src.api.dependencies import get_property_repository
+from src.api.dependencies import (
+    get_banding_agent_pool,
+    get_banding_cache,
+    get_locality_stats_table,
+    get_profile_trace_dir,
+    get_property_repository,
+    get_rent_sketch_index,
+)
 from src.api.main import app
+from src.core_engine.agents.agent_pool import BandingAgentPool
+from src.core_engine.agents.banding_agent import MultiBandingResult
+from src.core_engine.agents.banding_cache import InMemoryBandingCache
+from src.core_engine.utils.locality_stats import LocalityStatsTable
+from src.core_engine.utils.rent_sketches import RentSketchIndex
 from src.models.property import Property
 from src.models.property_config import HardConfig, SoftConfig
 
@@ -34,6 +49,18 @@ async def test_health_check():
         assert response.json() == {"status": "healthy"}
 
 
+@pytest.mark.asyncio
+async def test_metrics_endpoint_exposes_prometheus_text():
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.get("/metrics")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+        assert "# TYPE workflow_node_seconds histogram" in response.text
+        assert "# TYPE banding_cache_lookups_total counter" in response.text
+
+
 @pytest.mark.asyncio
 async def test_create_property(property_repository):
     app.dependency_overrides[get_property_repository] = lambda: property_repository
@@ -121,6 +148,94 @@ async def test_list_properties(property_repository, test_property):
     app.dependency_overrides.clear()
 
 
+@pytest.mark.asyncio
+async def test_list_properties_with_fields_returns_only_those_fields(
+    property_repository, test_property
+):
+    await property_repository.create(test_property)
+
+    app.dependency_overrides[get_property_repository] = lambda: property_repository
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.get(
+            "/api/v1/properties?city=Bangalore&fields=id,current_rent,hard_config"
+        )
+
+        assert response.status_code == 200
+        [data] = response.json()
+        assert set(data) == {"id", "current_rent", "hard_config"}
+        assert data["hard_config"]["bhk_type"] == "2BHK"
+
+    app.dependency_overrides.clear()
+
+
+@pytest.mark.asyncio
+async def test_list_properties_page_follows_next_cursor(property_repository, test_property):
+    for suffix in ("a", "b", "c"):
+        await property_repository.create(test_property.model_copy(update={"id": f"prop_{suffix}"}))
+
+    app.dependency_overrides[get_property_repository] = lambda: property_repository
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        first = await client.get("/api/v1/properties/page?city=Bangalore&limit=2")
+        cursor = first.json()["next_cursor"]
+        second = await client.get(f"/api/v1/properties/page?city=Bangalore&limit=2&cursor={cursor}")
+
+        assert [item["id"] for item in first.json()["items"]] == ["prop_a", "prop_b"]
+        assert cursor == "prop_b"
+        assert [item["id"] for item in second.json()["items"]] == ["prop_c"]
+        assert second.json()["next_cursor"] is None
+
+    app.dependency_overrides.clear()
+
+
+@pytest.mark.asyncio
+async def test_stream_properties_yields_ndjson(property_repository, test_property):
+    await property_repository.create(test_property)
+
+    app.dependency_overrides[get_property_repository] = lambda: property_repository
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.get("/api/v1/properties/stream?city=Bangalore&fields=id,city")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/x-ndjson"
+        assert [json.loads(line) for line in response.text.splitlines()] == [
+            {"id": "test_prop_1", "city": "Bangalore"}
+        ]
+
+    app.dependency_overrides.clear()
+
+
+@pytest.mark.asyncio
+async def test_list_properties_page_rejects_out_of_range_limit():
+    app.dependency_overrides[get_property_repository] = lambda: None
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.get("/api/v1/properties/page?limit=0")
+
+        assert response.status_code == 422
+
+    app.dependency_overrides.clear()
+
+
+@pytest.mark.asyncio
+async def test_list_properties_rejects_unknown_fields():
+    app.dependency_overrides[get_property_repository] = lambda: None
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.get("/api/v1/properties?fields=id,owner_phone")
+
+        assert response.status_code == 422
+
+    app.dependency_overrides.clear()
+
+
 @pytest.mark.asyncio
 async def test_list_properties_by_city(property_repository, test_property):
     await property_repository.create(test_property)
@@ -137,3 +252,197 @@ async def test_list_properties_by_city(property_repository, test_property):
         assert all(p["city"] == "Bangalore" for p in data)
 
     app.dependency_overrides.clear()
+
+
+def override_banding_dependencies(property_repository):
+    app.dependency_overrides[get_property_repository] = lambda: property_repository
+    app.dependency_overrides[get_banding_cache] = InMemoryBandingCache
+    app.dependency_overrides[get_banding_agent_pool] = lambda: BandingAgentPool("test_key")
+
+
+@pytest.mark.asyncio
+async def test_analyze_rejects_non_positive_k():
+    app.dependency_overrides[get_property_repository] = lambda: None
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.post(
+            "/api/v1/properties/analyze", json={"property_id": "test_prop_1", "k": 0}
+        )
+
+        assert response.status_code == 422
+
+    app.dependency_overrides.clear()
+
+
+@pytest.mark.asyncio
+async def test_bulk_analysis_requires_exactly_one_subject_selector():
+    app.dependency_overrides[get_property_repository] = lambda: None
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        neither = await client.post("/api/v1/properties/analyze/bulk", json={})
+        both = await client.post(
+            "/api/v1/properties/analyze/bulk",
+            json={"city": "Bangalore", "property_ids": ["test_prop_1"]},
+        )
+        zero_k = await client.post(
+            "/api/v1/properties/analyze/bulk", json={"city": "Bangalore", "k": 0}
+        )
+
+        assert neither.status_code == 422
+        assert both.status_code == 422
+        assert zero_k.status_code == 422
+
+    app.dependency_overrides.clear()
+
+
+@pytest.mark.asyncio
+@patch("src.core_engine.agents.banding_agent.ChatAnthropic")
+async def test_bulk_analysis_of_city(mock_chat_anthropic, property_repository, test_property):
+    await property_repository.create(test_property)
+    await property_repository.create(test_property.model_copy(update={"id": "test_prop_2"}))
+    await property_repository.create(
+        test_property.model_copy(update={"id": "test_prop_3", "city": "Mumbai"})
+    )
+    override_banding_dependencies(property_repository)
+    mock_chat_anthropic.return_value.with_structured_output.return_value.abatch = AsyncMock(
+        return_value=[
+            MultiBandingResult(
+                bands={"L3": ["test_prop_1", "test_prop_2"]},
+                parameters_used=["rent_per_sqft"],
+                parameters_rationale="Bulk",
+                new_property_bands={"test_prop_1": "L3", "test_prop_2": "L3"},
+                confidence_score=0.8,
+            )
+        ]
+    )
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.post("/api/v1/properties/analyze/bulk", json={"city": "Bangalore"})
+
+        assert response.status_code == 200
+        results = response.json()["results"]
+        assert sorted(result["property_id"] for result in results) == [
+            "test_prop_1",
+            "test_prop_2",
+        ]
+        assert all(result["filtered_properties_count"] == 1 for result in results)
+
+    app.dependency_overrides.clear()
+
+
+@pytest.mark.asyncio
+async def test_bulk_analysis_with_unknown_property_id(property_repository, test_property):
+    await property_repository.create(test_property)
+    override_banding_dependencies(property_repository)
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.post(
+            "/api/v1/properties/analyze/bulk",
+            json={"property_ids": ["test_prop_1", "non_existent"]},
+        )
+
+        assert response.status_code == 404
+        assert "non_existent" in response.json()["detail"]
+
+    app.dependency_overrides.clear()
+
+
+@pytest.mark.asyncio
+@patch("src.core_engine.agents.banding_agent.ChatAnthropic")
+async def test_analyze_with_profile_returns_stage_breakdown_and_trace(
+    mock_chat_anthropic, property_repository, test_property, tmp_path
+):
+    await property_repository.ensure_indexes()
+    await property_repository.create(test_property)
+    override_banding_dependencies(property_repository)
+    app.dependency_overrides[get_profile_trace_dir] = lambda: tmp_path
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.post(
+            "/api/v1/properties/analyze",
+            json={"property_id": "test_prop_1", "profile": True},
+        )
+
+        assert response.status_code == 200
+        profile = response.json()["profile"]
+        stages = {stage["stage"] for stage in profile["stages"]}
+        assert {
+            "analyze",
+            "analyze;repository_fetch",
+            "analyze;repository_fetch;column_construction",
+            "analyze;filter_properties",
+            "analyze;filter_properties;model_construction",
+            "analyze;calculate_iqr",
+        } <= stages
+        assert profile["trace_file"].startswith(str(tmp_path))
+
+    app.dependency_overrides.clear()
+
+
+@pytest.mark.asyncio
+async def test_city_stats_are_served_from_the_locality_table(test_property):
+    locality_stats = LocalityStatsTable()
+    locality_stats.load([test_property])
+    app.dependency_overrides[get_locality_stats_table] = lambda: locality_stats
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.get("/api/v1/stats/Bangalore")
+        empty_response = await client.get("/api/v1/stats/Mumbai")
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["city"] == "Bangalore"
+    assert [(row["locality"], row["bhk_type"], row["count"]) for row in data["localities"]] == [
+        ("Koramangala", "2BHK", 1)
+    ]
+    assert data["localities"][0]["average_rent"] == 30000.0
+    assert empty_response.json() == {"city": "Mumbai", "localities": []}
+
+    app.dependency_overrides.clear()
+
+
+@pytest.mark.asyncio
+async def test_rent_range_is_served_from_the_sketch_index(test_property):
+    rent_sketches = RentSketchIndex()
+    rent_sketches.load(
+        [
+            test_property,
+            test_property.model_copy(update={"id": "test_prop_2", "current_rent": 40000.0}),
+        ]
+    )
+    app.dependency_overrides[get_rent_sketch_index] = lambda: rent_sketches
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        city_response = await client.get("/api/v1/stats/Bangalore/rent-range")
+        group_response = await client.get(
+            "/api/v1/stats/Bangalore/rent-range",
+            params={
+                "locality": "Koramangala",
+                "bhk_type": "2BHK",
+                "bedrooms": 2,
+                "bathrooms": 2,
+                "property_type": "apartment",
+            },
+        )
+        partial_response = await client.get(
+            "/api/v1/stats/Bangalore/rent-range", params={"bhk_type": "2BHK"}
+        )
+        missing_response = await client.get("/api/v1/stats/Mumbai/rent-range")
+
+    assert city_response.status_code == 200
+    assert city_response.json()["count"] == 2
+    assert city_response.json()["median"] == pytest.approx(30000.0, rel=0.01)
+    assert group_response.status_code == 200
+    assert group_response.json()["locality"] == "Koramangala"
+    assert group_response.json()["count"] == 2
+    assert partial_response.status_code == 422
+    assert missing_response.status_code == 404
+
+    app.dependency_overrides.clear()
@@ -6,9 +6,17 @@ from testcontainers.core.wait_strategies import (
 )
 from testcontainers.mongodb import MongoDbContainer
 
+from src.api import dependencies
 from src.database.property_repository import PropertyRepository
 
 
+@pytest.fixture(autouse=True)
+def reset_banding_agent_pool():
+    dependencies.banding_agent_pool = None
+    yield
+    dependencies.banding_agent_pool = None
+
+
 @pytest.fixture(scope="session")
 def mongo_container():
     container = MongoDbContainer("mongo:7.0").waiting_for(
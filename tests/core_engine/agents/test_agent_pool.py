@@ -0,0 +1,122 @@
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from src.core_engine.agents.agent_pool import BandingAgentPool, BandingQueueFullError
+from src.core_engine.agents.banding_agent import BandingResult, MultiBandingResult
+from src.models.property import Property
+from tests.fixtures import create_property
+
+RESULT = BandingResult(
+    bands={"L1": ["prop1"]},
+    parameters_used=["amenities"],
+    parameters_rationale="test",
+    new_property_band="L1",
+    confidence_score=0.9,
+)
+
+
+def create_properties() -> list[Property]:
+    return [create_property(f"prop{index}") for index in range(3)]
+
+
+@patch("src.core_engine.agents.banding_agent.ChatAnthropic")
+def test_agent_is_reused_per_temperature(mock_chat):
+    pool = BandingAgentPool(anthropic_api_key="test_key")
+
+    assert pool.agent(0.0) is pool.agent(0.0)
+    assert pool.agent(0.0) is not pool.agent(0.5)
+    assert mock_chat.call_count == 2
+
+
+@pytest.mark.asyncio
+@patch("src.core_engine.agents.banding_agent.ChatAnthropic")
+async def test_aband_properties_limits_calls_in_flight(mock_chat):
+    in_flight = 0
+    peak = 0
+
+    async def slow_banding(_):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return RESULT
+
+    mock_chat.return_value.with_structured_output.return_value.ainvoke = AsyncMock(
+        side_effect=slow_banding
+    )
+    pool = BandingAgentPool(anthropic_api_key="test_key", max_in_flight=2, max_queued=10)
+    properties = create_properties()
+
+    results = await asyncio.gather(
+        *(pool.aband_properties(properties[0], properties[1:]) for _ in range(6))
+    )
+
+    assert results == [RESULT] * 6
+    assert peak == 2
+
+
+@pytest.mark.asyncio
+@patch("src.core_engine.agents.banding_agent.ChatAnthropic")
+async def test_aband_properties_rejects_when_queue_is_full(mock_chat):
+    release = asyncio.Event()
+
+    async def blocked_banding(_):
+        await release.wait()
+        return RESULT
+
+    mock_chat.return_value.with_structured_output.return_value.ainvoke = AsyncMock(
+        side_effect=blocked_banding
+    )
+    pool = BandingAgentPool(anthropic_api_key="test_key", max_in_flight=1, max_queued=1)
+    properties = create_properties()
+
+    running = asyncio.create_task(pool.aband_properties(properties[0], properties[1:]))
+    waiting = asyncio.create_task(pool.aband_properties(properties[0], properties[1:]))
+    await asyncio.sleep(0)
+
+    with pytest.raises(BandingQueueFullError):
+        await pool.aband_properties(properties[0], properties[1:])
+
+    release.set()
+    assert await asyncio.gather(running, waiting) == [RESULT, RESULT]
+    assert pool.queued == 0
+
+
+def test_api_key_is_resolved_on_first_agent():
+    def missing_key() -> str:
+        raise ValueError("ANTHROPIC_API_KEY environment variable is not set")
+
+    pool = BandingAgentPool(anthropic_api_key=missing_key)
+
+    with pytest.raises(ValueError):
+        pool.agent()
+
+
+@pytest.mark.asyncio
+@patch("src.core_engine.agents.banding_agent.ChatAnthropic")
+async def test_aband_many_properties_takes_at_most_its_share_of_free_slots(mock_chat):
+    structured_llm = mock_chat.return_value.with_structured_output.return_value
+    structured_llm.abatch = AsyncMock(
+        side_effect=lambda prompts, config: [
+            MultiBandingResult(
+                bands={"L1": ["prop1"]},
+                parameters_used=["amenities"],
+                parameters_rationale="test",
+                new_property_bands={f"unit{index}": "L1" for index in range(25)},
+                confidence_score=0.9,
+            )
+            for _ in prompts
+        ]
+    )
+    pool = BandingAgentPool(anthropic_api_key="test_key", max_in_flight=6, max_queued=10)
+    properties = create_properties()
+    subjects = [properties[0].model_copy(update={"id": f"unit{index}"}) for index in range(25)]
+
+    results = await pool.aband_many_properties(subjects, properties)
+
+    assert len(results) == 25
+    assert pool.max_slots_per_call == 3
+    assert structured_llm.abatch.call_args.kwargs["config"] == {"max_concurrency": 3}
@@ -1,8 +1,12 @@
-from unittest.mock import Mock, patch
+from unittest.mock import AsyncMock, Mock, patch
 
 import pytest
 
-from src.core_engine.agents.banding_agent import BandingResult, PropertyBandingAgent
+from src.core_engine.agents.banding_agent import (
+    BandingResult,
+    MultiBandingResult,
+    PropertyBandingAgent,
+)
 from src.models.property import Property
 from src.models.property_config import HardConfig, SoftConfig
 
@@ -162,3 +166,104 @@ def test_banding_result_structure(mock_chat_anthropic, test_properties, new_prop
     assert isinstance(result.parameters_rationale, str)
     assert isinstance(result.new_property_band, str)
     assert isinstance(result.confidence_score, float)
+
+
+@pytest.mark.asyncio
+@patch("src.core_engine.agents.banding_agent.ChatAnthropic")
+async def test_banding_agent_bands_properties_asynchronously(
+    mock_chat_anthropic, test_properties, new_property
+):
+    mock_llm = Mock()
+    mock_chat_anthropic.return_value = mock_llm
+
+    mock_response = BandingResult(
+        bands={"L5": ["prop1"], "L3": ["prop2"], "L1": ["prop3"]},
+        parameters_used=["furnishing_score"],
+        parameters_rationale="Async categorization",
+        new_property_band="L4",
+        confidence_score=0.8,
+    )
+
+    mock_llm.with_structured_output.return_value.ainvoke = AsyncMock(return_value=mock_response)
+
+    agent = PropertyBandingAgent(anthropic_api_key="test_key")
+    result = await agent.aband_properties(new_property, test_properties)
+
+    assert result.new_property_band == "L4"
+    mock_llm.with_structured_output.return_value.invoke.assert_not_called()
+
+
+def create_subjects(count: int, new_property: Property) -> list[Property]:
+    return [new_property.model_copy(update={"id": f"unit{i}"}) for i in range(count)]
+
+
+@pytest.mark.asyncio
+@patch("src.core_engine.agents.banding_agent.ChatAnthropic")
+async def test_banding_agent_bands_many_subjects_in_batched_prompts(
+    mock_chat_anthropic, test_properties, new_property
+):
+    mock_llm = Mock()
+    mock_chat_anthropic.return_value = mock_llm
+    subjects = create_subjects(12, new_property)
+
+    async def band_batch(prompts, config):
+        return [
+            MultiBandingResult(
+                bands={"L5": ["prop1"], "L3": ["prop2"], "L1": ["prop3"]},
+                parameters_used=["furnishing_score"],
+                parameters_rationale="Shared comparables",
+                new_property_bands={
+                    subject.id: "L4" for subject in subjects if f"ID: {subject.id}\n" in prompt
+                },
+                confidence_score=0.8,
+            )
+            for prompt in prompts
+        ]
+
+    mock_llm.with_structured_output.return_value.abatch = AsyncMock(side_effect=band_batch)
+
+    agent = PropertyBandingAgent(anthropic_api_key="test_key")
+    results = await agent.aband_many_properties(subjects, test_properties)
+
+    prompts = mock_llm.with_structured_output.return_value.abatch.call_args.args[0]
+    assert len(prompts) == 2
+    assert all(prompt.count("Property ID: prop1\n") == 1 for prompt in prompts)
+    assert [result.new_property_band for result in results] == ["L4"] * 12
+    assert results[0].bands == {"L5": ["prop1"], "L3": ["prop2"], "L1": ["prop3"]}
+
+
+@pytest.mark.asyncio
+@patch("src.core_engine.agents.banding_agent.ChatAnthropic")
+async def test_banding_agent_retries_subjects_missing_from_batch_answer(
+    mock_chat_anthropic, test_properties, new_property
+):
+    mock_llm = Mock()
+    mock_chat_anthropic.return_value = mock_llm
+    subjects = create_subjects(2, new_property)
+
+    mock_llm.with_structured_output.return_value.abatch = AsyncMock(
+        return_value=[
+            MultiBandingResult(
+                bands={"L3": ["prop1", "prop2", "prop3"]},
+                parameters_used=["rent_per_sqft"],
+                parameters_rationale="Partial answer",
+                new_property_bands={"unit0": "L3"},
+                confidence_score=0.7,
+            )
+        ]
+    )
+    mock_llm.with_structured_output.return_value.ainvoke = AsyncMock(
+        return_value=BandingResult(
+            bands={"L3": ["prop1", "prop2", "prop3"]},
+            parameters_used=["rent_per_sqft"],
+            parameters_rationale="Single answer",
+            new_property_band="L2",
+            confidence_score=0.7,
+        )
+    )
+
+    agent = PropertyBandingAgent(anthropic_api_key="test_key")
+    results = await agent.aband_many_properties(subjects, test_properties)
+
+    assert [result.new_property_band for result in results] == ["L3", "L2"]
+    assert "unit1" in mock_llm.with_structured_output.return_value.ainvoke.call_args.args[0]
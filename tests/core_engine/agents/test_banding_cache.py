@@ -0,0 +1,78 @@
+import pytest
+
+from src.core_engine.agents.banding_agent import BandingResult
+from src.core_engine.agents.banding_cache import (
+    InMemoryBandingCache,
+    TieredBandingCache,
+    banding_cache_key,
+)
+from tests.fixtures import create_property
+
+
+def create_result(band: str = "L3") -> BandingResult:
+    return BandingResult(
+        bands={band: ["prop1"]},
+        parameters_used=["rent_per_sqft"],
+        parameters_rationale="Cached",
+        new_property_band=band,
+        confidence_score=0.9,
+    )
+
+
+def test_cache_key_ignores_comparable_order_and_subject_id():
+    comparables = [create_property("prop1"), create_property("prop2")]
+
+    key = banding_cache_key(create_property("new"), comparables)
+    reordered_key = banding_cache_key(create_property("other_new"), comparables[::-1])
+
+    assert key == reordered_key
+
+
+def test_cache_key_changes_when_a_comparable_changes():
+    key = banding_cache_key(create_property("new"), [create_property("prop1")])
+    changed_key = banding_cache_key(
+        create_property("new"), [create_property("prop1", current_rent=30000.0)]
+    )
+
+    assert key != changed_key
+
+
+@pytest.mark.asyncio
+async def test_in_memory_cache_evicts_least_recently_used():
+    cache = InMemoryBandingCache(max_entries=2)
+    await cache.set("a", create_result("L1"))
+    await cache.set("b", create_result("L2"))
+    await cache.get("a")
+
+    await cache.set("c", create_result("L3"))
+
+    assert await cache.get("b") is None
+    kept = await cache.get("a")
+    added = await cache.get("c")
+    assert kept is not None
+    assert added is not None
+    assert kept.new_property_band == "L1"
+    assert added.new_property_band == "L3"
+
+
+@pytest.mark.asyncio
+async def test_tiered_cache_backfills_faster_tiers_on_hit():
+    fast_tier = InMemoryBandingCache()
+    slow_tier = InMemoryBandingCache()
+    await slow_tier.set("key", create_result("L4"))
+    cache = TieredBandingCache(fast_tier, slow_tier)
+
+    result = await cache.get("key")
+    backfilled = await fast_tier.get("key")
+
+    assert result is not None
+    assert backfilled is not None
+    assert result.new_property_band == "L4"
+    assert backfilled.new_property_band == "L4"
+
+
+@pytest.mark.asyncio
+async def test_tiered_cache_miss_returns_none():
+    cache = TieredBandingCache(InMemoryBandingCache(), InMemoryBandingCache())
+
+    assert await cache.get("missing") is None
@@ -0,0 +1,90 @@
+from src.core_engine.agents.banding_agent import BandingResult, estimate_tokens, format_comparable
+from src.core_engine.agents.comparable_selection import (
+    assign_unselected_comparables,
+    prioritize_comparables,
+    select_comparables_within_budget,
+)
+from src.models.property import Property
+from tests.fixtures import create_property
+
+ITEMS = ["sofa", "bed", "dining_table", "wardrobe", "fridge", "ac", "tv", "parking", "gym"]
+
+
+def create_neighbourhood(count: int = 400) -> list[Property]:
+    return [
+        create_property(
+            f"prop{i}",
+            area_sqft=800.0 + (i * 37) % 600,
+            current_rent=15000.0 + (i * 53) % 20000,
+            furniture_items=ITEMS[: i % 10],
+        )
+        for i in range(count)
+    ]
+
+
+def test_prioritize_comparables_starts_with_extremes_and_keeps_everyone():
+    comparables = create_neighbourhood()
+
+    ordered = prioritize_comparables(comparables)
+
+    rents_per_sqft = [(p.current_rent or 0) / p.hard_config.area_sqft for p in comparables]
+    areas = [p.hard_config.area_sqft for p in comparables]
+    leading = ordered[:4]
+    leading_rents_per_sqft = {(p.current_rent or 0) / p.hard_config.area_sqft for p in leading}
+    leading_areas = {p.hard_config.area_sqft for p in leading}
+    assert {min(rents_per_sqft), max(rents_per_sqft)} <= leading_rents_per_sqft
+    assert {min(areas), max(areas)} <= leading_areas
+    assert sorted(p.id for p in ordered) == sorted(p.id for p in comparables)
+
+
+def test_select_comparables_within_budget_respects_token_budget():
+    comparables = create_neighbourhood()
+
+    selected = select_comparables_within_budget(comparables, token_budget=1000)
+
+    used = sum(estimate_tokens(format_comparable(p)) for p in selected)
+    assert 0 < len(selected) < len(comparables)
+    assert used <= 1000
+
+
+def test_select_comparables_within_budget_spreads_across_rent_strata():
+    comparables = create_neighbourhood()
+
+    selected = select_comparables_within_budget(comparables, token_budget=1500)
+
+    rents_per_sqft = sorted((p.current_rent or 0) / p.hard_config.area_sqft for p in comparables)
+    quartile_edges = [rents_per_sqft[len(rents_per_sqft) * q // 4] for q in (1, 2, 3)]
+    selected_quartiles = {
+        sum((p.current_rent or 0) / p.hard_config.area_sqft >= edge for edge in quartile_edges)
+        for p in selected
+    }
+    assert selected_quartiles == {0, 1, 2, 3}
+
+
+def test_select_comparables_within_budget_keeps_small_sets_whole():
+    comparables = create_neighbourhood(count=10)
+
+    selected = select_comparables_within_budget(comparables)
+
+    assert sorted(p.id for p in selected) == sorted(p.id for p in comparables)
+
+
+def test_assign_unselected_comparables_uses_nearest_selected_band():
+    cheap = create_property("cheap", current_rent=10000.0)
+    dear = create_property("dear", current_rent=40000.0, furniture_items=ITEMS[:9])
+    nearly_cheap = create_property("nearly_cheap", current_rent=11000.0)
+    nearly_dear = create_property("nearly_dear", current_rent=38000.0, furniture_items=ITEMS[:8])
+    result = BandingResult(
+        bands={"L1": ["cheap"], "L5": ["dear"]},
+        parameters_used=["rent_per_sqft"],
+        parameters_rationale="test",
+        new_property_band="L5",
+        confidence_score=0.8,
+    )
+
+    assigned = assign_unselected_comparables(
+        result, [cheap, dear], [cheap, nearly_cheap, nearly_dear, dear]
+    )
+
+    assert assigned.bands == {"L1": ["cheap", "nearly_cheap"], "L5": ["dear", "nearly_dear"]}
+    assert result.bands == {"L1": ["cheap"], "L5": ["dear"]}
@@ -0,0 +1,81 @@
+import pytest
+
+from src.core_engine.agents.local_banding import (
+    LocalBandingScorer,
+    is_unusual_comparable_set,
+)
+from src.models.property import Property
+from tests.fixtures import create_property
+
+ITEMS = ["sofa", "bed", "dining_table", "wardrobe", "fridge", "ac", "tv", "parking", "gym"]
+
+
+def create_consistent_comparables(count: int = 20) -> list[Property]:
+    return [
+        create_property(
+            f"prop{i}", furniture_items=ITEMS[: i % 10], current_rent=15000.0 + 1500.0 * (i % 10)
+        )
+        for i in range(count)
+    ]
+
+
+def test_local_banding_places_well_furnished_property_in_top_band():
+    comparables = create_consistent_comparables()
+
+    result = LocalBandingScorer().band_properties(
+        create_property("new", furniture_items=ITEMS[:9], current_rent=None), comparables
+    )
+
+    assert result.new_property_band == "L5"
+    assert result.confidence_score == pytest.approx(1.0)
+
+
+def test_local_banding_places_unfurnished_property_in_bottom_band():
+    comparables = create_consistent_comparables()
+
+    result = LocalBandingScorer().band_properties(
+        create_property("new", current_rent=None), comparables
+    )
+
+    assert result.new_property_band == "L1"
+
+
+def test_local_banding_assigns_every_comparable_to_a_band():
+    comparables = create_consistent_comparables()
+
+    result = LocalBandingScorer().band_properties(
+        create_property("new", furniture_items=ITEMS[:4], current_rent=None), comparables
+    )
+
+    banded_ids = sorted(prop_id for ids in result.bands.values() for prop_id in ids)
+    assert banded_ids == sorted(p.id for p in comparables)
+    assert set(result.bands) <= {"L1", "L2", "L3", "L4", "L5"}
+
+
+def test_local_banding_has_no_confidence_when_amenities_do_not_explain_rent():
+    comparables = [
+        create_property(f"prop{i}", furniture_items=ITEMS[:3], current_rent=15000.0 + 1000.0 * i)
+        for i in range(10)
+    ]
+
+    result = LocalBandingScorer().band_properties(
+        create_property("new", furniture_items=ITEMS[:3], current_rent=None), comparables
+    )
+
+    assert result.confidence_score == 0.0
+
+
+def test_small_comparable_set_is_unusual():
+    assert is_unusual_comparable_set(create_consistent_comparables(3)) is True
+
+
+def test_mostly_unrented_comparable_set_is_unusual():
+    comparables = [
+        create_property(f"prop{i}", furniture_items=ITEMS[:i], current_rent=None) for i in range(8)
+    ]
+
+    assert is_unusual_comparable_set(comparables) is True
+
+
+def test_consistent_comparable_set_is_not_unusual():
+    assert is_unusual_comparable_set(create_consistent_comparables()) is False
@@ -1,11 +1,24 @@
-from unittest.mock import Mock, patch
+import asyncio
+from unittest.mock import AsyncMock, Mock, patch
 
 import pytest
 
-from src.core_engine.agents.banding_agent import BandingResult
-from src.core_engine.graphs.property_banding_workflow import analyze_property_with_banding
+from src.core_engine.agents.banding_agent import BandingResult, MultiBandingResult
+from src.core_engine.agents.banding_cache import InMemoryBandingCache
+from src.core_engine.graphs.property_banding_workflow import (
+    analyze_properties_with_banding,
+    analyze_property_with_banding,
+)
+from src.core_engine.utils.columnar_snapshot import ColumnarCitySnapshot
+from src.core_engine.utils.metrics import (
+    BANDING_CACHE_LOOKUPS,
+    COMPARABLE_CANDIDATES,
+    PROMPT_TOKENS,
+    WORKFLOW_NODE_LATENCY,
+)
 from src.models.property import Property
 from src.models.property_config import HardConfig, SoftConfig
+from tests.fixtures import create_property
 
 
 @pytest.fixture
@@ -78,8 +91,9 @@ def new_property():
     )
 
 
+@pytest.mark.asyncio
 @patch("src.core_engine.agents.banding_agent.ChatAnthropic")
-def test_property_banding_workflow(mock_chat_anthropic, test_properties, new_property):
+async def test_property_banding_workflow(mock_chat_anthropic, test_properties, new_property):
     mock_llm = Mock()
     mock_chat_anthropic.return_value = mock_llm
 
@@ -91,9 +105,11 @@ def test_property_banding_workflow(mock_chat_anthropic, test_properties, new_pro
         confidence_score=0.85,
     )
 
-    mock_llm.with_structured_output.return_value.invoke.return_value = mock_banding_response
+    mock_llm.with_structured_output.return_value.ainvoke = AsyncMock(
+        return_value=mock_banding_response
+    )
 
-    result = analyze_property_with_banding(
+    result = await analyze_property_with_banding(
         new_property=new_property,
         all_properties=test_properties,
         radius_km=2.0,
@@ -109,12 +125,504 @@ def test_property_banding_workflow(mock_chat_anthropic, test_properties, new_pro
     assert "recommended_max" in result["iqr_analysis"]
 
 
+@pytest.mark.asyncio
 @patch("src.core_engine.agents.banding_agent.ChatAnthropic")
-def test_workflow_with_no_similar_properties(mock_chat_anthropic, new_property):
-    result = analyze_property_with_banding(
+async def test_workflow_with_no_similar_properties(mock_chat_anthropic, new_property):
+    result = await analyze_property_with_banding(
         new_property=new_property, all_properties=[], radius_km=2.0, area_tolerance_percent=15.0
     )
 
     assert result["filtered_properties"] == []
     assert result["banding_result"] is None
     assert result["iqr_analysis"] is None
+
+
+@pytest.mark.asyncio
+@patch("src.core_engine.agents.banding_agent.ChatAnthropic")
+async def test_workflow_with_k_returns_nearest_comparables(
+    mock_chat_anthropic, test_properties, new_property
+):
+    mock_llm = Mock()
+    mock_chat_anthropic.return_value = mock_llm
+    mock_llm.with_structured_output.return_value.ainvoke = AsyncMock(
+        return_value=BandingResult(
+            bands={"L4": ["prop3", "prop2"]},
+            parameters_used=["rent_per_sqft"],
+            parameters_rationale="Nearest comparables",
+            new_property_band="L4",
+            confidence_score=0.8,
+        )
+    )
+
+    result = await analyze_property_with_banding(
+        new_property=new_property,
+        all_properties=test_properties,
+        radius_km=0.0,
+        area_tolerance_percent=15.0,
+        k=2,
+    )
+
+    assert [p.id for p in result["filtered_properties"]] == ["prop3", "prop2"]
+
+
+@pytest.mark.asyncio
+@patch("src.core_engine.agents.banding_agent.ChatAnthropic")
+async def test_adaptive_workflow_grows_radius_until_min_comparables(
+    mock_chat_anthropic, test_properties, new_property
+):
+    mock_llm = Mock()
+    mock_chat_anthropic.return_value = mock_llm
+    mock_llm.with_structured_output.return_value.ainvoke = AsyncMock(
+        return_value=BandingResult(
+            bands={"L3": ["prop1", "prop2", "prop3", "prop4"]},
+            parameters_used=["rent_per_sqft"],
+            parameters_rationale="Adaptive comparables",
+            new_property_band="L3",
+            confidence_score=0.8,
+        )
+    )
+    farther_property = test_properties[0].model_copy(update={"id": "prop4", "latitude": 12.9512})
+
+    result = await analyze_property_with_banding(
+        new_property=new_property,
+        all_properties=[*test_properties, farther_property],
+        area_tolerance_percent=15.0,
+        adaptive=True,
+        min_comparables=4,
+        max_radius_km=5.0,
+    )
+
+    assert result["search_radius_km"] == 1.5
+    assert len(result["filtered_properties"]) == 4
+
+
+@pytest.mark.asyncio
+@patch("src.core_engine.agents.banding_agent.ChatAnthropic")
+async def test_adaptive_workflow_caps_comparables_at_max(
+    mock_chat_anthropic, test_properties, new_property
+):
+    mock_llm = Mock()
+    mock_chat_anthropic.return_value = mock_llm
+    mock_llm.with_structured_output.return_value.ainvoke = AsyncMock(
+        return_value=BandingResult(
+            bands={"L3": ["prop3", "prop2"]},
+            parameters_used=["rent_per_sqft"],
+            parameters_rationale="Adaptive comparables",
+            new_property_band="L3",
+            confidence_score=0.8,
+        )
+    )
+
+    result = await analyze_property_with_banding(
+        new_property=new_property,
+        all_properties=test_properties,
+        area_tolerance_percent=15.0,
+        adaptive=True,
+        min_comparables=1,
+        max_comparables=2,
+    )
+
+    assert result["search_radius_km"] == 0.5
+    assert [p.id for p in result["filtered_properties"]] == ["prop3", "prop2"]
+
+
+@pytest.mark.asyncio
+@patch("src.core_engine.agents.banding_agent.ChatAnthropic")
+async def test_concurrent_analyses_overlap_llm_waits(
+    mock_chat_anthropic, test_properties, new_property
+):
+    mock_llm = Mock()
+    mock_chat_anthropic.return_value = mock_llm
+    banding_response = BandingResult(
+        bands={"L3": ["prop1", "prop2", "prop3"]},
+        parameters_used=["rent_per_sqft"],
+        parameters_rationale="Concurrent analyses",
+        new_property_band="L3",
+        confidence_score=0.8,
+    )
+    in_flight = 0
+    peak_in_flight = 0
+
+    async def slow_banding(prompt):
+        nonlocal in_flight, peak_in_flight
+        in_flight += 1
+        peak_in_flight = max(peak_in_flight, in_flight)
+        await asyncio.sleep(0.05)
+        in_flight -= 1
+        return banding_response
+
+    mock_llm.with_structured_output.return_value.ainvoke = AsyncMock(side_effect=slow_banding)
+
+    await asyncio.gather(
+        analyze_property_with_banding(new_property=new_property, all_properties=test_properties),
+        analyze_property_with_banding(new_property=new_property, all_properties=test_properties),
+    )
+
+    assert peak_in_flight == 2
+
+
+@pytest.mark.asyncio
+@patch("src.core_engine.agents.banding_agent.ChatAnthropic")
+async def test_workflow_reuses_cached_banding_result(
+    mock_chat_anthropic, test_properties, new_property
+):
+    mock_llm = Mock()
+    mock_chat_anthropic.return_value = mock_llm
+    mock_llm.with_structured_output.return_value.ainvoke = AsyncMock(
+        return_value=BandingResult(
+            bands={"L5": ["prop1"], "L3": ["prop2"], "L1": ["prop3"]},
+            parameters_used=["rent_per_sqft"],
+            parameters_rationale="Cached banding",
+            new_property_band="L3",
+            confidence_score=0.85,
+        )
+    )
+    banding_cache = InMemoryBandingCache()
+
+    first = await analyze_property_with_banding(
+        new_property=new_property, all_properties=test_properties, banding_cache=banding_cache
+    )
+    second = await analyze_property_with_banding(
+        new_property=new_property, all_properties=test_properties, banding_cache=banding_cache
+    )
+
+    assert first["banding_result"] == second["banding_result"]
+    assert mock_llm.with_structured_output.return_value.ainvoke.await_count == 1
+    assert mock_chat_anthropic.call_args.kwargs["temperature"] == 0.0
+
+
+def create_furnished_comparables(count: int = 20) -> list[Property]:
+    furniture = ["sofa", "bed", "dining_table", "wardrobe", "tv"]
+    return [
+        Property(
+            id=f"comparable{i}",
+            hard_config=HardConfig(
+                area_sqft=1000.0,
+                bhk_type="2BHK",
+                bedrooms=2,
+                bathrooms=2,
+                property_type="apartment",
+            ),
+            soft_config=SoftConfig(furniture_items=furniture[: i % 6], appliances=[], amenities=[]),
+            city="Bangalore",
+            locality="Koramangala",
+            latitude=12.9372,
+            longitude=77.6265,
+            current_rent=18000.0 + 2000.0 * (i % 6),
+        )
+        for i in range(count)
+    ]
+
+
+@pytest.mark.asyncio
+@patch("src.core_engine.agents.banding_agent.ChatAnthropic")
+async def test_confident_local_banding_skips_llm(mock_chat_anthropic, new_property):
+    result = await analyze_property_with_banding(
+        new_property=new_property, all_properties=create_furnished_comparables()
+    )
+
+    assert result["banding_result"]["new_property_band"] == "L5"
+    assert result["iqr_analysis"] is not None
+    mock_chat_anthropic.assert_not_called()
+
+
+@pytest.mark.asyncio
+@patch("src.core_engine.agents.banding_agent.ChatAnthropic")
+async def test_low_local_confidence_escalates_to_llm(mock_chat_anthropic, new_property):
+    mock_llm = Mock()
+    mock_chat_anthropic.return_value = mock_llm
+    mock_llm.with_structured_output.return_value.ainvoke = AsyncMock(
+        return_value=BandingResult(
+            bands={"L2": [f"comparable{i}" for i in range(20)]},
+            parameters_used=["rent_per_sqft"],
+            parameters_rationale="Escalated",
+            new_property_band="L2",
+            confidence_score=0.9,
+        )
+    )
+
+    result = await analyze_property_with_banding(
+        new_property=new_property,
+        all_properties=create_furnished_comparables(),
+        local_confidence_threshold=1.1,
+    )
+
+    assert result["banding_result"]["parameters_rationale"] == "Escalated"
+
+
+@pytest.mark.asyncio
+@patch("src.core_engine.agents.banding_agent.ChatAnthropic")
+async def test_llm_prompt_is_trimmed_to_token_budget(mock_chat_anthropic, new_property):
+    comparables = create_furnished_comparables(count=60)
+    prompts = []
+
+    async def band_prompted_comparables(prompt):
+        prompts.append(prompt)
+        prompted_ids = [p.id for p in comparables if f"Property ID: {p.id}\n" in prompt]
+        return BandingResult(
+            bands={"L3": prompted_ids},
+            parameters_used=["rent_per_sqft"],
+            parameters_rationale="Budgeted",
+            new_property_band="L3",
+            confidence_score=0.9,
+        )
+
+    mock_llm = Mock()
+    mock_chat_anthropic.return_value = mock_llm
+    mock_llm.with_structured_output.return_value.ainvoke = AsyncMock(
+        side_effect=band_prompted_comparables
+    )
+
+    result = await analyze_property_with_banding(
+        new_property=new_property,
+        all_properties=comparables,
+        local_confidence_threshold=1.1,
+        prompt_token_budget=500,
+    )
+
+    prompted = prompts[0].count("Property ID: comparable")
+    assert 0 < prompted < len(comparables)
+    assert sorted(result["banding_result"]["bands"]["L3"]) == sorted(p.id for p in comparables)
+
+
+@pytest.mark.asyncio
+@patch("src.core_engine.agents.banding_agent.ChatAnthropic")
+async def test_bulk_analysis_bands_a_building_in_one_call(
+    mock_chat_anthropic, test_properties, new_property
+):
+    units = [new_property.model_copy(update={"id": f"unit{i}"}) for i in range(5)]
+    mock_llm = Mock()
+    mock_chat_anthropic.return_value = mock_llm
+    mock_llm.with_structured_output.return_value.abatch = AsyncMock(
+        return_value=[
+            MultiBandingResult(
+                bands={"L5": ["prop1"], "L3": ["prop2"], "L1": ["prop3"]},
+                parameters_used=["furnishing_score"],
+                parameters_rationale="Building onboarding",
+                new_property_bands={unit.id: "L3" for unit in units},
+                confidence_score=0.85,
+            )
+        ]
+    )
+
+    results = await analyze_properties_with_banding(
+        new_properties=units, all_properties=test_properties
+    )
+
+    assert len(results) == 5
+    assert all(result["banding_result"]["new_property_band"] == "L3" for result in results)
+    assert all(result["iqr_analysis"] is not None for result in results)
+    mock_llm.with_structured_output.return_value.abatch.assert_awaited_once()
+    mock_llm.with_structured_output.return_value.ainvoke.assert_not_called()
+
+
+@pytest.mark.asyncio
+@patch("src.core_engine.agents.banding_agent.ChatAnthropic")
+async def test_bulk_analysis_shares_one_block_when_units_are_listed(
+    mock_chat_anthropic, test_properties, new_property
+):
+    units = [new_property.model_copy(update={"id": f"unit{i}"}) for i in range(5)]
+    mock_llm = Mock()
+    mock_chat_anthropic.return_value = mock_llm
+    mock_llm.with_structured_output.return_value.abatch = AsyncMock(
+        return_value=[
+            MultiBandingResult(
+                bands={"L5": ["prop1"], "L3": ["prop2", *(unit.id for unit in units)]},
+                parameters_used=["furnishing_score"],
+                parameters_rationale="Listed building",
+                new_property_bands={unit.id: "L3" for unit in units},
+                confidence_score=0.85,
+            )
+        ]
+    )
+
+    results = await analyze_properties_with_banding(
+        new_properties=units, all_properties=[*test_properties, *units]
+    )
+
+    prompts = mock_llm.with_structured_output.return_value.abatch.call_args.args[0]
+    mock_llm.with_structured_output.return_value.abatch.assert_awaited_once()
+    assert len(prompts) == 1
+    assert all(f"- Excludes similar properties: {unit.id}\n" in prompts[0] for unit in units)
+    for unit, result in zip(units, results, strict=True):
+        assert unit.id not in result["banding_result"]["bands"]["L3"]
+        assert len(result["banding_result"]["bands"]["L3"]) == 5
+
+
+@pytest.mark.asyncio
+@patch("src.core_engine.agents.banding_agent.ChatAnthropic")
+async def test_bulk_analysis_bands_each_city_cluster_separately(mock_chat_anthropic):
+    one_bhk = [
+        create_property(f"one{i}", bhk_type="1BHK", area_sqft=600.0, current_rent=18000.0 + i * 500)
+        for i in range(8)
+    ]
+    three_bhk = [
+        create_property(
+            f"three{i}",
+            bhk_type="3BHK",
+            area_sqft=1500.0,
+            latitude=13.16,
+            locality="Yelahanka",
+            current_rent=40000.0 + i * 500,
+        )
+        for i in range(8)
+    ]
+    units = [*one_bhk, *three_bhk]
+
+    def band_clusters(prompts, config=None):
+        outputs = []
+        for prompt in prompts:
+            cluster = one_bhk if "one0" in prompt else three_bhk
+            outputs.append(
+                MultiBandingResult(
+                    bands={"L3": [unit.id for unit in cluster]},
+                    parameters_used=["rent_per_sqft"],
+                    parameters_rationale="Cluster",
+                    new_property_bands={unit.id: "L3" for unit in cluster},
+                    confidence_score=0.85,
+                )
+            )
+        return outputs
+
+    mock_llm = Mock()
+    mock_chat_anthropic.return_value = mock_llm
+    abatch = AsyncMock(side_effect=band_clusters)
+    mock_llm.with_structured_output.return_value.abatch = abatch
+
+    results = await analyze_properties_with_banding(
+        new_properties=units, all_properties=units, local_confidence_threshold=1.1
+    )
+
+    prompts = [prompt for call in abatch.call_args_list for prompt in call.args[0]]
+    assert abatch.await_count == 2
+    assert len(prompts) == 2
+    for prompt in prompts:
+        own, other = (one_bhk, three_bhk) if "one0" in prompt else (three_bhk, one_bhk)
+        assert all(f"- Excludes similar properties: {unit.id}\n" in prompt for unit in own)
+        assert not any(unit.id in prompt for unit in other)
+    for unit, result in zip(units, results, strict=True):
+        assert unit.id not in result["banding_result"]["bands"]["L3"]
+        assert len(result["banding_result"]["bands"]["L3"]) == 7
+
+
+@pytest.mark.asyncio
+@patch("src.core_engine.agents.banding_agent.ChatAnthropic")
+async def test_bulk_analysis_with_no_subjects_returns_empty_list(mock_chat_anthropic):
+    assert await analyze_properties_with_banding(new_properties=[], all_properties=[]) == []
+
+
+@pytest.mark.asyncio
+@patch("src.core_engine.agents.banding_agent.ChatAnthropic")
+async def test_neighbourhood_stats_cover_all_comparables_alongside_banding(
+    mock_chat_anthropic, new_property
+):
+    comparables = create_furnished_comparables()
+    mock_llm = Mock()
+    mock_chat_anthropic.return_value = mock_llm
+    mock_llm.with_structured_output.return_value.ainvoke = AsyncMock(
+        return_value=BandingResult(
+            bands={"L2": ["comparable0", "comparable6"], "L4": ["comparable1"]},
+            parameters_used=["rent_per_sqft"],
+            parameters_rationale="Escalated",
+            new_property_band="L2",
+            confidence_score=0.9,
+        )
+    )
+
+    result = await analyze_property_with_banding(
+        new_property=new_property, all_properties=comparables, local_confidence_threshold=1.1
+    )
+
+    assert result["neighbourhood_stats"]["count"] == len(comparables)
+    assert result["neighbourhood_stats"]["min_rent"] == 18000.0
+    assert result["neighbourhood_stats"]["max_rent"] == 28000.0
+    assert result["iqr_analysis"]["median"] == 18000.0
+
+
+@pytest.mark.asyncio
+@patch("src.core_engine.agents.banding_agent.ChatAnthropic")
+async def test_workflow_records_node_latency_and_counters(
+    mock_chat_anthropic, test_properties, new_property
+):
+    mock_llm = Mock()
+    mock_chat_anthropic.return_value = mock_llm
+    mock_llm.with_structured_output.return_value.ainvoke = AsyncMock(
+        return_value=BandingResult(
+            bands={"L3": ["prop1", "prop2", "prop3"]},
+            parameters_used=["rent_per_sqft"],
+            parameters_rationale="Measured",
+            new_property_band="L3",
+            confidence_score=0.9,
+        )
+    )
+    filter_calls = WORKFLOW_NODE_LATENCY.count("property_banding", "filter_properties")
+    llm_calls = WORKFLOW_NODE_LATENCY.count("property_banding", "band_properties")
+    scanned = COMPARABLE_CANDIDATES.value("scanned")
+    kept = COMPARABLE_CANDIDATES.value("kept")
+    prompt_tokens = PROMPT_TOKENS.value()
+    misses = BANDING_CACHE_LOOKUPS.value("miss")
+
+    result = await analyze_property_with_banding(
+        new_property=new_property,
+        all_properties=test_properties,
+        banding_cache=InMemoryBandingCache(),
+    )
+
+    assert WORKFLOW_NODE_LATENCY.count("property_banding", "filter_properties") == filter_calls + 1
+    assert WORKFLOW_NODE_LATENCY.count("property_banding", "band_properties") == llm_calls + 1
+    assert COMPARABLE_CANDIDATES.value("scanned") == scanned + len(test_properties)
+    assert COMPARABLE_CANDIDATES.value("kept") == kept + len(result["filtered_properties"])
+    assert PROMPT_TOKENS.value() > prompt_tokens
+    assert BANDING_CACHE_LOOKUPS.value("miss") == misses + 1
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "search",
+    [
+        {"radius_km": 2.0},
+        {"k": 23},
+        {"adaptive": True, "min_comparables": 22, "max_comparables": 30},
+    ],
+)
+@patch("src.core_engine.agents.banding_agent.ChatAnthropic")
+async def test_city_snapshot_filters_like_property_indexes(
+    mock_chat_anthropic, test_properties, new_property, search
+):
+    mock_llm = Mock()
+    mock_chat_anthropic.return_value = mock_llm
+    mock_llm.with_structured_output.return_value.ainvoke = AsyncMock(
+        return_value=BandingResult(
+            bands={"L3": ["prop1"]},
+            parameters_used=["rent_per_sqft"],
+            parameters_rationale="Escalated",
+            new_property_band="L3",
+            confidence_score=0.8,
+        )
+    )
+    farther_property = test_properties[0].model_copy(update={"id": "prop4", "latitude": 12.9512})
+    other_config = test_properties[1].model_copy(
+        update={
+            "id": "prop5",
+            "hard_config": test_properties[1].hard_config.model_copy(
+                update={"bhk_type": "3BHK", "bedrooms": 3}
+            ),
+        }
+    )
+    city = [*create_furnished_comparables(), *test_properties, farther_property, other_config]
+
+    from_properties = await analyze_property_with_banding(
+        new_property=new_property, all_properties=city, **search
+    )
+    from_snapshot = await analyze_property_with_banding(
+        new_property=new_property,
+        all_properties=[],
+        city_snapshot=ColumnarCitySnapshot.from_properties(city),
+        **search,
+    )
+
+    assert {prop.id for prop in from_snapshot["filtered_properties"]} == {
+        prop.id for prop in from_properties["filtered_properties"]
+    }
+    assert from_snapshot["search_radius_km"] == from_properties["search_radius_km"]
+    assert from_snapshot["neighbourhood_stats"] == from_properties["neighbourhood_stats"]
@@ -0,0 +1,63 @@
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+
+from src.core_engine.graphs import property_analysis, property_banding_workflow
+from src.core_engine.graphs.registry import (
+    UnknownWorkflowError,
+    WorkflowRegistry,
+    workflow_registry,
+)
+
+
+def test_register_compiles_graph_once():
+    registry = WorkflowRegistry()
+    factory = Mock()
+
+    registry.register("workflow", factory, dict)
+
+    assert registry.get("workflow") is registry.get("workflow")
+    factory.assert_called_once_with()
+
+
+def test_get_unknown_workflow_raises():
+    with pytest.raises(UnknownWorkflowError):
+        WorkflowRegistry().get("missing")
+
+
+@pytest.mark.asyncio
+async def test_warm_up_invokes_each_graph_with_its_warm_up_state():
+    registry = WorkflowRegistry()
+    graph = Mock(ainvoke=AsyncMock())
+
+    registry.register("workflow", lambda: graph, lambda: {"warm": True})
+    await registry.warm_up()
+
+    graph.ainvoke.assert_awaited_once_with({"warm": True})
+
+
+def test_workflows_are_registered_on_import():
+    assert {
+        property_analysis.PROPERTY_ANALYSIS_WORKFLOW,
+        property_banding_workflow.BANDING_WORKFLOW,
+        property_banding_workflow.BULK_BANDING_WORKFLOW,
+    } <= set(workflow_registry.names())
+
+
+@pytest.mark.asyncio
+@patch("src.core_engine.agents.banding_agent.ChatAnthropic")
+async def test_warm_up_runs_registered_workflows_without_llm_calls(mock_chat_anthropic):
+    await workflow_registry.warm_up()
+
+    mock_chat_anthropic.assert_not_called()
+
+
+@pytest.mark.asyncio
+@patch("src.core_engine.graphs.property_banding_workflow.create_property_banding_graph")
+async def test_analysis_reuses_compiled_workflow(mock_create_graph):
+    await property_banding_workflow.analyze_property_with_banding(
+        new_property=property_banding_workflow.banding_warm_up_state()["new_property"],
+        all_properties=[],
+    )
+
+    mock_create_graph.assert_not_called()
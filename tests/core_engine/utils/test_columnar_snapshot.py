@@ -0,0 +1,101 @@
+import numpy as np
+
+from src.core_engine.utils.columnar_snapshot import ColumnarCitySnapshot
+from src.core_engine.utils.fuzzy_match import fuzzy_match_hard_config
+from src.models.property import Property
+from src.models.property_config import HardConfig
+from tests.fixtures import create_property
+
+
+def create_properties() -> list[Property]:
+    layouts = [
+        (1000.0, "2BHK", 2, 2, "apartment"),
+        (1100.0, "2BHK", 2, 2, "apartment"),
+        (1400.0, "2BHK", 2, 2, "apartment"),
+        (1000.0, "2BHK", 2, 1, "apartment"),
+        (1000.0, "3BHK", 3, 2, "apartment"),
+        (1000.0, "2BHK", 2, 2, "villa"),
+    ]
+    return [
+        create_property(
+            f"prop{i}",
+            area_sqft=area,
+            bhk_type=bhk_type,
+            bedrooms=bedrooms,
+            bathrooms=bathrooms,
+            property_type=property_type,
+            furniture_items=["sofa", "bed"][: i % 3],
+            appliances=["fridge"] if i % 2 else [],
+            amenities=["parking", "gym"] if i == 0 else [],
+            locality="Koramangala" if i % 2 else "HSR",
+            latitude=12.9352 + 0.001 * i,
+            current_rent=None if i == 2 else 20000.0 + 1000.0 * i,
+        )
+        for i, (area, bhk_type, bedrooms, bathrooms, property_type) in enumerate(layouts)
+    ]
+
+
+def test_materialize_round_trips_properties():
+    properties = create_properties()
+    snapshot = ColumnarCitySnapshot.from_properties(properties)
+
+    assert len(snapshot) == len(properties)
+    assert snapshot.materialize(range(len(properties))) == properties
+
+
+def test_materialize_keeps_soft_config_order_and_duplicates():
+    properties = [
+        create_property(
+            "a",
+            furniture_items=["wardrobe", "chair", "chair"],
+            appliances=["tv", "ac"],
+            amenities=[],
+        ),
+        create_property("b", furniture_items=[], appliances=["ac"], amenities=["gym", "pool"]),
+    ]
+    snapshot = ColumnarCitySnapshot.from_properties(properties)
+
+    assert snapshot.materialize(range(len(properties))) == properties
+
+
+def test_matching_agrees_with_fuzzy_hard_config_match():
+    properties = create_properties()
+    snapshot = ColumnarCitySnapshot.from_properties(properties)
+    reference = properties[0]
+
+    matching = snapshot.matching(reference.hard_config, 15.0, exclude_id=reference.id)
+
+    assert snapshot.ids[matching].tolist() == [
+        prop.id
+        for prop in properties
+        if prop.id != reference.id
+        and fuzzy_match_hard_config(reference.hard_config, prop.hard_config, 15.0)
+    ]
+
+
+def test_unknown_bhk_type_matches_nothing():
+    snapshot = ColumnarCitySnapshot.from_properties(create_properties())
+    reference = HardConfig(
+        area_sqft=1000.0, bhk_type="1RK", bedrooms=2, bathrooms=2, property_type="apartment"
+    )
+
+    assert snapshot.matching(reference, 15.0).size == 0
+
+
+def test_by_distance_orders_positions_nearest_first():
+    snapshot = ColumnarCitySnapshot.from_properties(create_properties())
+
+    positions, distances = snapshot.by_distance(
+        12.9402, 77.6245, np.arange(len(snapshot)), max_radius_km=2.0
+    )
+
+    assert positions[0] == 5
+    assert np.all(np.diff(distances) >= 0)
+
+
+def test_rent_columns_skip_unrented_properties():
+    snapshot = ColumnarCitySnapshot.from_properties(create_properties())
+    positions = np.array([0, 1, 2])
+
+    assert snapshot.rents_by_id(positions) == {"prop0": 20000.0, "prop1": 21000.0}
+    assert snapshot.rents_per_sqft(positions).tolist() == [20.0, 21000.0 / 1100.0]
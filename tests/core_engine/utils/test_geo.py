@@ -1,4 +1,6 @@
-from src.core_engine.utils.geo import calculate_distance_km
+import numpy as np
+
+from src.core_engine.utils.geo import calculate_distance_km, calculate_distances_km
 
 
 def test_calculate_distance_same_point():
@@ -26,3 +28,40 @@ def test_calculate_distance_real_world():
     distance = calculate_distance_km(ny_lat, ny_lon, london_lat, london_lon)
     # Approximate distance between NY and London is 5570km
     assert 5500 < distance < 5600
+
+
+def test_calculate_distances_matches_scalar_distance():
+    latitudes = np.array([0.01, -0.01, 51.5074])
+    longitudes = np.array([0.01, -0.01, -0.1278])
+
+    distances = calculate_distances_km(40.7128, -74.0060, latitudes, longitudes)
+
+    expected = [
+        calculate_distance_km(40.7128, -74.0060, lat, lon)
+        for lat, lon in zip(latitudes, longitudes, strict=True)
+    ]
+    assert np.allclose(distances, expected)
+
+
+def test_calculate_distances_with_empty_arrays():
+    distances = calculate_distances_km(0.0, 0.0, np.array([]), np.array([]))
+
+    assert distances.size == 0
+
+
+def test_calculate_distances_approximate_within_error_bound():
+    latitudes = 12.9352 + np.linspace(-0.08, 0.08, 50)
+    longitudes = 77.6245 + np.linspace(-0.08, 0.08, 50)
+
+    exact = calculate_distances_km(12.9352, 77.6245, latitudes, longitudes)
+    approximate = calculate_distances_km(12.9352, 77.6245, latitudes, longitudes, approximate=True)
+
+    assert np.max(np.abs(exact - approximate)) < 1e-5
+
+
+def test_calculate_distances_across_antimeridian():
+    distances = calculate_distances_km(
+        0.0, 179.99, np.array([0.0]), np.array([-179.99]), approximate=True
+    )
+
+    assert 2.2 < distances[0] < 2.3
@@ -0,0 +1,59 @@
+from src.core_engine.utils.fuzzy_match import fuzzy_match_hard_config
+from src.core_engine.utils.hard_config_index import HardConfigIndex
+from src.models.property_config import HardConfig
+from tests.fixtures import create_property
+
+
+def reference_config(area_sqft: float = 1000.0) -> HardConfig:
+    return HardConfig(
+        area_sqft=area_sqft, bhk_type="2BHK", bedrooms=2, bathrooms=2, property_type="apartment"
+    )
+
+
+def test_matching_returns_properties_within_area_window():
+    index = HardConfigIndex(
+        [
+            create_property("small", area_sqft=800.0),
+            create_property("same", area_sqft=1000.0),
+            create_property("big", area_sqft=1200.0),
+        ]
+    )
+
+    matches = index.matching(reference_config(), area_tolerance_percent=15.0)
+
+    assert [p.id for p in matches] == ["same"]
+
+
+def test_matching_includes_area_boundaries():
+    index = HardConfigIndex(
+        [create_property("lower", area_sqft=850.0), create_property("upper", area_sqft=1150.0)]
+    )
+
+    matches = index.matching(reference_config(), area_tolerance_percent=15.0)
+
+    assert [p.id for p in matches] == ["lower", "upper"]
+
+
+def test_matching_excludes_other_hard_config_buckets():
+    index = HardConfigIndex(
+        [
+            create_property("villa", area_sqft=1000.0, property_type="villa"),
+            create_property("three_bhk", area_sqft=1000.0, bhk_type="3BHK"),
+        ]
+    )
+
+    assert index.matching(reference_config(), area_tolerance_percent=15.0) == []
+
+
+def test_matching_agrees_with_fuzzy_match():
+    properties = [
+        create_property(f"p{area}", area_sqft=float(area), bhk_type=bhk_type)
+        for area in range(700, 1400, 10)
+        for bhk_type in ("2BHK", "3BHK")
+    ]
+    reference = reference_config(1010.0)
+
+    matches = HardConfigIndex(properties).matching(reference, area_tolerance_percent=12.5)
+
+    expected = [p for p in properties if fuzzy_match_hard_config(reference, p.hard_config, 12.5)]
+    assert sorted(p.id for p in matches) == sorted(p.id for p in expected)
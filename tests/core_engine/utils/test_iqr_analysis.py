@@ -1,4 +1,4 @@
-from src.core_engine.utils.iqr_analysis import calculate_iqr_rent_range
+from src.core_engine.utils.iqr_analysis import calculate_iqr_rent_range, summarize_rents
 
 
 def test_iqr_calculation_basic():
@@ -74,3 +74,23 @@ def test_iqr_with_identical_values():
     assert result["median"] == 20000
     assert result["q3"] == 20000
     assert result["iqr"] == 0
+
+
+def test_summarize_rents():
+    result = summarize_rents([10000.0, 20000.0, 30000.0], [10.0, 20.0, 25.0])
+
+    assert result == {
+        "count": 3,
+        "average_rent": 20000.0,
+        "min_rent": 10000.0,
+        "max_rent": 30000.0,
+        "median_rent": 20000.0,
+        "median_rent_per_sqft": 20.0,
+    }
+
+
+def test_summarize_rents_with_no_rents():
+    result = summarize_rents([], [])
+
+    assert result["count"] == 0
+    assert result["average_rent"] == 0
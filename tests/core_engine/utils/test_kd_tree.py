@@ -0,0 +1,61 @@
+import numpy as np
+
+from src.core_engine.utils.geo import calculate_distance_km
+from src.core_engine.utils.kd_tree import KDTree
+from src.models.property import Property
+from tests.fixtures import create_test_properties, create_test_property
+
+
+def create_scattered_properties(count: int):
+    rng = np.random.default_rng(7)
+    return [
+        create_test_property(f"p{i}", 12.9 + rng.random() * 0.2, 77.5 + rng.random() * 0.2)
+        for i in range(count)
+    ]
+
+
+def test_nearest_returns_k_closest_in_distance_order():
+    tree = KDTree(create_test_properties())
+
+    nearest = tree.nearest(0.0, 0.0, k=3)
+
+    assert [p.id for p in nearest][0] == "ref"
+    assert sorted(p.id for p in nearest[1:]) == ["near1", "near2"]
+
+
+def test_nearest_matches_brute_force():
+    properties = create_scattered_properties(500)
+    tree = KDTree(properties)
+
+    nearest = tree.nearest(13.0, 77.6, k=10)
+
+    expected = sorted(
+        properties, key=lambda p: calculate_distance_km(13.0, 77.6, p.latitude, p.longitude)
+    )[:10]
+    assert [p.id for p in nearest] == [p.id for p in expected]
+
+
+def test_nearest_only_returns_accepted_items():
+    properties = create_scattered_properties(300)
+    accepted_ids = {p.id for p in properties[::7]}
+    tree = KDTree(properties)
+
+    nearest = tree.nearest(13.0, 77.6, k=5, accept=lambda p: p.id in accepted_ids)
+
+    expected = sorted(
+        (p for p in properties if p.id in accepted_ids),
+        key=lambda p: calculate_distance_km(13.0, 77.6, p.latitude, p.longitude),
+    )[:5]
+    assert [p.id for p in nearest] == [p.id for p in expected]
+
+
+def test_nearest_with_k_larger_than_tree_returns_everything():
+    tree = KDTree(create_test_properties())
+
+    assert len(tree.nearest(0.0, 0.0, k=10)) == 4
+
+
+def test_nearest_on_empty_tree_returns_empty_list():
+    tree: KDTree[Property] = KDTree([])
+
+    assert tree.nearest(0.0, 0.0, k=3) == []
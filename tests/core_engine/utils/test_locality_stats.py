@@ -0,0 +1,62 @@
+import pytest
+
+from src.core_engine.utils.locality_stats import LocalityStatsTable
+from tests.fixtures import create_property
+
+
+def test_city_stats_group_by_locality_and_bhk_type():
+    table = LocalityStatsTable()
+    table.load(
+        [
+            create_property("a", locality="Koramangala", current_rent=20000.0),
+            create_property("b", locality="Koramangala", current_rent=30000.0, area_sqft=1500.0),
+            create_property("c", locality="Koramangala", current_rent=45000.0, bhk_type="3BHK"),
+            create_property("d", locality="HSR", current_rent=None),
+            create_property("e", locality="Bandra", current_rent=60000.0, city="Mumbai"),
+        ]
+    )
+
+    stats = table.city_stats("Bangalore")
+
+    assert [(row["locality"], row["bhk_type"]) for row in stats] == [
+        ("Koramangala", "2BHK"),
+        ("Koramangala", "3BHK"),
+    ]
+    two_bhk = stats[0]
+    assert two_bhk["count"] == 2
+    assert two_bhk["rent_sum"] == 50000.0
+    assert two_bhk["average_rent"] == 25000.0
+    assert two_bhk["min_rent"] == 20000.0
+    assert two_bhk["max_rent"] == 30000.0
+    assert two_bhk["average_rent_per_sqft"] == pytest.approx(20.0)
+    assert two_bhk["median_rent"] == pytest.approx(20000.0, rel=0.01)
+
+
+def test_updates_and_deletes_keep_min_and_max_exact():
+    table = LocalityStatsTable()
+    cheapest = create_property("a", locality="Koramangala", current_rent=20000.0)
+    dearest = create_property("b", locality="Koramangala", current_rent=40000.0)
+    table.load(
+        [cheapest, dearest, create_property("c", locality="Koramangala", current_rent=30000.0)]
+    )
+
+    table.property_changed(
+        dearest, create_property("b", locality="Koramangala", current_rent=35000.0)
+    )
+    table.property_changed(cheapest, None)
+
+    [row] = table.city_stats("Bangalore")
+    assert row["count"] == 2
+    assert row["min_rent"] == 30000.0
+    assert row["max_rent"] == 35000.0
+    assert row["rent_sum"] == 65000.0
+
+
+def test_removing_last_property_drops_the_row():
+    table = LocalityStatsTable()
+    prop = create_property("a", locality="Koramangala", current_rent=20000.0)
+    table.property_changed(None, prop)
+
+    table.property_changed(prop, None)
+
+    assert table.city_stats("Bangalore") == []
@@ -0,0 +1,72 @@
+import pytest
+
+from src.core_engine.utils.metrics import MetricsRegistry, timed
+
+
+def test_counter_renders_labelled_samples():
+    registry = MetricsRegistry()
+    lookups = registry.counter("lookups_total", "Cache lookups", ("result",))
+
+    lookups.inc(1, "hit")
+    lookups.inc(2, "hit")
+    lookups.inc(1, "miss")
+
+    assert registry.render() == (
+        "# HELP lookups_total Cache lookups\n"
+        "# TYPE lookups_total counter\n"
+        'lookups_total{result="hit"} 3.0\n'
+        'lookups_total{result="miss"} 1.0\n'
+    )
+
+
+def test_histogram_renders_cumulative_buckets():
+    registry = MetricsRegistry()
+    latency = registry.histogram("latency_seconds", "Latency", buckets=(0.1, 1.0))
+
+    latency.observe(0.05)
+    latency.observe(0.5)
+    latency.observe(5.0)
+
+    assert registry.render().splitlines()[2:] == [
+        'latency_seconds_bucket{le="0.1"} 1',
+        'latency_seconds_bucket{le="1.0"} 2',
+        'latency_seconds_bucket{le="+Inf"} 3',
+        "latency_seconds_sum 5.55",
+        "latency_seconds_count 3",
+    ]
+
+
+def test_label_values_are_escaped():
+    registry = MetricsRegistry()
+    counter = registry.counter("events_total", "Events", ("name",))
+
+    counter.inc(1, 'say "hi"\n')
+
+    assert 'events_total{name="say \\"hi\\"\\n"} 1.0' in registry.render()
+
+
+def test_timed_records_sync_calls():
+    registry = MetricsRegistry()
+    latency = registry.histogram("call_seconds", "Calls", ("operation",))
+
+    @timed(latency, "double")
+    def double(value):
+        return value * 2
+
+    assert double(2) == 4
+    assert latency.count("double") == 1
+
+
+@pytest.mark.asyncio
+async def test_timed_records_async_calls_even_when_they_raise():
+    registry = MetricsRegistry()
+    latency = registry.histogram("call_seconds", "Calls", ("operation",))
+
+    @timed(latency, "fail")
+    async def fail():
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError):
+        await fail()
+
+    assert latency.count("fail") == 1
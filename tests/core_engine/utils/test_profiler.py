@@ -0,0 +1,83 @@
+import asyncio
+
+import pytest
+
+from src.core_engine.utils.profiler import (
+    RequestProfile,
+    profile_request,
+    profile_stage,
+    profiled,
+)
+
+
+def test_profile_stage_without_active_profile_records_nothing():
+    with profile_stage("filter"):
+        pass
+
+    with profile_request("analyze", enabled=False) as profile, profile_stage("filter"):
+        pass
+
+    assert profile is None
+
+
+def test_profile_request_records_nested_stage_paths():
+    with profile_request("analyze", enabled=True) as profile:
+        with profile_stage("repository_fetch"), profile_stage("model_construction"):
+            [object() for _ in range(1000)]
+        with profile_stage("filter"):
+            pass
+
+    assert profile is not None
+    stages = [stage["stage"] for stage in profile.summary()["stages"]]
+    assert stages == [
+        "analyze",
+        "analyze;filter",
+        "analyze;repository_fetch",
+        "analyze;repository_fetch;model_construction",
+    ]
+    assert profile.summary()["total_seconds"] > 0
+
+
+@pytest.mark.asyncio
+async def test_profiled_coroutines_keep_their_own_stage_paths_when_concurrent():
+    @profiled("llm")
+    async def call_llm():
+        await asyncio.sleep(0.01)
+
+    @profiled("stats")
+    def calculate_stats():
+        return None
+
+    async def band():
+        with profile_stage("band"):
+            await call_llm()
+
+    with profile_request("analyze", enabled=True) as profile:
+        await asyncio.gather(band(), asyncio.to_thread(calculate_stats))
+
+    assert profile is not None
+    assert {stage.path for stage in profile.stages} == {
+        ("analyze",),
+        ("analyze", "band"),
+        ("analyze", "band", "llm"),
+        ("analyze", "stats"),
+    }
+
+
+def test_folded_stacks_use_self_time_in_microseconds():
+    profile = RequestProfile("analyze")
+    profile.record(("analyze",), 0.010, 0)
+    profile.record(("analyze", "llm"), 0.004, 0)
+    profile.record(("analyze", "llm"), 0.002, 0)
+
+    assert profile.folded_stacks() == ["analyze 4000", "analyze;llm 6000"]
+
+
+def test_write_folded_sanitises_file_name(tmp_path):
+    profile = RequestProfile("analyze")
+    profile.record(("analyze",), 0.001, 0)
+
+    trace_path = profile.write_folded(tmp_path, "analyze-../../etc/passwd")
+
+    assert trace_path.parent == tmp_path
+    assert trace_path.read_text() == "analyze 1000\n"
@@ -0,0 +1,82 @@
+import random
+import statistics
+
+import pytest
+
+from src.core_engine.utils.quantile_sketch import QuantileSketch
+
+
+def exact_quantile(values: list[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[int(q * (len(ordered) - 1))]
+
+
+def test_quantiles_are_within_relative_accuracy():
+    generator = random.Random(7)
+    rents = [generator.lognormvariate(10, 0.5) for _ in range(10000)]
+    sketch = QuantileSketch(relative_accuracy=0.01)
+    for rent in rents:
+        sketch.add(rent)
+
+    for q in (0.01, 0.25, 0.5, 0.75, 0.99):
+        assert sketch.quantile(q) == pytest.approx(exact_quantile(rents, q), rel=0.01)
+
+
+def test_median_matches_statistics_within_error_bound():
+    rents = [15000.0, 16000.0, 18000.0, 20000.0, 22000.0, 25000.0, 28000.0]
+    sketch = QuantileSketch()
+    for rent in rents:
+        sketch.add(rent)
+
+    assert sketch.quantile(0.5) == pytest.approx(statistics.median(rents), rel=0.01)
+
+
+def test_merge_equals_sketch_of_combined_values():
+    left, right, combined = QuantileSketch(), QuantileSketch(), QuantileSketch()
+    for value in range(1, 501):
+        left.add(float(value))
+        combined.add(float(value))
+    for value in range(501, 1001):
+        right.add(float(value))
+        combined.add(float(value))
+
+    left.merge(right)
+
+    assert left.count == combined.count == 1000
+    assert [left.quantile(q) for q in (0.1, 0.5, 0.9)] == [
+        combined.quantile(q) for q in (0.1, 0.5, 0.9)
+    ]
+
+
+def test_merge_rejects_different_accuracy():
+    with pytest.raises(ValueError):
+        QuantileSketch(0.01).merge(QuantileSketch(0.02))
+
+
+def test_remove_undoes_add():
+    sketch = QuantileSketch()
+    for value in (10000.0, 20000.0, 30000.0):
+        sketch.add(value)
+
+    sketch.remove(30000.0)
+
+    assert sketch.count == 2
+    assert sketch.quantile(1.0) == pytest.approx(20000.0, rel=0.01)
+
+
+def test_zero_values_are_counted():
+    sketch = QuantileSketch()
+    sketch.add(0.0)
+    sketch.add(100.0)
+
+    assert sketch.quantile(0.0) == 0.0
+    assert sketch.quantile(1.0) == pytest.approx(100.0, rel=0.01)
+
+
+def test_empty_sketch_has_no_quantiles():
+    assert QuantileSketch().quantile(0.5) is None
+
+
+def test_relative_accuracy_must_be_a_fraction():
+    with pytest.raises(ValueError):
+        QuantileSketch(relative_accuracy=1.5)
@@ -0,0 +1,59 @@
+import pytest
+
+from src.core_engine.utils.rent_sketches import (
+    RentSketchIndex,
+    city_key,
+    hard_config_group_key,
+    locality_key,
+)
+from src.models.property_config import HardConfig
+from tests.fixtures import create_property
+
+TWO_BHK = HardConfig(
+    area_sqft=1000.0, bhk_type="2BHK", bedrooms=2, bathrooms=2, property_type="apartment"
+)
+
+
+def test_index_tracks_city_locality_and_hard_config_groups():
+    index = RentSketchIndex()
+    index.load(
+        [
+            create_property("a", locality="Koramangala", current_rent=20000.0),
+            create_property("b", locality="Koramangala", current_rent=30000.0),
+            create_property("c", locality="HSR", current_rent=40000.0),
+            create_property("d", locality="HSR", current_rent=None),
+        ]
+    )
+
+    city_range = index.rent_range(city_key("Bangalore"))
+    locality_range = index.rent_range(locality_key("Bangalore", "Koramangala"))
+    hard_config_range = index.rent_range(hard_config_group_key("Bangalore", TWO_BHK, "HSR"))
+
+    assert city_range is not None and city_range["count"] == 3
+    assert city_range["median"] == pytest.approx(30000.0, rel=0.01)
+    assert locality_range is not None and locality_range["count"] == 2
+    assert hard_config_range is not None and hard_config_range["count"] == 1
+    assert index.rent_range(locality_key("Bangalore", "Whitefield")) is None
+
+
+def test_property_changed_moves_rent_between_groups():
+    index = RentSketchIndex()
+    before = create_property("a", locality="Koramangala", current_rent=20000.0)
+    index.property_changed(None, before)
+
+    index.property_changed(before, create_property("a", locality="HSR", current_rent=25000.0))
+
+    assert index.rent_range(locality_key("Bangalore", "Koramangala")) is None
+    hsr_range = index.rent_range(locality_key("Bangalore", "HSR"))
+    assert hsr_range is not None
+    assert hsr_range["median"] == pytest.approx(25000.0, rel=0.01)
+
+
+def test_property_changed_on_delete_drops_empty_groups():
+    index = RentSketchIndex()
+    prop = create_property("a", locality="Koramangala", current_rent=20000.0)
+    index.property_changed(None, prop)
+
+    index.property_changed(prop, None)
+
+    assert index.rent_range(city_key("Bangalore")) is None
@@ -0,0 +1,84 @@
+from src.core_engine.utils.geo import calculate_distance_km
+from src.core_engine.utils.spatial_index import SpatialGridIndex
+from src.models.property import Property
+from tests.fixtures import create_test_properties, create_test_property
+
+
+def test_within_radius_returns_nearby_properties():
+    index = SpatialGridIndex(create_test_properties())
+
+    nearby = index.within_radius(0.0, 0.0, radius_km=2.0)
+
+    assert sorted(p.id for p in nearby) == ["near1", "near2", "ref"]
+
+
+def test_within_radius_with_larger_radius_includes_far_properties():
+    index = SpatialGridIndex(create_test_properties())
+
+    nearby = index.within_radius(0.0, 0.0, radius_km=4.0)
+
+    assert sorted(p.id for p in nearby) == ["far1", "near1", "near2", "ref"]
+
+
+def test_within_radius_on_empty_index_returns_empty_list():
+    index: SpatialGridIndex[Property] = SpatialGridIndex([])
+
+    assert index.within_radius(12.9352, 77.6245, radius_km=5.0) == []
+
+
+def test_within_radius_matches_linear_scan():
+    properties = [
+        create_test_property(f"p{row}_{column}", 12.9 + row * 0.004, 77.6 + column * 0.004)
+        for row in range(25)
+        for column in range(25)
+    ]
+    index = SpatialGridIndex(properties, cell_size_km=0.5)
+
+    nearby = index.within_radius(12.95, 77.65, radius_km=1.5)
+
+    expected = [
+        p.id
+        for p in properties
+        if calculate_distance_km(12.95, 77.65, p.latitude, p.longitude) <= 1.5
+    ]
+    assert sorted(p.id for p in nearby) == sorted(expected)
+
+
+def test_within_radius_larger_than_city_visits_only_occupied_cells():
+    properties = [create_test_property("a", 12.9, 77.6), create_test_property("b", 13.1, 77.8)]
+    index = SpatialGridIndex(properties, cell_size_km=0.1)
+
+    nearby = index.within_radius(13.0, 77.7, radius_km=50.0)
+
+    assert sorted(p.id for p in nearby) == ["a", "b"]
+
+
+def test_index_length_counts_all_properties():
+    index = SpatialGridIndex(create_test_properties())
+
+    assert len(index) == 4
+
+
+def test_expanding_rings_yield_each_property_once_in_distance_order():
+    properties = [
+        create_test_property("p1", 0.0, 0.001),
+        create_test_property("p2", 0.0, 0.012),
+        create_test_property("p3", 0.0, 0.005),
+        create_test_property("p4", 0.0, 0.03),
+    ]
+    index = SpatialGridIndex(properties, cell_size_km=0.25)
+
+    rings = list(index.expanding_rings(0.0, 0.0, ring_width_km=1.0, max_radius_km=2.0))
+
+    assert [(radius, [p.id for p in ring]) for radius, ring in rings] == [
+        (1.0, ["p1", "p3"]),
+        (2.0, ["p2"]),
+    ]
+
+
+def test_expanding_rings_stop_at_max_radius():
+    index = SpatialGridIndex(create_test_properties())
+
+    radii = [radius for radius, _ in index.expanding_rings(0.0, 0.0, 0.75, max_radius_km=2.0)]
+
+    assert radii == [0.75, 1.5, 2.0]
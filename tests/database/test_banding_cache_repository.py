@@ -0,0 +1,54 @@
+import pytest
+import pytest_asyncio
+
+from src.core_engine.agents.banding_agent import BandingResult
+from src.database.banding_cache_repository import MongoBandingCache
+
+
+@pytest_asyncio.fixture
+async def banding_cache(mongo_database):
+    cache = MongoBandingCache(mongo_database["banding_cache"], ttl_seconds=60)
+    await cache.ensure_indexes()
+    return cache
+
+
+@pytest.fixture
+def banding_result():
+    return BandingResult(
+        bands={"L5": ["prop1"], "L3": ["prop2"]},
+        parameters_used=["rent_per_sqft"],
+        parameters_rationale="Cached result",
+        new_property_band="L3",
+        confidence_score=0.9,
+    )
+
+
+@pytest.mark.asyncio
+async def test_get_returns_stored_result(banding_cache, banding_result):
+    await banding_cache.set("key", banding_result)
+
+    result = await banding_cache.get("key")
+
+    assert result == banding_result
+
+
+@pytest.mark.asyncio
+async def test_get_missing_key_returns_none(banding_cache):
+    assert await banding_cache.get("missing") is None
+
+
+@pytest.mark.asyncio
+async def test_set_overwrites_existing_entry(banding_cache, banding_result):
+    await banding_cache.set("key", banding_result)
+
+    await banding_cache.set("key", banding_result.model_copy(update={"new_property_band": "L5"}))
+
+    result = await banding_cache.get("key")
+    assert result.new_property_band == "L5"
+
+
+@pytest.mark.asyncio
+async def test_ensure_indexes_creates_ttl_index(banding_cache):
+    indexes = await banding_cache.collection.index_information()
+
+    assert indexes["created_at_1"]["expireAfterSeconds"] == 60
@@ -0,0 +1,177 @@
+import asyncio
+from collections.abc import AsyncIterator
+from typing import Any
+from unittest.mock import Mock
+
+import pytest
+
+from src.database.city_snapshot_cache import (
+    DEFAULT_MAX_BYTES,
+    CitySnapshotCache,
+    estimate_properties_bytes,
+    estimate_property_bytes,
+    follow_changes,
+)
+from src.models.property import Property
+from tests.fixtures import create_property
+
+
+def property_snapshots(max_bytes: int = DEFAULT_MAX_BYTES) -> CitySnapshotCache[list[Property]]:
+    return CitySnapshotCache("properties", estimate_properties_bytes, max_bytes)
+
+
+class CountingLoader:
+    def __init__(self, properties: list[Property]):
+        self.properties = properties
+        self.calls = 0
+
+    async def __call__(self, city: str) -> list[Property]:
+        self.calls += 1
+        return [prop for prop in self.properties if prop.city == city]
+
+
+@pytest.mark.asyncio
+async def test_get_or_load_reuses_snapshot_until_city_changes():
+    cache = property_snapshots()
+    loader = CountingLoader([create_property("a"), create_property("b", city="Mumbai")])
+
+    first = await cache.get_or_load("Bangalore", loader)
+    second = await cache.get_or_load("Bangalore", loader)
+    cache.property_changed(None, create_property("c", city="Mumbai"))
+    third = await cache.get_or_load("Bangalore", loader)
+    cache.property_changed(create_property("a"), None)
+    await cache.get_or_load("Bangalore", loader)
+
+    assert [prop.id for prop in first] == [prop.id for prop in second] == ["a"]
+    assert third == first
+    assert loader.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_write_during_load_keeps_stale_snapshot_out():
+    cache = property_snapshots()
+
+    async def loader(city: str) -> list[Property]:
+        cache.property_changed(None, create_property("late", city=city))
+        return [create_property("a", city=city)]
+
+    await cache.get_or_load("Bangalore", loader)
+
+    assert cache.get("Bangalore") is None
+
+
+def test_least_recently_used_city_is_evicted_over_memory_limit():
+    city_bytes = estimate_property_bytes(create_property("a"))
+    cache = property_snapshots(max_bytes=2 * city_bytes)
+    cache.store("Bangalore", [create_property("a")])
+    cache.store("Mumbai", [create_property("b", city="Mumbai")])
+    cache.get("Bangalore")
+
+    cache.store("Pune", [create_property("c", city="Pune")])
+
+    assert cache.get("Mumbai") is None
+    assert cache.get("Bangalore") is not None
+    assert cache.get("Pune") is not None
+    assert cache.size_bytes <= cache.max_bytes
+
+
+def test_snapshot_larger_than_limit_is_not_stored():
+    cache = property_snapshots(max_bytes=1)
+
+    cache.store("Bangalore", [create_property("a")])
+
+    assert cache.get("Bangalore") is None
+    assert cache.size_bytes == 0
+
+
+def test_invalidate_all_drops_every_snapshot():
+    cache = property_snapshots()
+    version = cache.version("Pune")
+    cache.store("Bangalore", [create_property("a")])
+
+    cache.invalidate_all()
+    cache.store("Pune", [create_property("c", city="Pune")], version)
+
+    assert cache.get("Bangalore") is None
+    assert cache.get("Pune") is None
+    assert cache.size_bytes == 0
+
+
+@pytest.mark.asyncio
+async def test_get_or_refresh_misses_once_then_serves_refreshed_snapshot():
+    cache = property_snapshots()
+    loader = CountingLoader([create_property("a")])
+
+    missed = cache.get_or_refresh("Bangalore", loader)
+    cache.get_or_refresh("Bangalore", loader)
+    await asyncio.sleep(0)
+    refreshed = cache.get_or_refresh("Bangalore", loader)
+
+    assert missed is None
+    assert [prop.id for prop in refreshed or []] == ["a"]
+    assert loader.calls == 1
+
+
+class ChangeStream:
+    def __init__(self, changes: list[dict[str, Any]]):
+        self.changes = changes
+
+    async def __aenter__(self) -> "ChangeStream":
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        return None
+
+    async def __aiter__(self) -> AsyncIterator[dict[str, Any]]:
+        for change in self.changes:
+            yield change
+
+
+def watched_collection(changes: list[dict[str, Any]]) -> Mock:
+    collection = Mock()
+    collection.watch.return_value = ChangeStream(changes)
+    return collection
+
+
+def stored_cities(*cities: str) -> CitySnapshotCache[list[Property]]:
+    cache = property_snapshots()
+    for city in cities:
+        cache.store(city, [create_property(f"{city}-1", city=city)])
+    return cache
+
+
+@pytest.mark.asyncio
+async def test_follow_changes_invalidates_only_the_changed_cities():
+    cache = stored_cities("Bangalore", "Mumbai", "Pune", "Delhi")
+    changes = [
+        {"operationType": "insert", "fullDocument": {"city": "Pune"}},
+        {
+            "operationType": "update",
+            "fullDocument": {"city": "Bangalore"},
+            "updateDescription": {"updatedFields": {"current_rent": 1.0}, "removedFields": []},
+        },
+        {"operationType": "delete", "fullDocumentBeforeChange": {"city": "Mumbai"}},
+    ]
+    collection = watched_collection(changes)
+
+    await follow_changes(collection, [cache])
+
+    assert collection.watch.call_args.kwargs["full_document"] == "updateLookup"
+    assert [city for city in ("Bangalore", "Mumbai", "Pune") if cache.get(city)] == []
+    assert cache.get("Delhi") is not None
+
+
+@pytest.mark.asyncio
+async def test_follow_changes_invalidates_everything_when_the_city_is_unknown():
+    cache = stored_cities("Bangalore", "Mumbai")
+    changes = [
+        {
+            "operationType": "update",
+            "fullDocument": {"city": "Mumbai"},
+            "updateDescription": {"updatedFields": {"city": "Mumbai"}, "removedFields": []},
+        }
+    ]
+
+    await follow_changes(watched_collection(changes), [cache])
+
+    assert cache.get("Bangalore") is None
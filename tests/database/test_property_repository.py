@@ -1,5 +1,9 @@
 import pytest
 
+from src.core_engine.utils.geo import calculate_distance_km
+from src.core_engine.utils.rent_sketches import RentSketchIndex, city_key
+from src.database.city_snapshot_cache import CitySnapshotCache, estimate_properties_bytes
+from src.database.property_repository import PropertyRepository
 from src.models.property import Property
 from src.models.property_config import HardConfig, SoftConfig
 
@@ -80,6 +84,23 @@ async def test_get_all_properties(property_repository, test_property, another_pr
     assert "test_prop_2" in ids
 
 
+@pytest.mark.asyncio
+async def test_get_projected_fetches_only_requested_fields(
+    property_repository, test_property, another_property
+):
+    await property_repository.create(test_property)
+    await property_repository.create(another_property)
+
+    result = await property_repository.get_projected(["id", "current_rent"])
+
+    assert sorted(
+        (summary.model_dump(exclude_unset=True) for summary in result), key=lambda s: s["id"]
+    ) == [
+        {"id": test_property.id, "current_rent": test_property.current_rent},
+        {"id": another_property.id, "current_rent": another_property.current_rent},
+    ]
+
+
 @pytest.mark.asyncio
 async def test_get_properties_by_city(property_repository, test_property, another_property):
     await property_repository.create(test_property)
@@ -91,6 +112,16 @@ async def test_get_properties_by_city(property_repository, test_property, anothe
     assert all(p.city == "Bangalore" for p in result)
 
 
+@pytest.mark.asyncio
+async def test_get_properties_by_ids(property_repository, test_property, another_property):
+    await property_repository.create(test_property)
+    await property_repository.create(another_property)
+
+    result = await property_repository.get_by_ids(["test_prop_2", "non_existent"])
+
+    assert [p.id for p in result] == ["test_prop_2"]
+
+
 @pytest.mark.asyncio
 async def test_update_property(property_repository, test_property):
     await property_repository.create(test_property)
@@ -121,3 +152,168 @@ async def test_delete_property_not_found(property_repository):
     result = await property_repository.delete("non_existent")
 
     assert result is False
+
+
+@pytest.fixture
+def far_property():
+    return Property(
+        id="test_prop_3",
+        hard_config=HardConfig(
+            area_sqft=1000.0, bhk_type="2BHK", bedrooms=2, bathrooms=2, property_type="apartment"
+        ),
+        soft_config=SoftConfig(furniture_items=[], appliances=[], amenities=[]),
+        city="Bangalore",
+        locality="Whitefield",
+        latitude=12.9698,
+        longitude=77.7500,
+        current_rent=28000.0,
+    )
+
+
+@pytest.mark.asyncio
+async def test_find_within_radius_returns_nearby_properties_with_distance(
+    property_repository, test_property, another_property, far_property
+):
+    await property_repository.ensure_indexes()
+    await property_repository.create(test_property)
+    await property_repository.create(another_property)
+    await property_repository.create(far_property)
+
+    result = await property_repository.find_within_radius(
+        test_property.latitude, test_property.longitude, radius_km=5.0, city="Bangalore"
+    )
+
+    assert [nearby.property.id for nearby in result] == ["test_prop_1", "test_prop_2"]
+    assert result[0].distance_km == pytest.approx(0.0, abs=0.001)
+    assert result[1].distance_km == pytest.approx(
+        calculate_distance_km(
+            test_property.latitude,
+            test_property.longitude,
+            another_property.latitude,
+            another_property.longitude,
+        ),
+        rel=0.001,
+    )
+
+
+@pytest.mark.asyncio
+async def test_find_within_radius_filters_by_city(property_repository, test_property):
+    await property_repository.ensure_indexes()
+    await property_repository.create(test_property)
+
+    result = await property_repository.find_within_radius(
+        test_property.latitude, test_property.longitude, radius_km=5.0, city="Mumbai"
+    )
+
+    assert result == []
+
+
+@pytest.mark.asyncio
+async def test_ensure_indexes_backfills_location_for_existing_documents(
+    property_repository, test_property
+):
+    await property_repository.collection.insert_one(test_property.model_dump())
+
+    await property_repository.ensure_indexes()
+
+    result = await property_repository.find_within_radius(
+        test_property.latitude, test_property.longitude, radius_km=1.0
+    )
+    assert [nearby.property.id for nearby in result] == ["test_prop_1"]
+
+
+@pytest.mark.asyncio
+async def test_find_comparables_applies_hard_config_area_and_radius(
+    property_repository, test_property, another_property, far_property
+):
+    await property_repository.ensure_indexes()
+    nearby_match = another_property.model_copy(
+        update={"id": "nearby_match", "hard_config": test_property.hard_config}
+    )
+    far_match = far_property.model_copy(
+        update={"id": "far_match", "hard_config": test_property.hard_config}
+    )
+    for property_obj in (test_property, another_property, nearby_match, far_match):
+        await property_repository.create(property_obj)
+
+    result = await property_repository.find_comparables(
+        test_property, radius_km=5.0, area_tolerance_percent=15.0
+    )
+
+    assert [p.id for p in result] == ["nearby_match"]
+
+
+@pytest.mark.asyncio
+async def test_repository_notifies_listeners_of_changes(property_repository, test_property):
+    sketches = RentSketchIndex()
+    repository = PropertyRepository(property_repository.collection, listeners=[sketches])
+
+    await repository.create(test_property)
+    await repository.update(test_property.model_copy(update={"current_rent": 40000.0}))
+    created_and_updated = sketches.rent_range(city_key("Bangalore"))
+    await repository.delete(test_property.id)
+
+    assert created_and_updated is not None
+    assert created_and_updated["count"] == 1
+    assert created_and_updated["median"] == pytest.approx(40000.0, rel=0.01)
+    assert sketches.rent_range(city_key("Bangalore")) is None
+
+
+@pytest.mark.asyncio
+async def test_get_by_city_serves_snapshot_until_a_write(property_repository, test_property):
+    repository = PropertyRepository(
+        property_repository.collection,
+        city_snapshots=CitySnapshotCache("properties", estimate_properties_bytes),
+    )
+    await repository.create(test_property)
+    await repository.get_by_city("Bangalore")
+    await property_repository.collection.delete_many({})
+
+    cached = await repository.get_by_city("Bangalore")
+    await repository.create(test_property.model_copy(update={"id": "test_prop_2"}))
+    refreshed = await repository.get_by_city("Bangalore")
+
+    assert [prop.id for prop in cached] == [test_property.id]
+    assert [prop.id for prop in refreshed] == ["test_prop_2"]
+
+
+@pytest.mark.asyncio
+async def test_get_columns_by_city_builds_columnar_snapshot(property_repository, test_property):
+    await property_repository.create(test_property)
+
+    snapshot = await property_repository.get_columns_by_city("Bangalore")
+
+    assert len(snapshot) == 1
+    assert snapshot.materialize([0]) == [test_property]
+
+
+@pytest.mark.asyncio
+async def test_get_page_walks_ids_in_order(property_repository, test_property):
+    for suffix in ("c", "a", "b"):
+        await property_repository.create(test_property.model_copy(update={"id": f"prop_{suffix}"}))
+
+    first, cursor = await property_repository.get_page(2, city="Bangalore")
+    second, last_cursor = await property_repository.get_page(2, city="Bangalore", after=cursor)
+
+    assert [prop.id for prop in first] == ["prop_a", "prop_b"]
+    assert cursor == "prop_b"
+    assert [prop.id for prop in second] == ["prop_c"]
+    assert last_cursor is None
+
+
+@pytest.mark.asyncio
+async def test_stream_documents_yields_projected_documents(property_repository, test_property):
+    for suffix in ("b", "a"):
+        await property_repository.create(test_property.model_copy(update={"id": f"prop_{suffix}"}))
+
+    documents = [
+        doc
+        async for doc in property_repository.stream_documents(
+            city="Bangalore", fields=["id", "current_rent"], batch_size=1
+        )
+    ]
+
+    assert documents == [
+        {"id": "prop_a", "current_rent": test_property.current_rent},
+        {"id": "prop_b", "current_rent": test_property.current_rent},
+    ]
@@ -2,7 +2,8 @@ from datetime import datetime
 
 from pydantic import HttpUrl
 
-from src.models.property import PropertyListing
+from src.models.property import Property, PropertyListing
+from src.models.property_config import HardConfig, SoftConfig
 
 
 def create_test_property(
@@ -43,3 +44,42 @@ def create_test_properties() -> list[PropertyListing]:
         create_test_property("far1", 0.02, 0.02, 800000.0),
         create_test_property("near2", -0.01, -0.01, 900000.0),
     ]
+
+
+def create_property(
+    _id: str,
+    *,
+    area_sqft: float = 1000.0,
+    bhk_type: str = "2BHK",
+    bedrooms: int | None = None,
+    bathrooms: int = 2,
+    property_type: str = "apartment",
+    furniture_items: list[str] | None = None,
+    appliances: list[str] | None = None,
+    amenities: list[str] | None = None,
+    city: str = "Bangalore",
+    locality: str = "Koramangala",
+    latitude: float = 12.9352,
+    longitude: float = 77.6245,
+    current_rent: float | None = 25000.0,
+) -> Property:
+    return Property(
+        id=_id,
+        hard_config=HardConfig(
+            area_sqft=area_sqft,
+            bhk_type=bhk_type,
+            bedrooms=int(bhk_type[0]) if bedrooms is None else bedrooms,
+            bathrooms=bathrooms,
+            property_type=property_type,
+        ),
+        soft_config=SoftConfig(
+            furniture_items=furniture_items or [],
+            appliances=appliances or [],
+            amenities=amenities or [],
+        ),
+        city=city,
+        locality=locality,
+        latitude=latitude,
+        longitude=longitude,
+        current_rent=current_rent,
+    )